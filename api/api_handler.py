@@ -1,14 +1,18 @@
 # Version: 0.02
-import pandas as pd
 import requests
 import json
 import os
 import time
 import logging
-from typing import Optional, Tuple, Dict, Any
+import threading
+from typing import Optional, Tuple, Dict, Any, Callable
 
 from .cache_manager import CacheManager
-from .config import CACHE_SETTINGS, API_SETTINGS
+from .config import CACHE_SETTINGS, API_SETTINGS, GLOBAL_API_LIMITS
+from .fetch_engine import FetchEngine, TaskCancelled, check_cancelled
+from .http_session import create_session
+from .single_flight import SingleFlight
+from .rate_limiter import RateLimiter, RateLimitExceeded
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -22,37 +26,224 @@ class ErgastAPI:
     
     Features:
     - Smart caching with metadata tracking
-    - API call rate limiting
+    - API call rate limiting (global and per-endpoint sliding windows)
     - Schedule-aware refresh logic
     - Manual refresh capability
+    - Concurrent refresh of all endpoints
+    - Pooled keep-alive HTTP session with retries and backoff
+    - Conditional requests (ETag / Last-Modified) to skip unchanged payloads
+    - Single-flight coalescing of concurrent fetches for the same key
+    - Optional stale-while-revalidate mode with change listeners
     
     Attributes:
         BASE_URL (str): Base URL for the Ergast F1 API
+        base_url (str): Base URL used by this instance
         cache_manager (CacheManager): Manages caching and metadata
+        rate_limiter (RateLimiter): Enforces global and per-key call budgets
+        fetch_engine (FetchEngine): Runs endpoint requests concurrently
+        session (requests.Session): Shared pooled session for all requests
+        stale_while_revalidate (bool): Serve stale cache immediately and
+            refresh it in the background
     """
     
     BASE_URL = API_SETTINGS['base_url']
     
-    def __init__(self, cache_dir='api/cache'):
+    def __init__(self, cache_dir='api/cache', base_url: Optional[str] = None,
+                 stale_while_revalidate: Optional[bool] = None):
         """Initialize API handler with cache manager.
         
         Args:
             cache_dir: Directory for cache files
+            base_url: Override for the API base URL (e.g. a local stub server)
+            stale_while_revalidate: Return stale cached data without blocking and
+                refresh it on a worker (None = use API_SETTINGS)
         """
-        self.cache_manager = CacheManager(cache_dir)
+        if stale_while_revalidate is None:
+            stale_while_revalidate = API_SETTINGS['stale_while_revalidate']
+        self.stale_while_revalidate = stale_while_revalidate
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.rate_limiter = RateLimiter(
+            os.path.join(cache_dir, 'rate_limits.json'),
+            GLOBAL_API_LIMITS
+        )
+        self.cache_manager = CacheManager(cache_dir, rate_limiter=self.rate_limiter)
+        self.fetch_engine = FetchEngine(API_SETTINGS['max_concurrent_requests'])
+        self.session = create_session(
+            API_SETTINGS['max_retries'],
+            API_SETTINGS['backoff_factor'],
+            API_SETTINGS['max_connections_per_host'],
+            max_retry_after=API_SETTINGS['max_retry_after']
+        )
+        self._in_flight = SingleFlight()
+        self._listeners = []
+        self._pending_revalidations = set()
+        self._listener_lock = threading.Lock()
     
-    def get_next_race(self, force_refresh: bool = False) -> Optional[Dict]:
-        """Fetch the next upcoming F1 race information with intelligent caching.
+    def add_listener(self, callback: Callable[[str, Dict], None]):
+        """Register a callback for freshly fetched data.
+        
+        The callback is invoked as ``callback(cache_key, payload)`` with the raw
+        API payload whenever new data is saved to the cache. It runs on the
+        fetching thread, so UI code must marshal back to its own thread.
         
         Args:
-            force_refresh: Force API call even if cache is fresh
+            callback: Function to call when fresh data lands
+        """
+        with self._listener_lock:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, Dict], None]):
+        """Unregister a callback added with add_listener."""
+        with self._listener_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def _notify_listeners(self, cache_key: str, payload: Dict):
+        """Call every registered listener, isolating their failures."""
+        with self._listener_lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(cache_key, payload)
+            except Exception as e:
+                logger.error(f"Data listener failed for {cache_key}: {e}")
+    
+    def _request_json(self, endpoint: str,
+                      validators: Optional[Dict[str, str]] = None) -> Tuple[Optional[Dict], Dict[str, str]]:
+        """Perform a GET request against the API and decode the JSON body.
+        
+        Transient failures are retried by the session with backoff before
+        an error is raised. When validators are given the request is made
+        conditional (If-None-Match / If-Modified-Since).
+        
+        Args:
+            endpoint: Path relative to the base URL (e.g. 'current/next.json')
+            validators: Stored validators ('etag', 'last_modified') for the resource
             
         Returns:
-            Dictionary with race details or None if unavailable
+            Tuple of (decoded JSON or None if the server answered 304 Not
+            Modified, validators sent with the response)
+            
+        Raises:
+            requests.exceptions.RequestException: On network, HTTP or decode errors
         """
-        cache_key = 'next_race'
-        settings = CACHE_SETTINGS['next_race']
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = self.session.get(
+            f"{self.base_url}/{endpoint}",
+            headers=headers,
+            timeout=API_SETTINGS['timeout']
+        )
+        response_validators = {}
+        if response.headers.get('ETag'):
+            response_validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            response_validators['last_modified'] = response.headers['Last-Modified']
+        
+        if response.status_code == 304:
+            return None, response_validators
+        response.raise_for_status()
+        return response.json(), response_validators
+    
+    def _refresh(self, cache_key: str, endpoint: str, description: str,
+                 cached_data: Optional[Dict], max_calls_per_day: Optional[int] = None) -> Optional[Dict]:
+        """Fetch an endpoint from the API and store it in the cache.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            endpoint: Path relative to the base URL
+            description: Human readable name used in log messages
+            cached_data: Currently cached payload, if any
+            max_calls_per_day: Per-key daily budget (None = global budgets only)
+            
+        Returns:
+            Fresh payload, or the cached payload if the server reported it unchanged
+            
+        Raises:
+            RateLimitExceeded: If a global or per-key budget is exhausted
+            requests.exceptions.RequestException: On network, HTTP or decode errors
+            TaskCancelled: If the refresh running this fetch was cancelled
+        """
+        check_cancelled()
+        self.rate_limiter.acquire(cache_key, max_calls_per_day)
+        try:
+            check_cancelled()
+        except Exception:
+            # The request is never sent, so give the whole call back
+            self.rate_limiter.refund(cache_key, include_global=True)
+            raise
+        
+        # Only revalidate when there is a cached body to fall back on
+        validators = self.cache_manager.get_validators(cache_key) if cached_data else None
+        api_data, response_validators = self._request_json(endpoint, validators)
+        if api_data is None:
+            # Unchanged data does not count against the endpoint's daily budget
+            self.rate_limiter.refund(cache_key)
+            self.cache_manager.mark_fresh(cache_key, response_validators)
+            logger.info(f"{description.capitalize()} not modified, using cache")
+            return cached_data
+        
+        self.cache_manager.save_cache(cache_key, api_data, validators=response_validators)
+        logger.info(f"Successfully fetched and cached {description}")
+        self._notify_listeners(cache_key, api_data)
+        return api_data
+    
+    def _schedule_revalidation(self, cache_key: str, endpoint: str, description: str,
+                               cached_data: Dict, max_calls_per_day: Optional[int] = None):
+        """Refresh a stale entry on a worker unless one is already queued.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            endpoint: Path relative to the base URL
+            description: Human readable name used in log messages
+            cached_data: Currently cached payload
+            max_calls_per_day: Per-key daily budget (None = global budgets only)
+        """
+        with self._listener_lock:
+            if cache_key in self._pending_revalidations:
+                return
+            self._pending_revalidations.add(cache_key)
         
+        def revalidate():
+            try:
+                self._in_flight.do(
+                    cache_key,
+                    lambda: self._refresh(cache_key, endpoint, description, cached_data,
+                                          max_calls_per_day)
+                )
+            except (requests.exceptions.RequestException, RateLimitExceeded) as e:
+                logger.error(f"Background refresh of {description} failed: {e}")
+            finally:
+                with self._listener_lock:
+                    self._pending_revalidations.discard(cache_key)
+        
+        logger.debug(f"Serving stale {cache_key}, refreshing in background")
+        self.fetch_engine.submit(revalidate)
+    
+    def _get_data(self, cache_key: str, settings: Dict, endpoint: str,
+                  description: str, force_refresh: bool = False) -> Optional[Dict]:
+        """Load raw endpoint data from cache, refreshing it from the API when due.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            settings: Entry of CACHE_SETTINGS for this endpoint
+            endpoint: Path relative to the base URL
+            description: Human readable name used in log messages
+            force_refresh: Force API call even if cache is fresh
+            
+        Returns:
+            Raw API payload (fresh if fetched, cached otherwise) or None
+            
+        Raises:
+            RateLimitExceeded: Only when force_refresh is set and a budget is exhausted
+            requests.exceptions.RequestException: Only when force_refresh is set
+                and the API call failed (otherwise the cache is returned)
+        """
         # Step 1: Load from cache first (always try, even if expired)
         cached_data = self.cache_manager.load_cache(cache_key, max_age_seconds=None)
         
@@ -64,25 +255,72 @@ class ErgastAPI:
             force_refresh
         )
         
-        # Step 3: Try API call if needed
+        # Manual refreshes bypass the per-key budget but not the global ones
+        max_calls_per_day = None if force_refresh else settings['max_api_calls_per_day']
+        
+        # Stale-while-revalidate: answer from cache now, refresh on a worker
+        if should_refresh and cached_data and self.stale_while_revalidate and not force_refresh:
+            self._schedule_revalidation(cache_key, endpoint, description, cached_data,
+                                        max_calls_per_day)
+            return cached_data
+        
+        # Step 3: Try API call if needed (shared with concurrent callers)
         api_data = None
         if should_refresh:
-            try:
-                response = requests.get(
-                    f"{self.BASE_URL}/current/next.json",
-                    timeout=API_SETTINGS['timeout']
+            def fetch():
+                return self._in_flight.do(
+                    cache_key,
+                    lambda: self._refresh(cache_key, endpoint, description, cached_data,
+                                          max_calls_per_day)
                 )
-                response.raise_for_status()
-                api_data = response.json()
-                self.cache_manager.save_cache(cache_key, api_data)
-                logger.info("Successfully fetched and cached next race data")
+            
+            try:
+                try:
+                    api_data, shared = fetch()
+                except TaskCancelled:
+                    # The fetch we joined belonged to a refresh that was cancelled
+                    # (e.g. one started right after a cancel); fetch again unless
+                    # this task was cancelled too
+                    check_cancelled()
+                    api_data, shared = fetch()
+                if shared:
+                    logger.debug(f"Reused in-flight fetch for {cache_key}")
+            except RateLimitExceeded as e:
+                logger.warning(f"Skipped {description} refresh: {e}")
+                if force_refresh:
+                    # A manual refresh must report that nothing was refreshed
+                    raise
             except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to retrieve the next race from API: {e}")
+                logger.error(f"Failed to retrieve {description} from API: {e}")
+                if force_refresh:
+                    raise
                 if cached_data:
-                    logger.info("Using cached next race data as fallback")
+                    logger.info(f"Using cached {description} as fallback")
+            except TaskCancelled:
+                if force_refresh:
+                    raise
         
-        # Step 4: Process data (prefer API, fallback to cache)
-        data_to_process = api_data if api_data else cached_data
+        # Step 4: Prefer API data, fallback to cache
+        return api_data if api_data else cached_data
+    
+    def get_next_race(self, force_refresh: bool = False) -> Optional[Dict]:
+        """Fetch the next upcoming F1 race information with intelligent caching.
+        
+        Args:
+            force_refresh: Force API call even if cache is fresh (API and rate limit
+                errors are then raised instead of falling back to the cache)
+            
+        Returns:
+            Dictionary with race details or None if unavailable
+        """
+        cache_key = 'next_race'
+        data_to_process = self._get_data(
+            cache_key,
+            CACHE_SETTINGS['next_race'],
+            "current/next.json",
+            "next race data",
+            force_refresh
+        )
         
         if data_to_process:
             try:
@@ -107,45 +345,21 @@ class ErgastAPI:
         """Fetch the last completed F1 race information and podium results with intelligent caching.
         
         Args:
-            force_refresh: Force API call even if cache is fresh
+            force_refresh: Force API call even if cache is fresh (API and rate limit
+                errors are then raised instead of falling back to the cache)
             
         Returns:
             Tuple of (race_details dict, podium list) or (None, None) if unavailable
         """
         cache_key = 'last_race'
-        settings = CACHE_SETTINGS['last_race']
-        
-        # Step 1: Load from cache first (always try, even if expired)
-        cached_data = self.cache_manager.load_cache(cache_key, max_age_seconds=None)
-        
-        # Step 2: Determine if we should refresh
-        should_refresh = force_refresh or self.cache_manager.should_refresh(
+        data_to_process = self._get_data(
             cache_key,
-            settings['refresh_interval'],
-            settings['max_api_calls_per_day'],
+            CACHE_SETTINGS['last_race'],
+            "current/last/results.json",
+            "last race data",
             force_refresh
         )
         
-        # Step 3: Try API call if needed
-        api_data = None
-        if should_refresh:
-            try:
-                response = requests.get(
-                    f"{self.BASE_URL}/current/last/results.json",
-                    timeout=API_SETTINGS['timeout']
-                )
-                response.raise_for_status()
-                api_data = response.json()
-                self.cache_manager.save_cache(cache_key, api_data)
-                logger.info("Successfully fetched and cached last race data")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to retrieve the last race from API: {e}")
-                if cached_data:
-                    logger.info("Using cached last race data as fallback")
-        
-        # Step 4: Process data (prefer API, fallback to cache)
-        data_to_process = api_data if api_data else cached_data
-        
         if data_to_process:
             try:
                 race_results = data_to_process['MRData']['RaceTable']['Races'][0]
@@ -181,45 +395,21 @@ class ErgastAPI:
         """Fetch driver standings with intelligent caching.
         
         Args:
-            force_refresh: Force API call even if cache is fresh
+            force_refresh: Force API call even if cache is fresh (API and rate limit
+                errors are then raised instead of falling back to the cache)
             
         Returns:
             List of processed driver standings or None if unavailable
         """
         cache_key = 'driver_standings'
-        settings = CACHE_SETTINGS['driver_standings']
-        
-        # Step 1: Load from cache first (always try, even if expired)
-        cached_data = self.cache_manager.load_cache(cache_key, max_age_seconds=None)
-        
-        # Step 2: Determine if we should refresh
-        should_refresh = force_refresh or self.cache_manager.should_refresh(
+        data_to_process = self._get_data(
             cache_key,
-            settings['refresh_interval'],
-            settings['max_api_calls_per_day'],
+            CACHE_SETTINGS['driver_standings'],
+            "current/driverStandings.json",
+            "driver standings",
             force_refresh
         )
         
-        # Step 3: Try API call if needed
-        api_data = None
-        if should_refresh:
-            try:
-                response = requests.get(
-                    f"{self.BASE_URL}/current/driverStandings.json",
-                    timeout=API_SETTINGS['timeout']
-                )
-                response.raise_for_status()
-                api_data = response.json()
-                self.cache_manager.save_cache(cache_key, api_data)
-                logger.info("Successfully fetched and cached driver standings")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to retrieve driver standings from API: {e}")
-                if cached_data:
-                    logger.info("Using cached driver standings as fallback")
-        
-        # Step 4: Process data (prefer API, fallback to cache)
-        data_to_process = api_data if api_data else cached_data
-        
         if data_to_process:
             processed_data = self.processed_standings(data_to_process)
             if processed_data:
@@ -244,6 +434,7 @@ class ErgastAPI:
         processed_standings = []
         for driver in raw_standings:
             driver_info = {
+                'ID': driver['Driver']['driverId'],
                 'POS': int(driver['position']),
                 'NAME': f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}",
                 'NATIONALITY': driver['Driver']['nationality'],
@@ -262,7 +453,8 @@ class ErgastAPI:
         
         Args:
             season: F1 season year or 'current'
-            force_refresh: Force API call even if cache is fresh
+            force_refresh: Force API call even if cache is fresh (API and rate limit
+                errors are then raised instead of falling back to the cache)
             
         Returns:
             List of constructor standings
@@ -271,48 +463,21 @@ class ErgastAPI:
             Exception: If no data available from API or cache
         """
         cache_key = f'constructor_standings_{season}'
-        settings = CACHE_SETTINGS['constructor_standings']
-        
-        # Step 1: Load from cache first (always try, even if expired)
-        cached_data = self.cache_manager.load_cache(cache_key, max_age_seconds=None)
-        
-        # Step 2: Determine if we should refresh
-        should_refresh = force_refresh or self.cache_manager.should_refresh(
+        data_to_process = self._get_data(
             cache_key,
-            settings['refresh_interval'],
-            settings['max_api_calls_per_day'],
+            CACHE_SETTINGS['constructor_standings'],
+            f"{season}/constructorStandings.json",
+            "constructor standings",
             force_refresh
         )
         
-        # Step 3: Try API call if needed
-        api_data = None
-        if should_refresh:
-            try:
-                response = requests.get(
-                    f"{self.BASE_URL}/{season}/constructorStandings.json",
-                    timeout=API_SETTINGS['timeout']
-                )
-                response.raise_for_status()
-                api_data = response.json()
-                self.cache_manager.save_cache(cache_key, api_data)
-                logger.info("Successfully fetched and cached constructor standings")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to fetch constructor standings from API: {e}")
-                if cached_data:
-                    logger.info("Using cached constructor standings as fallback")
-        
-        # Step 4: Process data (prefer API, fallback to cache)
-        data_to_process = api_data if api_data else cached_data
-        
         if data_to_process:
             try:
                 standings = data_to_process['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
                 return standings
             except (KeyError, IndexError) as e:
                 logger.error(f"Unexpected data structure in API response: {e}")
-                if cached_data:
-                    raise Exception(f"Failed to process cached data: {e}") from e
-                raise Exception(f"Failed to fetch data: {e}") from e
+                raise Exception(f"Failed to process constructor standings data: {e}") from e
         
         raise Exception("No constructor standings data available from API or cache")
     
@@ -324,15 +489,21 @@ class ErgastAPI:
             
         Returns:
             pd.DataFrame: DataFrame containing processed constructor standings
+                (one row per constructor, keyed by ConstructorId)
         """
+        # pandas is only needed here; importing it lazily keeps it off the startup path
+        import pandas as pd
+
         data = []
         for item in standings:
+            constructor_id = item['Constructor']['constructorId']
             constructor = item['Constructor']['name']
             points = item['points']
             wins = item['wins']
             position = item['position']
             data.append({
                 'Position': position,
+                'ConstructorId': constructor_id,
                 'Constructor': constructor,
                 'Wins': wins,
                 'Points': points
@@ -343,30 +514,56 @@ class ErgastAPI:
         """Fetch and process constructor championship standings.
         
         Args:
-            force_refresh: Force API call even if cache is fresh
+            force_refresh: Force API call even if cache is fresh (API and rate limit
+                errors are then raised instead of falling back to the cache)
             
         Returns:
             pd.DataFrame: DataFrame containing constructor standings with
-                Position, Constructor, Points, and Wins columns
+                Position, ConstructorId, Constructor, Points, and Wins columns
         """
         standings = self.fetch_constructor_standings(force_refresh=force_refresh)
         return self.process_constructors_standings(standings)
     
-    def refresh_all_data(self):
+    def refresh_all_data(self, on_result=None, cancel=None) -> Dict[str, Dict]:
         """Manually refresh all cached data by forcing API calls.
         
         This method bypasses cache checks and fetches fresh data from the API
-        for all endpoints. Use sparingly to respect API rate limits.
+        for all endpoints. The endpoints are requested concurrently, so the
+        refresh takes as long as the slowest endpoint rather than the sum of
+        all of them. Use sparingly to respect API rate limits.
+        
+        Args:
+            on_result: Optional callback invoked as ``on_result(name, result)``
+                from a worker thread as soon as each endpoint finishes
+            cancel: Optional threading.Event; once set, endpoints whose request
+                has not been sent yet are skipped
+        
+        Returns:
+            Dictionary mapping endpoint name to a result record with ``ok``,
+            ``value`` (processed data), ``error`` and ``elapsed`` keys. Network,
+            HTTP and rate limit failures give ``ok=False``; the cached data
+            is left as it was
         """
         logger.info("Manually refreshing all data...")
-        try:
-            self.get_next_race(force_refresh=True)
-            self.get_last_race(force_refresh=True)
-            self.get_driver_standings(force_refresh=True)
-            self.get_constructors_championship(force_refresh=True)
+        tasks = {
+            'next_race': lambda: self.get_next_race(force_refresh=True),
+            'last_race': lambda: self.get_last_race(force_refresh=True),
+            'driver_standings': lambda: self.get_driver_standings(force_refresh=True),
+            'constructor_standings': lambda: self.get_constructors_championship(force_refresh=True),
+        }
+        # One metadata write for the whole refresh instead of one per endpoint
+        with self.cache_manager.batch():
+            results = self.fetch_engine.run_all(tasks, on_result=on_result, cancel=cancel)
+        
+        if cancel is not None and cancel.is_set():
+            logger.info("Manual refresh cancelled")
+            return results
+        failed = [name for name, result in results.items() if not result['ok']]
+        for name in failed:
+            logger.error(f"Error during manual refresh of {name}: {results[name]['error']}")
+        if not failed:
             logger.info("All data refreshed successfully")
-        except Exception as e:
-            logger.error(f"Error during manual refresh: {e}")
+        return results
     
     def get_cache_status(self) -> Dict[str, Any]:
         """Get status information about cached data.
@@ -380,7 +577,7 @@ class ErgastAPI:
         for key in cache_keys:
             last_update = self.cache_manager.get_last_update_time(key)
             call_count = self.cache_manager.get_api_call_count(key)
-            has_cache = self.cache_manager.load_cache(key) is not None
+            has_cache = self.cache_manager.has_cache(key)
             
             status[key] = {
                 'has_cache': has_cache,
@@ -389,3 +586,25 @@ class ErgastAPI:
             }
         
         return status
+    
+    def time_until_next_call(self, cache_key: Optional[str] = None) -> float:
+        """Get how long until the rate limiter allows the next API call.
+        
+        Args:
+            cache_key: Cache key whose daily budget should also be checked
+                (None = global budgets only)
+                
+        Returns:
+            Seconds to wait, 0.0 if a call is allowed now
+        """
+        max_calls_per_day = None
+        if cache_key is not None:
+            settings_key = 'constructor_standings' if cache_key.startswith('constructor_standings') else cache_key
+            max_calls_per_day = CACHE_SETTINGS.get(settings_key, {}).get('max_api_calls_per_day')
+        return self.rate_limiter.time_until_allowed(cache_key, max_calls_per_day)
+    
+    def close(self):
+        """Release the worker threads, pooled HTTP connections and cache backend."""
+        self.fetch_engine.shutdown(wait=False)
+        self.session.close()
+        self.cache_manager.close()
@@ -0,0 +1,180 @@
+"""
+Cache for derived DataFrames built from the local Ergast data
+
+An artifact (e.g. the processed race details of one race) is stored as a
+single NumPy .npz file whose name carries the artifact key and a
+fingerprint of the source tables it was built from plus a format version.
+When none of the sources changed the file is loaded directly and the build
+step (joins, lookups) is skipped; any change to a source table produces a
+new fingerprint, so stale artifacts are never read.
+
+Columns are stored typed: numbers, datetimes and timedeltas as native
+arrays, text as categorical codes plus a categories array. Text columns are
+decoded back to plain object columns on load, so a cached frame has the same
+dtypes as a freshly built one.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .local_store import DATA_DIR, table_fingerprint
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = os.path.join(DATA_DIR, 'artifacts')
+META_KEY = '__meta__'
+
+
+def save_frame(path: str, frame: pd.DataFrame, meta: Optional[dict] = None):
+    """Write a DataFrame to an .npz file atomically.
+
+    Args:
+        path: Target file
+        frame: DataFrame with numeric, datetime, timedelta or text columns
+        meta: Extra JSON-serializable metadata to store with it
+    """
+    arrays, kinds = {}, {}
+    for position, column in enumerate(frame.columns):
+        series = frame[column]
+        name = f"c{position}"
+        values = series.to_numpy()
+        if values.dtype.kind in 'biufmM':  # bool, numbers, datetime64, timedelta64
+            arrays[name] = values
+            kinds[column] = 'array'
+        else:
+            categorical = pd.Categorical(series.astype('string').astype(object))
+            arrays[name] = categorical.codes.astype(np.int32)
+            arrays[f"{name}.categories"] = np.asarray(categorical.categories, dtype=str)
+            kinds[column] = 'category'
+    arrays[META_KEY] = np.array(json.dumps({
+        'columns': [str(column) for column in frame.columns],
+        'kinds': kinds,
+        'rows': len(frame),
+        **(meta or {}),
+    }))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_frame(path: str) -> pd.DataFrame:
+    """Read a DataFrame written by save_frame.
+
+    Text columns come back as object columns (None for missing values).
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a valid artifact
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(str(archive[META_KEY]))
+        data = {}
+        for position, column in enumerate(meta['columns']):
+            name = f"c{position}"
+            if meta['kinds'][column] == 'category':
+                codes = archive[name]
+                categories = archive[f"{name}.categories"].astype(object)
+                values = np.full(len(codes), None, dtype=object)
+                present = codes >= 0
+                values[present] = categories[codes[present]]
+                data[column] = values
+            else:
+                data[column] = archive[name]
+    return pd.DataFrame(data, columns=meta['columns'], index=pd.RangeIndex(meta['rows']))
+
+
+class ArtifactCache:
+    """Versioned cache of DataFrames derived from local data tables."""
+
+    def __init__(self, name: str, tables: Sequence[str], version: int = 1,
+                 directory: str = ARTIFACT_DIR, data_dir: str = DATA_DIR):
+        """Initialize the cache.
+
+        Args:
+            name: Artifact family name (also the subdirectory name)
+            tables: Source tables whose changes invalidate the artifacts
+            version: Bump when the build logic or output format changes
+            directory: Root directory for artifacts
+            data_dir: Directory holding the source CSV files
+        """
+        self.name = name
+        self.tables = tuple(tables)
+        self.version = version
+        self.directory = os.path.join(directory, name)
+        self.data_dir = data_dir
+
+    def fingerprint(self) -> str:
+        """Get a short hash of the format version and every source table's fingerprint."""
+        sources = {table: table_fingerprint(table, self.data_dir) for table in self.tables}
+        payload = json.dumps({'version': self.version, 'sources': sources}, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def path(self, key, fingerprint: Optional[str] = None) -> str:
+        """Get the artifact file for a key and fingerprint (default: current)."""
+        fingerprint = fingerprint or self.fingerprint()
+        return os.path.join(self.directory, f"{key}-{fingerprint}.npz")
+
+    def get(self, key) -> Optional[pd.DataFrame]:
+        """Load an artifact built from the current sources.
+
+        Returns:
+            DataFrame or None if missing, stale or unreadable
+        """
+        path = self.path(key)
+        try:
+            return load_frame(path)
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Discarding unreadable artifact {path}: {e}")
+            return None
+
+    def put(self, key, frame: pd.DataFrame):
+        """Store an artifact for the current sources, replacing older versions of it."""
+        fingerprint = self.fingerprint()
+        path = self.path(key, fingerprint)
+        save_frame(path, frame, {'key': str(key), 'fingerprint': fingerprint})
+        prefix = f"{key}-"
+        for file in os.listdir(self.directory):
+            if file.startswith(prefix) and file.endswith('.npz') and file != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(self.directory, file))
+                except OSError:
+                    pass
+
+    def get_or_build(self, key, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Load an artifact, building and storing it first if needed.
+
+        Args:
+            key: Artifact key (e.g. a raceId)
+            build: Function that builds the DataFrame from the sources
+
+        Returns:
+            The artifact DataFrame
+        """
+        frame = self.get(key)
+        if frame is None:
+            frame = build()
+            try:
+                self.put(key, frame)
+            except (IOError, OSError) as e:
+                logger.error(f"Failed to store artifact {self.name}/{key}: {e}")
+        return frame
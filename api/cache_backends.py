@@ -0,0 +1,286 @@
+"""
+Storage backends for CacheManager
+
+A backend stores cache entries (JSON-serializable payloads) by key together
+with their last update time. Available backends:
+- 'filesystem': one JSON file per key in the cache directory (default)
+- 'sqlite': a single SQLite database file with indexed lookup by key and
+  by update time, suited to thousands of season/round-parameterized keys
+"""
+
+import json
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, List, Tuple
+
+from .file_utils import atomic_write_json, dump_json
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface implemented by every cache storage backend."""
+
+    name = None
+
+    def read(self, cache_key: str) -> Optional[Tuple[Dict, float]]:
+        """Read an entry.
+
+        Args:
+            cache_key: Unique identifier for the cache entry
+
+        Returns:
+            Tuple of (data, last update timestamp) or None if missing
+
+        Raises:
+            ValueError: If the stored payload is corrupt
+            IOError: If the storage cannot be read
+        """
+        raise NotImplementedError
+
+    def write(self, cache_key: str, data: Dict, updated_at: Optional[float] = None) -> float:
+        """Store an entry, replacing any previous value.
+
+        Args:
+            cache_key: Unique identifier for the cache entry
+            data: JSON-serializable payload
+            updated_at: Update timestamp to record (None = now)
+
+        Returns:
+            The recorded update timestamp
+
+        Raises:
+            IOError: If the storage cannot be written
+        """
+        raise NotImplementedError
+
+    def touch(self, cache_key: str) -> Optional[float]:
+        """Bump the update time of an existing entry without rewriting it.
+
+        Returns:
+            The new update timestamp or None if the entry does not exist
+        """
+        raise NotImplementedError
+
+    def exists(self, cache_key: str) -> bool:
+        """Check whether an entry exists."""
+        raise NotImplementedError
+
+    def delete(self, cache_key: str) -> bool:
+        """Delete an entry.
+
+        Returns:
+            True if an entry was removed
+        """
+        raise NotImplementedError
+
+    def keys(self, updated_since: Optional[float] = None) -> List[str]:
+        """List stored keys.
+
+        Args:
+            updated_since: Only return keys updated at or after this timestamp
+
+        Returns:
+            Keys ordered by update time, oldest first
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Delete every entry."""
+        for cache_key in self.keys():
+            self.delete(cache_key)
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class FileSystemBackend(CacheBackend):
+    """Stores each entry as ``<cache_dir>/<cache_key>.json``; the file mtime is the update time."""
+
+    name = 'filesystem'
+
+    def __init__(self, cache_dir: str, reserved_files=(), compact: bool = True, fsync: bool = True):
+        """Initialize the filesystem backend.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            reserved_files: File names in the directory that are not entries
+            compact: Write compact JSON instead of indented JSON
+            fsync: Flush each file to disk before renaming it into place
+        """
+        self.cache_dir = cache_dir
+        self.reserved_files = set(reserved_files)
+        self.compact = compact
+        self.fsync = fsync
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, cache_key: str) -> str:
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, f"{cache_key}.json")
+
+    def read(self, cache_key: str) -> Optional[Tuple[Dict, float]]:
+        path = self.path(cache_key)
+        try:
+            updated_at = os.path.getmtime(path)
+            with open(path, 'r') as f:
+                return json.load(f), updated_at
+        except FileNotFoundError:
+            return None
+
+    def write(self, cache_key: str, data: Dict, updated_at: Optional[float] = None) -> float:
+        path = self.path(cache_key)
+        atomic_write_json(path, data, self.compact, self.fsync)
+        if updated_at is not None:
+            os.utime(path, (updated_at, updated_at))
+        return os.path.getmtime(path)
+
+    def touch(self, cache_key: str) -> Optional[float]:
+        path = self.path(cache_key)
+        try:
+            os.utime(path)
+            return os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+
+    def exists(self, cache_key: str) -> bool:
+        return os.path.exists(self.path(cache_key))
+
+    def delete(self, cache_key: str) -> bool:
+        try:
+            os.remove(self.path(cache_key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def keys(self, updated_since: Optional[float] = None) -> List[str]:
+        # No index on disk: this scans the directory
+        entries = []
+        for file in os.listdir(self.cache_dir):
+            if not file.endswith('.json') or file in self.reserved_files:
+                continue
+            try:
+                updated_at = os.path.getmtime(os.path.join(self.cache_dir, file))
+            except FileNotFoundError:
+                continue
+            if updated_since is None or updated_at >= updated_since:
+                entries.append((updated_at, file[:-len('.json')]))
+        return [cache_key for _, cache_key in sorted(entries)]
+
+
+class SQLiteBackend(CacheBackend):
+    """Stores all entries in one SQLite file, indexed by key and by update time."""
+
+    name = 'sqlite'
+
+    def __init__(self, cache_dir: str, filename: str = 'cache.db'):
+        """Initialize the SQLite backend.
+
+        Args:
+            cache_dir: Directory holding the database file
+            filename: Database file name
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, filename)
+        self._lock = threading.Lock()
+        # One connection shared by all threads, serialized by the lock;
+        # SQLite's own file locking handles other processes
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'cache_key TEXT PRIMARY KEY, '
+                'data TEXT NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cache_entries_updated_at '
+                'ON cache_entries (updated_at)'
+            )
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a statement in its own transaction and return all rows."""
+        try:
+            with self._lock, self._conn:
+                return self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise IOError(f"SQLite cache error: {e}") from e
+
+    def read(self, cache_key: str) -> Optional[Tuple[Dict, float]]:
+        rows = self._execute(
+            'SELECT data, updated_at FROM cache_entries WHERE cache_key = ?', (cache_key,)
+        )
+        if not rows:
+            return None
+        data, updated_at = rows[0]
+        return json.loads(data), updated_at
+
+    def write(self, cache_key: str, data: Dict, updated_at: Optional[float] = None) -> float:
+        updated_at = time.time() if updated_at is None else updated_at
+        self._execute(
+            'INSERT OR REPLACE INTO cache_entries (cache_key, data, updated_at) VALUES (?, ?, ?)',
+            (cache_key, dump_json(data), updated_at)
+        )
+        return updated_at
+
+    def touch(self, cache_key: str) -> Optional[float]:
+        if not self.exists(cache_key):
+            return None
+        updated_at = time.time()
+        self._execute(
+            'UPDATE cache_entries SET updated_at = ? WHERE cache_key = ?', (updated_at, cache_key)
+        )
+        return updated_at
+
+    def exists(self, cache_key: str) -> bool:
+        return bool(self._execute('SELECT 1 FROM cache_entries WHERE cache_key = ?', (cache_key,)))
+
+    def delete(self, cache_key: str) -> bool:
+        existed = self.exists(cache_key)
+        self._execute('DELETE FROM cache_entries WHERE cache_key = ?', (cache_key,))
+        return existed
+
+    def keys(self, updated_since: Optional[float] = None) -> List[str]:
+        if updated_since is None:
+            rows = self._execute('SELECT cache_key FROM cache_entries ORDER BY updated_at')
+        else:
+            rows = self._execute(
+                'SELECT cache_key FROM cache_entries WHERE updated_at >= ? ORDER BY updated_at',
+                (updated_since,)
+            )
+        return [row[0] for row in rows]
+
+    def clear(self):
+        self._execute('DELETE FROM cache_entries')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+BACKENDS = {
+    FileSystemBackend.name: FileSystemBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def create_backend(name: str, cache_dir: str, **kwargs) -> CacheBackend:
+    """Create a cache backend by name.
+
+    Args:
+        name: Backend name ('filesystem' or 'sqlite')
+        cache_dir: Directory used by the backend
+        **kwargs: Extra backend-specific options
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown cache backend '{name}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name](cache_dir, **kwargs)
@@ -3,70 +3,201 @@ Cache Manager for F1 Data
 
 Provides intelligent caching with:
 - Metadata tracking (last update, API call counts)
+- HTTP validators (ETag, Last-Modified, content hash) for conditional requests
+- In-memory LRU/TTL tier in front of the JSON files
+- Atomic, file-locked writes so several processes can share one cache directory
+- Batched metadata writes for bulk refreshes
+- Pluggable storage backends (JSON files or a single SQLite file)
 - Smart cache invalidation based on F1 schedule
 - Manual refresh controls
 - API call rate limiting
 """
 
+import hashlib
 import json
 import os
 import time
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
+from .cache_backends import CacheBackend, create_backend
+from .config import MEMORY_CACHE_SETTINGS, CACHE_STORAGE_SETTINGS
+from .file_utils import FileLock, atomic_write_json
+from .memory_cache import MemoryCache
+
 logger = logging.getLogger(__name__)
 
 
 class CacheManager:
     """Manages caching with metadata tracking and smart invalidation."""
     
-    def __init__(self, cache_dir='api/cache'):
+    # Bookkeeping files in the cache directory that are not cache entries
+    RESERVED_FILES = ('cache_metadata.json', 'rate_limits.json')
+    
+    def __init__(self, cache_dir='api/cache', rate_limiter=None, backend=None):
         """Initialize cache manager.
         
         Args:
             cache_dir: Directory for cache files
+            rate_limiter: Optional RateLimiter whose recorded calls back the
+                per-key daily call counts
+            backend: CacheBackend instance or backend name for cache entries
+                (None = CACHE_STORAGE_SETTINGS['backend'])
         """
         self.cache_dir = cache_dir
+        self.rate_limiter = rate_limiter
         self.metadata_file = os.path.join(cache_dir, 'cache_metadata.json')
+        # Guards metadata and cache files against other threads and processes
+        self._lock = FileLock(os.path.join(cache_dir, '.cache.lock'))
+        # Metadata changes not yet merged into the metadata file
+        self._pending_changes = []
+        # Open batch() scopes; metadata writes are deferred while > 0
+        self._batch_depth = 0
+        self._batch_lock = threading.Lock()
+        self.compact_json = CACHE_STORAGE_SETTINGS['compact_json']
+        self.fsync = CACHE_STORAGE_SETTINGS['fsync']
         self._ensure_cache_dir()
         self._load_metadata()
+        if not isinstance(backend, CacheBackend):
+            backend = self._create_backend(backend or CACHE_STORAGE_SETTINGS['backend'])
+        self.backend = backend
+        self.memory_cache = MemoryCache(
+            MEMORY_CACHE_SETTINGS['max_entries'],
+            MEMORY_CACHE_SETTINGS['ttl']
+        )
     
     def _ensure_cache_dir(self):
         """Create cache directory if it doesn't exist."""
         os.makedirs(self.cache_dir, exist_ok=True)
     
-    def _load_metadata(self):
-        """Load cache metadata from file."""
+    def _create_backend(self, name: str) -> CacheBackend:
+        """Create a storage backend for this cache directory by name."""
+        if name == 'filesystem':
+            return create_backend(name, self.cache_dir, reserved_files=self.RESERVED_FILES,
+                                  compact=self.compact_json, fsync=self.fsync)
+        return create_backend(name, self.cache_dir)
+    
+    @staticmethod
+    def _empty_metadata() -> Dict[str, Dict]:
+        """Create an empty metadata structure."""
+        return {
+            'api_calls': {},
+            'last_updates': {},
+            'cache_settings': {},
+            'validators': {}
+        }
+    
+    def _read_metadata_file(self) -> Dict[str, Dict]:
+        """Read the metadata file, falling back to empty metadata."""
         try:
             if os.path.exists(self.metadata_file):
                 with open(self.metadata_file, 'r') as f:
-                    self.metadata = json.load(f)
+                    metadata = json.load(f)
             else:
-                self.metadata = {
-                    'api_calls': {},
-                    'last_updates': {},
-                    'cache_settings': {}
-                }
+                metadata = self._empty_metadata()
         except (json.JSONDecodeError, IOError) as e:
             logger.warning(f"Error loading metadata: {e}. Creating new metadata.")
-            self.metadata = {
-                'api_calls': {},
-                'last_updates': {},
-                'cache_settings': {}
-            }
+            metadata = self._empty_metadata()
+        # Metadata written by older versions may lack newer sections
+        for section, entries in self._empty_metadata().items():
+            metadata.setdefault(section, entries)
+        return metadata
+    
+    def _load_metadata(self):
+        """Load cache metadata from file."""
+        self.metadata = self._read_metadata_file()
+    
+    @staticmethod
+    def _apply_change(metadata: Dict[str, Dict], change: tuple):
+        """Apply one (operation, section, key, value) change to a metadata dict."""
+        operation, section, key, value = change
+        entries = metadata.setdefault(section, {})
+        if operation == 'set':
+            entries[key] = value
+        elif operation == 'increment':
+            entries[key] = entries.get(key, 0) + value
+        elif operation == 'merge':
+            entries.setdefault(key, {}).update(value)
+        elif operation == 'delete':
+            entries.pop(key, None)
+        elif operation == 'clear':
+            entries.clear()
+    
+    def _update_metadata(self, operation: str, section: str,
+                         key: Optional[str] = None, value: Any = None):
+        """Apply a metadata change in memory and queue it for the next save.
+        
+        Args:
+            operation: One of 'set', 'increment', 'merge', 'delete' or 'clear'
+            section: Metadata section (e.g. 'last_updates')
+            key: Cache key inside the section (unused for 'clear')
+            value: New value, increment or dict to merge
+        """
+        change = (operation, section, key, value)
+        with self._lock:
+            self._apply_change(self.metadata, change)
+            self._pending_changes.append(change)
     
     def _save_metadata(self):
-        """Save metadata to file."""
+        """Save metadata to file unless a batch is open."""
+        if self._batch_depth > 0:
+            return
+        self.flush_metadata()
+    
+    @contextmanager
+    def batch(self):
+        """Group metadata updates into a single write.
+        
+        While any batch is open, metadata changes from every thread are kept
+        in memory; the outermost batch writes them with one file write on
+        exit. Batches may be nested. Cache files are still written
+        immediately, so a crash inside a batch loses only the metadata
+        changes, which at worst triggers an extra refresh.
+        
+        Example:
+            with cache_manager.batch():
+                cache_manager.save_cache('a', data_a)
+                cache_manager.save_cache('b', data_b)
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
         try:
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2)
-        except IOError as e:
-            logger.error(f"Failed to save metadata: {e}")
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush_metadata()
+    
+    def flush_metadata(self):
+        """Merge pending changes into the metadata file.
+        
+        The file is re-read under the inter-process lock and the pending
+        changes are replayed on top of it, so updates made by other processes
+        sharing the cache directory are kept. The result is written atomically.
+        """
+        with self._lock:
+            if not self._pending_changes:
+                return
+            try:
+                metadata = self._read_metadata_file()
+                for change in self._pending_changes:
+                    self._apply_change(metadata, change)
+                atomic_write_json(self.metadata_file, metadata, self.compact_json, self.fsync)
+                self.metadata = metadata
+                self._pending_changes = []
+            except IOError as e:
+                logger.error(f"Failed to save metadata: {e}")
     
     def get_cache_path(self, cache_key: str) -> str:
         """Get file path for a cache key.
         
+        Only meaningful for the filesystem backend.
+        
         Args:
             cache_key: Unique identifier for the cache entry
             
@@ -78,6 +209,10 @@ class CacheManager:
     def load_cache(self, cache_key: str, max_age_seconds: Optional[int] = None) -> Optional[Dict]:
         """Load data from cache if it exists and is fresh.
         
+        Reads are served from the in-memory tier when possible and only fall
+        through to the storage backend on a miss. The returned data is shared with
+        the memory tier and must not be mutated.
+        
         Args:
             cache_key: Unique identifier for the cache entry
             max_age_seconds: Maximum age in seconds (None = always valid if exists)
@@ -85,54 +220,134 @@ class CacheManager:
         Returns:
             Cached data or None if not available/expired
         """
-        cache_path = self.get_cache_path(cache_key)
-        
-        if not os.path.exists(cache_path):
-            return None
+        entry = self.memory_cache.get(cache_key)
+        if entry is not None:
+            data, file_mod_time = entry
+        else:
+            try:
+                entry = self.backend.read(cache_key)
+            except (ValueError, IOError) as e:
+                logger.warning(f"Error reading cache entry {cache_key}: {e}")
+                return None
+            if entry is None:
+                return None
+            data, file_mod_time = entry
+            self.memory_cache.put(cache_key, data, file_mod_time)
+            logger.debug(f"Loaded cache for {cache_key}")
         
         # Check if cache is expired
         if max_age_seconds is not None:
-            file_mod_time = os.path.getmtime(cache_path)
             current_time = time.time()
             if (current_time - file_mod_time) > max_age_seconds:
                 logger.debug(f"Cache expired for {cache_key}")
                 return None
         
-        try:
-            with open(cache_path, 'r') as f:
-                data = json.load(f)
-            logger.debug(f"Loaded cache for {cache_key}")
-            return data
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Error reading cache file {cache_key}: {e}")
-            return None
+        return data
     
-    def save_cache(self, cache_key: str, data: Dict, force_refresh: bool = False):
+    def has_cache(self, cache_key: str) -> bool:
+        """Check whether data is cached for a key without parsing it.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            
+        Returns:
+            True if the entry is in memory or in the storage backend
+        """
+        return self.memory_cache.contains(cache_key) or self.backend.exists(cache_key)
+    
+    def get_cached_keys(self, updated_since: Optional[float] = None) -> list:
+        """List cached keys, oldest update first.
+        
+        Args:
+            updated_since: Only return keys updated at or after this timestamp
+            
+        Returns:
+            List of cache keys
+        """
+        return self.backend.keys(updated_since)
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the in-memory cache tier."""
+        return self.memory_cache.stats()
+    
+    def save_cache(self, cache_key: str, data: Dict, force_refresh: bool = False,
+                   validators: Optional[Dict[str, str]] = None):
         """Save data to cache and update metadata.
         
+        The cache entry is only rewritten when the content hash differs from
+        the one stored for the key; an identical payload just bumps the
+        last update time.
+        
         Args:
             cache_key: Unique identifier for the cache entry
             data: Data to cache
             force_refresh: If True, bypass checks and force save
+            validators: HTTP validators from the response ('etag', 'last_modified')
         """
-        cache_path = self.get_cache_path(cache_key)
+        content_hash = self._content_hash(data)
         
         try:
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            # Update metadata
-            self.metadata['last_updates'][cache_key] = time.time()
-            if cache_key not in self.metadata['api_calls']:
-                self.metadata['api_calls'][cache_key] = 0
-            self.metadata['api_calls'][cache_key] += 1
-            
-            self._save_metadata()
-            logger.info(f"Cached data for {cache_key}")
+            with self._lock:
+                stored = self.metadata['validators'].get(cache_key, {})
+                updated_at = None
+                unchanged = not force_refresh and stored.get('content_hash') == content_hash
+                if unchanged:
+                    updated_at = self.backend.touch(cache_key)
+                    unchanged = updated_at is not None
+                if not unchanged:
+                    updated_at = self.backend.write(cache_key, data)
+                self.memory_cache.put(cache_key, data, updated_at)
+                
+                # Update metadata
+                self._update_metadata('set', 'last_updates', cache_key, time.time())
+                self._update_metadata('increment', 'api_calls', cache_key, 1)
+                self._update_metadata('set', 'validators', cache_key,
+                                      dict(validators or {}, content_hash=content_hash))
+                
+                self._save_metadata()
+            if unchanged:
+                logger.info(f"Cache for {cache_key} unchanged, skipped rewrite")
+            else:
+                logger.info(f"Cached data for {cache_key}")
         except IOError as e:
             logger.error(f"Failed to save cache for {cache_key}: {e}")
     
+    def mark_fresh(self, cache_key: str, validators: Optional[Dict[str, str]] = None):
+        """Record a successful revalidation (HTTP 304) without rewriting the cache.
+        
+        Bumps the last update time but does not count as an API call, so it
+        never uses up the endpoint's daily budget.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            validators: Refreshed HTTP validators sent with the 304 response
+        """
+        with self._lock:
+            self.backend.touch(cache_key)
+            self.memory_cache.invalidate(cache_key)
+            self._update_metadata('set', 'last_updates', cache_key, time.time())
+            if validators:
+                self._update_metadata('merge', 'validators', cache_key, validators)
+            self._save_metadata()
+        logger.info(f"Cache for {cache_key} revalidated (not modified)")
+    
+    def get_validators(self, cache_key: str) -> Dict[str, str]:
+        """Get stored HTTP validators for a cache key.
+        
+        Args:
+            cache_key: Unique identifier for the cache entry
+            
+        Returns:
+            Dictionary with any of 'etag', 'last_modified' and 'content_hash'
+        """
+        return dict(self.metadata['validators'].get(cache_key, {}))
+    
+    @staticmethod
+    def _content_hash(data: Dict) -> str:
+        """Stable SHA-256 of a JSON-serializable payload."""
+        encoded = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
     def should_refresh(self, cache_key: str, refresh_interval: int, 
                       max_api_calls_per_day: Optional[int] = None,
                       force_refresh: bool = False) -> bool:
@@ -151,8 +366,7 @@ class CacheManager:
             return True
         
         # Check if cache exists
-        cache_path = self.get_cache_path(cache_key)
-        if not os.path.exists(cache_path):
+        if not self.has_cache(cache_key):
             return True
         
         # Check refresh interval
@@ -172,7 +386,9 @@ class CacheManager:
     
     def _get_calls_today(self, cache_key: str) -> int:
         """Get number of API calls made today for a cache key."""
-        # This is simplified - in production, you'd track calls per day
+        if self.rate_limiter is not None:
+            return self.rate_limiter.calls_in_window(cache_key, 86400)
+        # Without a rate limiter this is an approximation - in production, you'd track calls per day
         # For now, we'll use a simple counter that resets daily
         last_update = self.metadata['last_updates'].get(cache_key, 0)
         if time.time() - last_update > 86400:  # More than 24 hours ago
@@ -269,25 +485,29 @@ class CacheManager:
         # Default behavior
         return self.should_refresh(cache_key, refresh_interval)
     
+    def close(self):
+        """Release resources held by the storage backend."""
+        self.backend.close()
+    
     def clear_cache(self, cache_key: Optional[str] = None):
         """Clear cache for a specific key or all caches.
         
         Args:
             cache_key: Specific cache to clear (None = clear all)
         """
-        if cache_key:
-            cache_path = self.get_cache_path(cache_key)
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
-                if cache_key in self.metadata['last_updates']:
-                    del self.metadata['last_updates'][cache_key]
-                logger.info(f"Cleared cache for {cache_key}")
-        else:
-            # Clear all caches
-            for file in os.listdir(self.cache_dir):
-                if file.endswith('.json') and file != 'cache_metadata.json':
-                    os.remove(os.path.join(self.cache_dir, file))
-            self.metadata['last_updates'] = {}
-            logger.info("Cleared all caches")
-        
-        self._save_metadata()
+        with self._lock:
+            if cache_key:
+                self.memory_cache.invalidate(cache_key)
+                if self.backend.delete(cache_key):
+                    self._update_metadata('delete', 'last_updates', cache_key)
+                    self._update_metadata('delete', 'validators', cache_key)
+                    logger.info(f"Cleared cache for {cache_key}")
+            else:
+                # Clear all caches
+                self.memory_cache.invalidate()
+                self.backend.clear()
+                self._update_metadata('clear', 'last_updates')
+                self._update_metadata('clear', 'validators')
+                logger.info("Cleared all caches")
+            
+            self._save_metadata()
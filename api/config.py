@@ -26,11 +26,30 @@ CACHE_SETTINGS = {
     }
 }
 
+# In-process cache tier in front of the JSON files
+MEMORY_CACHE_SETTINGS = {
+    'max_entries': 64,
+    'ttl': 300  # 5 minutes
+}
+
+# On-disk cache file settings
+CACHE_STORAGE_SETTINGS = {
+    'backend': 'filesystem',  # 'filesystem' (JSON file per key) or 'sqlite' (single cache.db)
+    'compact_json': True,  # no indentation in cache and metadata files
+    'fsync': True  # flush writes to disk before renaming them into place
+}
+
 # API settings
 API_SETTINGS = {
     'base_url': 'http://ergast.com/api/f1',
     'timeout': 5,
-    'max_retries': 2
+    'max_retries': 2,
+    'backoff_factor': 0.5,  # seconds, doubled on every retry
+    'max_retry_after': 10,  # seconds; longer Retry-After hints are capped
+    'max_connections_per_host': 4,
+    'max_concurrent_requests': 4,
+    # Serve stale cache immediately and refresh it on a background worker
+    'stale_while_revalidate': False
 }
 
 # Global API call limits
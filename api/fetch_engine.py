@@ -0,0 +1,151 @@
+"""
+Concurrent fetch engine for F1 Data
+
+Runs independent endpoint fetches on a shared thread pool so that a full
+refresh costs as long as the slowest endpoint instead of the sum of all of
+them. Every task is isolated: a failure in one endpoint is captured in its
+result record and never cancels the others.
+
+A batch can be cancelled with an event. Tasks that have not started are
+skipped; running tasks can call check_cancelled() at safe points (e.g. just
+before an HTTP request) to stop early.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Cancel event of the task running on the current worker thread
+_task_state = threading.local()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task whose batch was cancelled."""
+
+    def __init__(self):
+        super().__init__('cancelled')
+
+
+def check_cancelled():
+    """Raise TaskCancelled if the batch of the task running on this thread was cancelled.
+
+    A no-op outside of run_all tasks or when no cancel event was given.
+    """
+    cancel = getattr(_task_state, 'cancel', None)
+    if cancel is not None and cancel.is_set():
+        raise TaskCancelled()
+
+
+class FetchEngine:
+    """Thread-pool backed runner for concurrent API requests."""
+
+    def __init__(self, max_workers: int = 4):
+        """Initialize the fetch engine.
+
+        Args:
+            max_workers: Maximum number of requests in flight at once
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='ergast-fetch'
+        )
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule a single callable on the worker pool.
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future for the scheduled call
+        """
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def run_all(self, tasks: Dict[str, Callable[[], Any]],
+                timeout: Optional[float] = None,
+                on_result: Optional[Callable[[str, Dict], None]] = None,
+                cancel: Optional[threading.Event] = None) -> Dict[str, Dict]:
+        """Run all tasks concurrently and wait until every one finishes or fails.
+
+        Args:
+            tasks: Mapping of task name to a zero-argument callable
+            timeout: Overall deadline in seconds (None = wait for all tasks)
+            on_result: Optional callback invoked as ``on_result(name, result)``
+                as soon as each task completes
+            cancel: Optional event; once set, tasks that have not started yet
+                are skipped and running tasks stop at their next
+                check_cancelled() call, both reported with a ``cancelled``
+                error (a request already sent still runs to completion)
+
+        Returns:
+            Dictionary mapping each task name to a result record with
+            ``ok``, ``value``, ``error`` and ``elapsed`` keys
+        """
+        futures = {self._executor.submit(self._run_task, task, cancel): name
+                   for name, task in tasks.items()}
+        results = {}
+        started = time.perf_counter()
+
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                name = futures[future]
+                results[name] = future.result()
+                if on_result:
+                    on_result(name, results[name])
+        except FuturesTimeoutError:
+            elapsed = time.perf_counter() - started
+            for future, name in futures.items():
+                if name in results:
+                    continue
+                future.cancel()
+                results[name] = {
+                    'ok': False,
+                    'value': None,
+                    'error': f"timed out after {elapsed:.1f}s",
+                    'elapsed': elapsed
+                }
+                logger.warning(f"Fetch task {name} did not finish before the deadline")
+                if on_result:
+                    on_result(name, results[name])
+
+        return results
+
+    @staticmethod
+    def _run_task(task: Callable[[], Any], cancel: Optional[threading.Event] = None) -> Dict:
+        """Run a task and capture its value or error in a result record."""
+        started = time.perf_counter()
+        _task_state.cancel = cancel
+        try:
+            check_cancelled()
+            value = task()
+            return {
+                'ok': True,
+                'value': value,
+                'error': None,
+                'elapsed': time.perf_counter() - started
+            }
+        except Exception as e:
+            return {
+                'ok': False,
+                'value': None,
+                'error': str(e),
+                'elapsed': time.perf_counter() - started
+            }
+        finally:
+            _task_state.cancel = None
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release the worker threads.
+
+        Args:
+            wait: Block until running tasks have finished
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,132 @@
+"""
+Crash-safe file helpers for the cache directory
+
+Provides:
+- Atomic JSON writes (write to a temp file, fsync, then rename over the target)
+- A re-entrant inter-process lock backed by a lock file, so several
+  processes can share one cache directory
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Re-entrant lock that is exclusive across threads and processes.
+
+    Threads of one process serialize on an internal RLock; the first
+    acquisition in a thread also takes an OS-level lock on the lock file,
+    which excludes other processes.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the lock.
+
+        Args:
+            path: Lock file to create (its contents are irrelevant)
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    def acquire(self):
+        """Block until the lock is held by the calling thread."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._handle = open(self.path, 'a+')
+                if fcntl is not None:
+                    fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._handle.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue  # LK_LOCK gives up after ~10s, keep waiting
+            except Exception:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+                else:
+                    self._handle.seek(0)
+                    msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                self._handle.close()
+                self._handle = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def dump_json(data: Any, compact: bool = True) -> str:
+    """Serialize data to JSON text.
+
+    Args:
+        data: JSON-serializable data
+        compact: Use the minimal separators instead of indented output
+
+    Returns:
+        JSON string
+    """
+    if compact:
+        return json.dumps(data, separators=(',', ':'))
+    return json.dumps(data, indent=2)
+
+
+def atomic_write_json(path: str, data: Any, compact: bool = True, fsync: bool = True):
+    """Write JSON so readers see either the old or the new file, never a partial one.
+
+    Args:
+        path: Target file
+        data: JSON-serializable data
+        compact: Use compact serialization (see dump_json)
+        fsync: Flush the temp file to disk before renaming it into place
+
+    Raises:
+        IOError: If the file cannot be written
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(dump_json(data, compact))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
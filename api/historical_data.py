@@ -0,0 +1,332 @@
+"""
+Race-indexed repository over the local Ergast dump (api/localData)
+
+Each table is sorted once by race (in calendar order), driver or constructor
+and paired with an offset table, so looking up a race, a season, a driver's
+career or a constructor's history is an O(1) offset lookup that returns
+row slices of the sorted frames instead of scanning and copying whole tables.
+
+Usage:
+    repo = get_repository()
+    race = repo.get_race(1120)            # {'race': ..., 'results': ..., ...}
+    season = repo.get_season(2023)
+    career = repo.get_driver_career(1)
+"""
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Optional, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .local_store import DATA_DIR, load_table
+
+logger = logging.getLogger(__name__)
+
+# Tables with one or more rows per race
+RACE_TABLES = (
+    'results', 'qualifying', 'sprint_results', 'lap_times', 'pit_stops',
+    'driver_standings', 'constructor_standings', 'constructor_results',
+)
+# Race tables that also carry driverId / constructorId
+DRIVER_TABLES = ('results', 'qualifying', 'sprint_results', 'lap_times', 'pit_stops', 'driver_standings')
+CONSTRUCTOR_TABLES = ('results', 'qualifying', 'sprint_results', 'constructor_standings', 'constructor_results')
+
+# Wide text columns never needed for queries
+DROPPED_COLUMNS = ('url',)
+
+
+class KeyIndex:
+    """Rows of a table sorted by a dense integer key, with an offset table.
+
+    Rows for key ``k`` are ``frame.iloc[offsets[k]:offsets[k + 1]]``, and a
+    contiguous key range maps to one contiguous row range.
+    """
+
+    def __init__(self, frame: pd.DataFrame, keys: np.ndarray, num_keys: int,
+                 secondary: Optional[np.ndarray] = None):
+        """Sort the frame by key and build offsets.
+
+        Args:
+            frame: Table to index
+            keys: Dense non-negative key per row (same length as frame)
+            num_keys: Number of distinct key slots (max key + 1)
+            secondary: Optional key to order rows within the same primary key
+        """
+        if secondary is None:
+            order = np.argsort(keys, kind='stable')
+        else:
+            order = np.lexsort((secondary, keys))
+        self.frame = frame.take(order).reset_index(drop=True)
+        self.offsets = np.searchsorted(keys[order], np.arange(num_keys + 1), side='left')
+
+    def rows(self, start_key: int, stop_key: Optional[int] = None) -> pd.DataFrame:
+        """Get the rows for a key or a half-open key range.
+
+        Args:
+            start_key: First key
+            stop_key: Key after the last one (None = start_key + 1)
+
+        Returns:
+            Row slice of the sorted frame
+        """
+        if stop_key is None:
+            stop_key = start_key + 1
+        return self.frame.iloc[self.offsets[start_key]:self.offsets[stop_key]]
+
+
+class HistoricalRepository:
+    """Indexed access to historical races, seasons, drivers and constructors.
+
+    Indexes are built lazily per table on first use, under a lock so
+    concurrent callers build each one once. Returned frames are slices of
+    shared sorted tables and must be treated as read-only.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, tables: Sequence[str] = RACE_TABLES):
+        """Initialize the repository.
+
+        Args:
+            data_dir: Directory holding the Ergast CSV files
+            tables: Race-keyed tables to expose (missing ones are skipped)
+        """
+        self.data_dir = data_dir
+        self.tables = tuple(tables)
+        self._frames: Dict[str, Optional[pd.DataFrame]] = {}
+        self._race_indexes: Dict[str, KeyIndex] = {}
+        self._driver_indexes: Dict[str, KeyIndex] = {}
+        self._constructor_indexes: Dict[str, KeyIndex] = {}
+        self._lookups: Dict[tuple, pd.Series] = {}
+        # Re-entrant: index builders load their table through _load
+        self._lock = threading.RLock()
+
+        races = self._load('races')
+        self.races = races.sort_values(['year', 'round'], kind='stable').reset_index(drop=True)
+        race_ids = self.races['raceId'].to_numpy()
+        # Dense raceId -> calendar ordinal lookup (-1 = unknown id)
+        self._race_ordinal = np.full(int(race_ids.max()) + 1, -1, dtype=np.int64)
+        self._race_ordinal[race_ids] = np.arange(len(race_ids))
+        years = self.races['year'].to_numpy()
+        self._season_years = np.unique(years)
+        self._season_offsets = np.searchsorted(years, self._season_years, side='left')
+        self._season_ends = np.searchsorted(years, self._season_years, side='right')
+
+    def _load(self, table: str) -> Optional[pd.DataFrame]:
+        """Load a table from the columnar store once (None if it does not exist)."""
+        with self._lock:
+            if table not in self._frames:
+                try:
+                    frame = load_table(table, data_dir=self.data_dir)
+                    self._frames[table] = frame.drop(columns=[c for c in DROPPED_COLUMNS if c in frame])
+                except FileNotFoundError:
+                    logger.warning(f"Table {table} not found in {self.data_dir}, skipping")
+                    self._frames[table] = None
+            return self._frames[table]
+
+    def _ordinals(self, frame: pd.DataFrame) -> np.ndarray:
+        """Calendar ordinal of every row's race (-1 for races missing from races.csv)."""
+        race_ids = frame['raceId'].to_numpy()
+        known = race_ids < len(self._race_ordinal)
+        ordinals = np.full(len(race_ids), -1, dtype=np.int64)
+        ordinals[known] = self._race_ordinal[race_ids[known]]
+        return ordinals
+
+    def _race_index(self, table: str) -> Optional[KeyIndex]:
+        with self._lock:
+            if table not in self._race_indexes:
+                frame = self._load(table)
+                if frame is None:
+                    return None
+                ordinals = self._ordinals(frame)
+                # Shift by one so rows of unknown races (-1) sort into slot 0
+                self._race_indexes[table] = KeyIndex(frame, ordinals + 1, len(self.races) + 1)
+            return self._race_indexes[table]
+
+    def _entity_index(self, table: str, column: str, cache: Dict[str, KeyIndex]) -> Optional[KeyIndex]:
+        with self._lock:
+            if table not in cache:
+                frame = self._load(table)
+                if frame is None:
+                    return None
+                ids = frame[column].to_numpy().astype(np.int64)
+                cache[table] = KeyIndex(frame, ids, int(ids.max()) + 1 if len(ids) else 0,
+                                        secondary=self._ordinals(frame))
+            return cache[table]
+
+    def _available(self, tables: Sequence[str]) -> List[str]:
+        return [table for table in tables if table in self.tables]
+
+    def race_ordinal(self, race_id: int) -> int:
+        """Get the calendar position of a race.
+
+        Raises:
+            KeyError: If the race id is unknown
+        """
+        if not 0 <= race_id < len(self._race_ordinal) or self._race_ordinal[race_id] < 0:
+            raise KeyError(f"Unknown raceId {race_id}")
+        return int(self._race_ordinal[race_id])
+
+    def seasons(self) -> List[int]:
+        """List the seasons present in races.csv, oldest first."""
+        return [int(year) for year in self._season_years]
+
+    def get_race(self, race_id: int) -> Dict[str, pd.DataFrame]:
+        """Get every table's rows for one race.
+
+        Args:
+            race_id: Ergast raceId
+
+        Returns:
+            Dictionary with a one-row 'race' frame plus one frame per available
+            race table
+
+        Raises:
+            KeyError: If the race id is unknown
+        """
+        ordinal = self.race_ordinal(race_id)
+        result = {'race': self.races.iloc[ordinal:ordinal + 1]}
+        for table in self._available(RACE_TABLES):
+            index = self._race_index(table)
+            if index is not None:
+                result[table] = index.rows(ordinal + 1)
+        return result
+
+    def get_season(self, year: int) -> Dict[str, pd.DataFrame]:
+        """Get every table's rows for one season, in calendar order.
+
+        Args:
+            year: Championship year
+
+        Returns:
+            Dictionary with the season's 'races' plus one frame per available
+            race table
+
+        Raises:
+            KeyError: If the season is not in the dump
+        """
+        position = int(np.searchsorted(self._season_years, year))
+        if position >= len(self._season_years) or self._season_years[position] != year:
+            raise KeyError(f"Unknown season {year}")
+        start, stop = int(self._season_offsets[position]), int(self._season_ends[position])
+        result = {'races': self.races.iloc[start:stop]}
+        for table in self._available(RACE_TABLES):
+            index = self._race_index(table)
+            if index is not None:
+                result[table] = index.rows(start + 1, stop + 1)
+        return result
+
+    def get_driver_career(self, driver_id: int) -> Dict[str, pd.DataFrame]:
+        """Get a driver's rows from every driver table, in calendar order.
+
+        Args:
+            driver_id: Ergast driverId
+
+        Returns:
+            Dictionary of frames keyed by table name (empty frames if the
+            driver has no rows in a table)
+        """
+        return self._entity_rows(driver_id, DRIVER_TABLES, 'driverId', self._driver_indexes)
+
+    def get_constructor_history(self, constructor_id: int) -> Dict[str, pd.DataFrame]:
+        """Get a constructor's rows from every constructor table, in calendar order.
+
+        Args:
+            constructor_id: Ergast constructorId
+
+        Returns:
+            Dictionary of frames keyed by table name
+        """
+        return self._entity_rows(constructor_id, CONSTRUCTOR_TABLES, 'constructorId',
+                                 self._constructor_indexes)
+
+    def _entity_rows(self, entity_id: int, tables: Sequence[str], column: str,
+                     cache: Dict[str, KeyIndex]) -> Dict[str, pd.DataFrame]:
+        result = {}
+        for table in self._available(tables):
+            index = self._entity_index(table, column, cache)
+            if index is None:
+                continue
+            if 0 <= entity_id < len(index.offsets) - 1:
+                result[table] = index.rows(entity_id)
+            else:
+                result[table] = index.frame.iloc[0:0]
+        return result
+
+    def select_race_rows(self, table: str, race_id: int,
+                         columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Get one race's rows of a table, with the raceId predicate pushed down.
+
+        Uses the race index if the table has already been indexed; otherwise
+        only the raceId column is scanned and just the matching rows of the
+        requested columns are materialized, so the cost scales with one race
+        instead of building the whole-table index.
+
+        Args:
+            table: Race-keyed table name
+            race_id: Ergast raceId
+            columns: Columns to return (None = all)
+
+        Returns:
+            DataFrame with the race's rows
+
+        Raises:
+            KeyError: If the race id or a column is unknown
+            FileNotFoundError: If the table does not exist
+        """
+        ordinal = self.race_ordinal(race_id)
+        index = self._race_indexes.get(table)
+        if index is not None:
+            rows = index.rows(ordinal + 1)
+            return rows if columns is None else rows[list(columns)]
+        race_ids = load_table(table, ['raceId'], self.data_dir)['raceId'].to_numpy()
+        positions = np.flatnonzero(race_ids == race_id)
+        frame = load_table(table, columns, self.data_dir)
+        return frame.take(positions).reset_index(drop=True)
+
+    def lookup(self, table: str, key: str, column: str) -> pd.Series:
+        """Get a key -> value mapping for a small dimension table.
+
+        Mapping keys through this Series (``frame[key].map(...)``) replaces a
+        merge against the whole dimension table.
+
+        Args:
+            table: Dimension table name (e.g. 'status', 'circuits')
+            key: Key column
+            column: Value column
+
+        Returns:
+            Series indexed by key
+        """
+        cache_key = (table, key, column)
+        with self._lock:
+            if cache_key not in self._lookups:
+                frame = load_table(table, [key, column], self.data_dir)
+                self._lookups[cache_key] = pd.Series(frame[column].to_numpy(), index=frame[key].to_numpy(),
+                                                     name=column)
+            return self._lookups[cache_key]
+
+    def latest_race_id(self, table: str = 'results') -> Optional[int]:
+        """Get the most recent race (calendar order) that has rows in a table.
+
+        Args:
+            table: Race table that must contain data for the race
+
+        Returns:
+            raceId or None if the table is empty or missing
+        """
+        index = self._race_index(table)
+        if index is None:
+            return None
+        counts = np.diff(index.offsets)[1:]
+        with_rows = np.flatnonzero(counts)
+        if with_rows.size == 0:
+            return None
+        return int(self.races['raceId'].iloc[with_rows[-1]])
+
+
+@lru_cache(maxsize=None)
+def get_repository(data_dir: str = DATA_DIR) -> HistoricalRepository:
+    """Get a shared repository instance for a data directory."""
+    return HistoricalRepository(data_dir)
@@ -0,0 +1,104 @@
+"""
+HTTP session factory for the Ergast API
+
+Builds a pooled ``requests.Session`` with:
+- Keep-alive connection reuse across requests and worker threads
+- Bounded retries with exponential backoff and jitter
+- Server Retry-After hints honoured up to a cap
+- A per-host connection limit
+"""
+
+import random
+import logging
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Transient upstream statuses worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Number of per-host connection pools the adapter keeps (only the API host is used)
+MAX_HOST_POOLS = 4
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry policy that randomizes the exponential backoff.
+
+    Uses "equal jitter": each sleep is half the exponential delay plus a random
+    share of the other half, so clients that failed together do not retry in
+    lockstep. Waits requested by a Retry-After header are capped at
+    ``max_retry_after`` seconds so a long hint cannot block a fetch worker.
+    """
+
+    def __init__(self, *args, max_retry_after: float = 10.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw) -> 'JitteredRetry':
+        # Retry objects are cloned on every attempt; carry the cap over
+        retry = super().new(**kw)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def create_session(max_retries: int, backoff_factor: float = 0.5,
+                   max_connections_per_host: int = 4,
+                   user_agent: Optional[str] = None,
+                   max_retry_after: float = 10.0) -> requests.Session:
+    """Create a pooled session with retry and backoff policy.
+
+    Args:
+        max_retries: Maximum retries per request (connect, read and status errors)
+        backoff_factor: Base delay in seconds for the exponential backoff
+        max_connections_per_host: Size of the keep-alive pool for each host
+            (``pool_maxsize``); extra concurrent requests wait for a free
+            connection
+        user_agent: Optional User-Agent header for all requests
+        max_retry_after: Longest wait in seconds honoured from a Retry-After
+            header on 429/503 responses
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = JitteredRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        max_retry_after=max_retry_after
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MAX_HOST_POOLS,
+        pool_maxsize=max_connections_per_host,
+        pool_block=True,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    logger.debug(f"Created HTTP session (retries={max_retries}, pool={max_connections_per_host})")
+    return session
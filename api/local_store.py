@@ -0,0 +1,283 @@
+"""
+Columnar binary store for the local Ergast CSV dump (api/localData)
+
+Converts each CSV once into a directory of typed NumPy column files:
+- Integer/float columns as native arrays
+- Dates as datetime64[ns]
+- Lap times ("1:27.452") additionally as ``<column>_ms`` milliseconds
+- Remaining text as categoricals (int32 codes plus a categories array)
+
+Tables are loaded with memory-mapped reads of only the requested columns, so
+start-up no longer pays the CSV parse. Stores are rebuilt automatically when
+the source CSV changes; a rebuild is written to a temporary directory and
+renamed into place, so readers never see a half-written store.
+
+Usage:
+    python -m api.local_store          # convert every CSV in api/localData
+"""
+
+import json
+import os
+import re
+import shutil
+import logging
+import tempfile
+from typing import Optional, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'localData')
+STORE_DIRNAME = 'columnar'
+SCHEMA_FILE = '_schema.json'
+SCHEMA_VERSION = 1
+
+# Ergast dump marks missing values with \N
+NA_VALUES = ['\\N', '']
+
+# Columns holding lap times as text, per table
+LAP_TIME_COLUMNS = {
+    'lap_times': ['time'],
+    'qualifying': ['q1', 'q2', 'q3'],
+    'results': ['fastestLapTime'],
+    'sprint_results': ['fastestLapTime'],
+}
+
+LAP_TIME_PATTERN = re.compile(r'^(?:(\d+):)?(\d+(?:\.\d+)?)$')
+
+
+def _is_date_column(column: str) -> bool:
+    return column in ('date', 'dob') or column.endswith('_date')
+
+
+def lap_time_to_ms(value) -> float:
+    """Convert a lap time string such as '1:27.452' to milliseconds.
+
+    Args:
+        value: Lap time text (minutes optional) or a missing value
+
+    Returns:
+        Milliseconds as float, NaN if missing or unparseable
+    """
+    if not isinstance(value, str):
+        return np.nan
+    match = LAP_TIME_PATTERN.match(value.strip())
+    if not match:
+        return np.nan
+    minutes, seconds = match.groups()
+    return round((int(minutes or 0) * 60 + float(seconds)) * 1000)
+
+
+def _source_fingerprint(csv_path: str) -> Dict[str, int]:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _table_dir(table: str, data_dir: str) -> str:
+    return os.path.join(data_dir, STORE_DIRNAME, table)
+
+
+def _read_schema(table: str, data_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(_table_dir(table, data_dir), SCHEMA_FILE), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def is_store_current(table: str, data_dir: str = DATA_DIR) -> bool:
+    """Check whether a table's columnar store exists and matches its CSV.
+
+    Args:
+        table: Table name (CSV file name without extension)
+        data_dir: Directory holding the CSV files
+
+    Returns:
+        True if the store can be loaded without reconverting
+    """
+    schema = _read_schema(table, data_dir)
+    if schema is None or schema.get('version') != SCHEMA_VERSION:
+        return False
+    csv_path = os.path.join(data_dir, f"{table}.csv")
+    if not os.path.exists(csv_path):
+        return True  # store outlived its CSV; still usable
+    return schema.get('source') == _source_fingerprint(csv_path)
+
+
+def table_fingerprint(table: str, data_dir: str = DATA_DIR) -> Optional[Dict[str, int]]:
+    """Get the fingerprint (size and mtime) of a table's source data.
+
+    Args:
+        table: Table name (CSV file name without extension)
+        data_dir: Directory holding the CSV files
+
+    Returns:
+        Fingerprint of the CSV, or of the CSV the store was built from if
+        only the store exists, or None if the table does not exist
+    """
+    csv_path = os.path.join(data_dir, f"{table}.csv")
+    if os.path.exists(csv_path):
+        return _source_fingerprint(csv_path)
+    schema = _read_schema(table, data_dir)
+    return schema.get('source') if schema is not None else None
+
+
+def convert_table(table: str, data_dir: str = DATA_DIR) -> Dict:
+    """Convert one CSV into its columnar store.
+
+    Args:
+        table: Table name (CSV file name without extension)
+        data_dir: Directory holding the CSV files
+
+    Returns:
+        The written schema
+
+    Raises:
+        FileNotFoundError: If the CSV does not exist
+    """
+    csv_path = os.path.join(data_dir, f"{table}.csv")
+    df = pd.read_csv(csv_path, na_values=NA_VALUES, keep_default_na=False, low_memory=False)
+    table_dir = _table_dir(table, data_dir)
+    os.makedirs(os.path.dirname(table_dir), exist_ok=True)
+    out_dir = tempfile.mkdtemp(dir=os.path.dirname(table_dir), prefix=f".{table}-")
+    try:
+        schema = _write_store(table, df, csv_path, out_dir)
+        _replace_dir(out_dir, table_dir)
+    except BaseException:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    logger.info(f"Converted {table}.csv to columnar store ({len(df)} rows)")
+    return schema
+
+
+def _write_store(table: str, df: pd.DataFrame, csv_path: str, out_dir: str) -> Dict:
+    """Write the column files and schema of a table into an empty directory."""
+    columns = {}
+
+    def save(name: str, array: np.ndarray, kind: str):
+        np.save(os.path.join(out_dir, f"{name}.npy"), array, allow_pickle=False)
+        columns[name] = {'kind': kind}
+
+    for column in df.columns:
+        series = df[column]
+        if _is_date_column(column):
+            save(column, pd.to_datetime(series, errors='coerce').to_numpy('datetime64[ns]'), 'datetime')
+        elif pd.api.types.is_bool_dtype(series):
+            save(column, series.to_numpy(), 'bool')
+        elif pd.api.types.is_integer_dtype(series):
+            values = series.to_numpy()
+            if values.size == 0 or (values.min() >= np.iinfo(np.int32).min
+                                    and values.max() <= np.iinfo(np.int32).max):
+                values = values.astype(np.int32)
+            save(column, values, 'int')
+        elif pd.api.types.is_float_dtype(series):
+            save(column, series.to_numpy(np.float64), 'float')
+        else:
+            categorical = pd.Categorical(series.astype('string').astype(object))
+            save(column, categorical.codes.astype(np.int32), 'category')
+            categories = np.asarray(categorical.categories, dtype=str)
+            np.save(os.path.join(out_dir, f"{column}.categories.npy"), categories, allow_pickle=False)
+
+        if column in LAP_TIME_COLUMNS.get(table, ()):
+            save(f"{column}_ms", series.map(lap_time_to_ms).to_numpy(np.float64), 'float')
+
+    schema = {
+        'version': SCHEMA_VERSION,
+        'table': table,
+        'rows': len(df),
+        'order': list(columns),
+        'columns': columns,
+        'source': _source_fingerprint(csv_path),
+    }
+    # Schema last: a store without one is treated as missing
+    with open(os.path.join(out_dir, SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f)
+    return schema
+
+
+def _replace_dir(new_dir: str, target: str):
+    """Move a finished store into place, replacing the previous one."""
+    old_dir = f"{new_dir}.old"
+    try:
+        os.replace(target, old_dir)
+    except FileNotFoundError:
+        old_dir = None
+    try:
+        os.replace(new_dir, target)
+    except OSError:
+        if not os.path.exists(os.path.join(target, SCHEMA_FILE)):
+            if old_dir is not None:
+                os.replace(old_dir, target)
+            raise
+        # Another process installed its conversion first; keep that one
+        shutil.rmtree(new_dir, ignore_errors=True)
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def convert_all(data_dir: str = DATA_DIR, force: bool = False) -> List[str]:
+    """Convert every CSV in the data directory.
+
+    Args:
+        data_dir: Directory holding the CSV files
+        force: Reconvert even if the store is current
+
+    Returns:
+        Names of the tables that were converted
+    """
+    converted = []
+    for file in sorted(os.listdir(data_dir)):
+        if not file.endswith('.csv'):
+            continue
+        table = file[:-len('.csv')]
+        if force or not is_store_current(table, data_dir):
+            convert_table(table, data_dir)
+            converted.append(table)
+    return converted
+
+
+def load_table(table: str, columns: Optional[Sequence[str]] = None,
+               data_dir: str = DATA_DIR) -> pd.DataFrame:
+    """Load a table from the columnar store, converting it first if needed.
+
+    Only the requested columns are read, each through a memory map.
+
+    Args:
+        table: Table name (CSV file name without extension)
+        columns: Columns to load (None = all), including derived ``*_ms`` columns
+        data_dir: Directory holding the CSV files
+
+    Returns:
+        DataFrame with the requested columns in the requested order
+
+    Raises:
+        FileNotFoundError: If neither a store nor the CSV exists
+        KeyError: If a requested column does not exist
+    """
+    schema = _read_schema(table, data_dir) if is_store_current(table, data_dir) else None
+    if schema is None:
+        schema = convert_table(table, data_dir)
+
+    names = list(columns) if columns is not None else schema['order']
+    missing = [name for name in names if name not in schema['columns']]
+    if missing:
+        raise KeyError(f"Columns {missing} not in table {table}")
+
+    table_dir = _table_dir(table, data_dir)
+    data = {}
+    for name in names:
+        values = np.load(os.path.join(table_dir, f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+        if schema['columns'][name]['kind'] == 'category':
+            categories = np.load(os.path.join(table_dir, f"{name}.categories.npy"), allow_pickle=False)
+            data[name] = pd.Categorical.from_codes(values, categories.astype(object))
+        else:
+            data[name] = values
+    return pd.DataFrame(data, columns=names, copy=False)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    converted = convert_all()
+    print(f"Converted {len(converted)} table(s): {', '.join(converted) or 'none (all current)'}")
@@ -0,0 +1,108 @@
+"""
+In-memory cache tier for F1 Data
+
+Bounded LRU cache with a per-entry TTL that sits in front of the on-disk
+JSON cache, so repeated reads of the same key skip the filesystem and the
+JSON parse. Thread-safe.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+
+class MemoryCache:
+    """Thread-safe LRU cache with time-to-live expiry and hit/miss counters.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: Optional[float] = 300):
+        """Initialize the memory cache.
+
+        Args:
+            max_entries: Maximum number of keys kept before evicting the least
+                recently used one
+            ttl: Seconds an entry stays valid after being stored (None = no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, stamp, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Look up a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, stamp) or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stamp, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, stamp
+
+    def put(self, key: str, value: Any, stamp: float):
+        """Store a value, evicting the least recently used key if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            stamp: Modification time of the value's source (epoch seconds)
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, stamp, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def contains(self, key: str) -> bool:
+        """Check for a live entry without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or time.monotonic() < entry[2])
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop a single key or every entry.
+
+        Args:
+            key: Key to drop (None = clear everything)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size.
+
+        Returns:
+            Dictionary with hits, misses, evictions, size and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -3,11 +3,20 @@ Migration script to move existing cache files to new cache structure.
 
 This script migrates old cache files from api/ directory to api/cache/ directory
 and updates them to use the new cache key naming convention.
+
+It can also copy every cache entry from one storage backend to another:
+
+    python -m api.migrate_cache --from filesystem --to sqlite
+
+Afterwards set CACHE_STORAGE_SETTINGS['backend'] in api/config.py to the
+target backend.
 """
 
 import os
+import sys
 import json
 import shutil
+import argparse
 from pathlib import Path
 
 def migrate_cache_files():
@@ -63,5 +72,73 @@ def migrate_cache_files():
     print(f"\nMigration complete: {migrated_count} file(s) migrated")
     print(f"Cache files are now in: {cache_dir.absolute()}")
 
+def migrate_backend(source: str, target: str, cache_dir: str = 'api/cache',
+                    delete_source: bool = False) -> int:
+    """Copy every cache entry from one storage backend to another.
+    
+    Update times are preserved, so refresh scheduling is unaffected. The
+    metadata file is shared by all backends and is left untouched.
+    
+    Args:
+        source: Source backend name (e.g. 'filesystem')
+        target: Target backend name (e.g. 'sqlite')
+        cache_dir: Cache directory used by both backends
+        delete_source: Remove entries from the source after copying
+        
+    Returns:
+        Number of migrated entries
+    """
+    from api.cache_backends import create_backend
+    from api.cache_manager import CacheManager
+    
+    if source == target:
+        print("[ERROR] Source and target backends are the same")
+        return 0
+    
+    options = {'reserved_files': CacheManager.RESERVED_FILES}
+    source_backend = create_backend(source, cache_dir, **(options if source == 'filesystem' else {}))
+    target_backend = create_backend(target, cache_dir, **(options if target == 'filesystem' else {}))
+    
+    migrated_count = 0
+    try:
+        for cache_key in source_backend.keys():
+            try:
+                entry = source_backend.read(cache_key)
+                if entry is None:
+                    continue
+                data, updated_at = entry
+                target_backend.write(cache_key, data, updated_at=updated_at)
+                if delete_source:
+                    source_backend.delete(cache_key)
+                migrated_count += 1
+            except (ValueError, IOError) as e:
+                print(f"[ERROR] Failed to migrate {cache_key}: {e}")
+    finally:
+        source_backend.close()
+        target_backend.close()
+    
+    print(f"\nMigration complete: {migrated_count} entr{'y' if migrated_count == 1 else 'ies'} "
+          f"migrated from {source} to {target}")
+    return migrated_count
+
+def main():
+    """Run the legacy file migration or a backend-to-backend migration."""
+    parser = argparse.ArgumentParser(description="Migrate F1 Companion cache data")
+    parser.add_argument('--from', dest='source', help="Source cache backend (filesystem, sqlite)")
+    parser.add_argument('--to', dest='target', help="Target cache backend (filesystem, sqlite)")
+    parser.add_argument('--cache-dir', default='api/cache', help="Cache directory (default: api/cache)")
+    parser.add_argument('--delete-source', action='store_true',
+                        help="Remove entries from the source backend after copying")
+    args = parser.parse_args()
+    
+    if args.source or args.target:
+        if not (args.source and args.target):
+            parser.error("--from and --to must be used together")
+        migrate_backend(args.source, args.target, args.cache_dir, args.delete_source)
+    else:
+        migrate_cache_files()
+
 if __name__ == '__main__':
-    migrate_cache_files()
+    # Allow running as a plain script from the project root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
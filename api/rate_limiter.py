@@ -0,0 +1,194 @@
+"""
+Rate limiter for the Ergast API
+
+Sliding-window limiter over real call timestamps that enforces:
+- Global budgets (GLOBAL_API_LIMITS: calls per day and per hour)
+- Per-key daily budgets (CACHE_SETTINGS max_api_calls_per_day)
+
+Timestamps are persisted to a JSON file so budgets survive restarts, and
+every operation re-reads that file under an inter-process lock so several
+processes sharing a cache directory draw from the same budgets.
+"""
+
+import json
+import os
+import time
+import logging
+from typing import Optional, Dict, List
+
+from .file_utils import FileLock, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+HOUR = 3600
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would exceed a rate limit budget."""
+
+    def __init__(self, cache_key: str, retry_after: float):
+        super().__init__(f"Rate limit reached for {cache_key}, next call allowed in {retry_after:.0f}s")
+        self.cache_key = cache_key
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Thread- and process-safe sliding-window rate limiter with persisted state."""
+
+    def __init__(self, state_file: str, global_limits: Optional[Dict[str, int]] = None):
+        """Initialize the rate limiter.
+
+        Args:
+            state_file: JSON file used to persist call timestamps
+            global_limits: Dictionary with 'max_calls_per_day' and
+                'max_calls_per_hour' (missing or None = unlimited)
+        """
+        self.state_file = state_file
+        global_limits = global_limits or {}
+        # (window seconds, max calls) pairs applied to every call
+        self.global_windows = [
+            (window, limit) for window, limit in (
+                (DAY, global_limits.get('max_calls_per_day')),
+                (HOUR, global_limits.get('max_calls_per_hour'))
+            ) if limit is not None
+        ]
+        self._lock = FileLock(f"{state_file}.lock")
+        with self._lock:
+            self._load_state()
+
+    def _load_state(self):
+        """Load persisted call timestamps from file; caller must hold the lock."""
+        self.state = {'global': [], 'keys': {}}
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r') as f:
+                    self.state = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Error loading rate limit state: {e}. Starting fresh.")
+        self.state.setdefault('global', [])
+        self.state.setdefault('keys', {})
+        self._prune(time.time())
+
+    def _save_state(self):
+        """Persist call timestamps to file; caller must hold the lock."""
+        try:
+            # Written on every acquire and refund, so skip the fsync: the rename
+            # is still atomic, and a power loss only forgets the latest calls
+            atomic_write_json(self.state_file, self.state, fsync=False)
+        except IOError as e:
+            logger.error(f"Failed to save rate limit state: {e}")
+
+    def _prune(self, now: float):
+        """Drop timestamps older than the longest window (one day)."""
+        cutoff = now - DAY
+        self.state['global'] = [t for t in self.state['global'] if t > cutoff]
+        for key in list(self.state['keys']):
+            calls = [t for t in self.state['keys'][key] if t > cutoff]
+            if calls:
+                self.state['keys'][key] = calls
+            else:
+                del self.state['keys'][key]
+
+    @staticmethod
+    def _wait_time(calls: List[float], window: int, limit: int, now: float) -> float:
+        """Seconds until a window has room for one more call."""
+        recent = [t for t in calls if t > now - window]
+        if len(recent) < limit:
+            return 0.0
+        # The oldest call that must expire before the count drops below limit
+        oldest_blocking = sorted(recent)[len(recent) - limit]
+        return max(0.0, oldest_blocking + window - now)
+
+    def _time_until_allowed(self, cache_key: Optional[str], max_calls_per_day: Optional[int],
+                            now: float) -> float:
+        """Compute the wait time; caller must hold the lock."""
+        waits = [self._wait_time(self.state['global'], window, limit, now)
+                 for window, limit in self.global_windows]
+        if cache_key is not None and max_calls_per_day is not None:
+            waits.append(self._wait_time(self.state['keys'].get(cache_key, []), DAY, max_calls_per_day, now))
+        return max(waits, default=0.0)
+
+    def time_until_allowed(self, cache_key: Optional[str] = None,
+                           max_calls_per_day: Optional[int] = None) -> float:
+        """Get how long until the next call would be allowed.
+
+        Args:
+            cache_key: Key whose per-key budget should also be checked (None = global only)
+            max_calls_per_day: Per-key daily budget (None = unlimited)
+
+        Returns:
+            Seconds to wait, 0.0 if a call is allowed now
+        """
+        with self._lock:
+            self._load_state()
+            return self._time_until_allowed(cache_key, max_calls_per_day, time.time())
+
+    def try_acquire(self, cache_key: str, max_calls_per_day: Optional[int] = None) -> bool:
+        """Record a call if every budget allows it.
+
+        Args:
+            cache_key: Key the call is made for
+            max_calls_per_day: Per-key daily budget (None = only global budgets apply)
+
+        Returns:
+            True if the call was allowed and recorded
+        """
+        with self._lock:
+            self._load_state()
+            now = time.time()
+            if self._time_until_allowed(cache_key, max_calls_per_day, now) > 0:
+                return False
+            self.state['global'].append(now)
+            self.state['keys'].setdefault(cache_key, []).append(now)
+            self._save_state()
+            return True
+
+    def acquire(self, cache_key: str, max_calls_per_day: Optional[int] = None):
+        """Record a call or raise if any budget is exhausted.
+
+        Args:
+            cache_key: Key the call is made for
+            max_calls_per_day: Per-key daily budget (None = only global budgets apply)
+
+        Raises:
+            RateLimitExceeded: If the call is not allowed right now
+        """
+        if not self.try_acquire(cache_key, max_calls_per_day):
+            raise RateLimitExceeded(cache_key, self.time_until_allowed(cache_key, max_calls_per_day))
+
+    def refund(self, cache_key: str, include_global: bool = False):
+        """Give back the most recent per-key call (e.g. a 304 revalidation).
+
+        By default the global budgets keep the call, since upstream still
+        served it.
+
+        Args:
+            cache_key: Key the call was made for
+            include_global: Also give back the global call (the request was
+                never sent)
+        """
+        with self._lock:
+            self._load_state()
+            calls = self.state['keys'].get(cache_key)
+            if calls:
+                calls.pop()
+                if include_global and self.state['global']:
+                    self.state['global'].pop()
+                self._save_state()
+
+    def calls_in_window(self, cache_key: Optional[str] = None, window: int = DAY) -> int:
+        """Count calls made within the last window.
+
+        Args:
+            cache_key: Key to count (None = all calls)
+            window: Window length in seconds
+
+        Returns:
+            Number of calls in the window
+        """
+        with self._lock:
+            self._load_state()
+            calls = self.state['global'] if cache_key is None else self.state['keys'].get(cache_key, [])
+            cutoff = time.time() - window
+            return sum(1 for t in calls if t > cutoff)
@@ -0,0 +1,72 @@
+"""
+Single-flight request coalescing for F1 Data
+
+When several threads ask for the same key at the same time, only the first
+one (the leader) runs the fetch; the others block until it finishes and
+share its result or its exception.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` once per key for all concurrent callers.
+
+        Args:
+            key: Identifier shared by calls that may be coalesced
+            fn: Zero-argument callable performing the work
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            reused the result of another caller's in-flight call
+
+        Raises:
+            Exception: Whatever ``fn`` raised, for the leader and every follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a call for the key is currently running."""
+        with self._lock:
+            return key in self._calls
@@ -0,0 +1,171 @@
+"""
+Historical championship standings from the local Ergast dump
+
+Driver and constructor standings after every race (driver_standings.csv,
+constructor_standings.csv) are loaded once per kind into a single frame in
+calendar order, with season, round, name and nationality resolved through
+dimension lookups. Filtering by season, round and name and sorting by any
+column are vectorized operations on that frame, so the UI only has to
+render the rows it shows.
+
+Usage:
+    history = StandingsHistory()
+    view = history.query('drivers', year=2023, search='ham', sort_by='points', descending=True)
+    view.rows(0, 20)
+"""
+
+import logging
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .local_store import DATA_DIR, load_table
+from .historical_data import HistoricalRepository, get_repository
+
+logger = logging.getLogger(__name__)
+
+# kind -> (standings table, key column)
+STANDINGS_KINDS = {
+    'drivers': ('driver_standings', 'driverId'),
+    'constructors': ('constructor_standings', 'constructorId'),
+}
+STANDINGS_COLUMNS = ('season', 'round', 'position', 'name', 'nationality', 'points', 'wins')
+
+
+class StandingsView:
+    """Filtered and sorted standings rows, materialized on demand."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def rows(self, start: int, stop: int) -> List[tuple]:
+        """Get display values for rows ``start:stop`` in STANDINGS_COLUMNS order."""
+        window = self.frame.iloc[start:stop]
+        points = [f"{value:g}" for value in window['points'].to_numpy()]
+        columns = [window[column].to_numpy() for column in STANDINGS_COLUMNS]
+        columns[STANDINGS_COLUMNS.index('points')] = points
+        return list(zip(*columns))
+
+
+class StandingsHistory:
+    """Browse historical driver and constructor standings by season and round."""
+
+    def __init__(self, repository: Optional[HistoricalRepository] = None, data_dir: str = DATA_DIR):
+        """Initialize the history.
+
+        Args:
+            repository: Repository used for races and dimension lookups
+                (default: the shared repository for data_dir)
+            data_dir: Directory holding the Ergast CSV files
+        """
+        self.repository = repository or get_repository(data_dir)
+        self.data_dir = data_dir
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def seasons(self) -> List[int]:
+        """Get the seasons in the dump, most recent first."""
+        return sorted(self.repository.seasons(), reverse=True)
+
+    def rounds(self, year: int) -> pd.DataFrame:
+        """Get the round numbers and race names of a season, in calendar order."""
+        races = self.repository.races
+        return races.loc[races['year'].to_numpy() == year, ['round', 'name']].reset_index(drop=True)
+
+    def latest_round(self, kind: str, year: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Get the most recent (season, round) that has standings rows.
+
+        The dump's races table can list rounds that have not been run yet,
+        so this is not necessarily the last race of the calendar.
+
+        Args:
+            kind: 'drivers' or 'constructors'
+            year: Limit to one season (None = any season)
+
+        Returns:
+            (season, round) or None if there are no rows
+        """
+        frame = self.standings(kind)
+        seasons = frame['season'].to_numpy()
+        # Rows are in calendar order, so the last row of a season is its latest round
+        stop = len(seasons) if year is None else int(np.searchsorted(seasons, year, side='right'))
+        if stop == 0 or (year is not None and seasons[stop - 1] != year):
+            return None
+        return int(seasons[stop - 1]), int(frame['round'].to_numpy()[stop - 1])
+
+    def standings(self, kind: str) -> pd.DataFrame:
+        """Get every standings row of a kind in calendar order, loading it once.
+
+        Args:
+            kind: 'drivers' or 'constructors'
+
+        Returns:
+            DataFrame with season, round, position, name, nationality,
+            points, wins and the entity key, sorted by season, round and position
+
+        Raises:
+            KeyError: If the kind is unknown
+        """
+        if kind not in self._frames:
+            table, key = STANDINGS_KINDS[kind]
+            frame = load_table(table, ['raceId', key, 'points', 'position', 'wins'], self.data_dir)
+            repo = self.repository
+            race_ids = frame['raceId']
+            if kind == 'drivers':
+                names = (frame[key].map(repo.lookup('drivers', key, 'forename')) + ' ' +
+                         frame[key].map(repo.lookup('drivers', key, 'surname')))
+            else:
+                names = frame[key].map(repo.lookup('constructors', key, 'name'))
+            frame = pd.DataFrame({
+                'season': race_ids.map(repo.lookup('races', 'raceId', 'year')).fillna(0).astype(np.int64),
+                'round': race_ids.map(repo.lookup('races', 'raceId', 'round')).fillna(0).astype(np.int64),
+                'position': frame['position'].to_numpy(),
+                'name': names.fillna('').astype(object).to_numpy(),
+                'nationality': frame[key].map(
+                    repo.lookup(kind, key, 'nationality')).fillna('').astype(object).to_numpy(),
+                'points': frame['points'].to_numpy(dtype=np.float64),
+                'wins': frame['wins'].to_numpy(),
+                key: frame[key].to_numpy(),
+            })
+            order = np.lexsort((frame['position'].to_numpy(), frame['round'].to_numpy(),
+                                frame['season'].to_numpy()))
+            frame = frame.iloc[order].reset_index(drop=True)
+            # Lowercased names for case-insensitive search
+            frame['_search'] = frame['name'].str.lower()
+            self._frames[kind] = frame
+        return self._frames[kind]
+
+    def query(self, kind: str, year: Optional[int] = None, round: Optional[int] = None,
+              search: str = '', sort_by: str = 'position', descending: bool = False) -> StandingsView:
+        """Filter and sort standings.
+
+        Args:
+            kind: 'drivers' or 'constructors'
+            year: Season to show (None = all seasons)
+            round: Round of the season (None = every round)
+            search: Case-insensitive substring of the driver or constructor name
+            sort_by: Column of STANDINGS_COLUMNS to sort by; ties keep calendar order
+            descending: Sort in descending order
+
+        Returns:
+            StandingsView over the matching rows
+
+        Raises:
+            KeyError: If the kind or sort column is unknown
+        """
+        if sort_by not in STANDINGS_COLUMNS:
+            raise KeyError(f"Unknown sort column {sort_by}")
+        frame = self.standings(kind)
+        mask = np.ones(len(frame), dtype=bool)
+        if year is not None:
+            mask &= frame['season'].to_numpy() == year
+        if round is not None:
+            mask &= frame['round'].to_numpy() == round
+        if search:
+            mask &= frame['_search'].str.contains(search.lower(), regex=False).to_numpy(dtype=bool)
+        selected = frame.loc[mask].reset_index(drop=True)
+        order = selected[sort_by].sort_values(ascending=not descending, kind='stable').index
+        return StandingsView(selected.iloc[order].reset_index(drop=True))
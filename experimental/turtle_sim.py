@@ -1,76 +1,41 @@
 import tkinter as tk
+import sys
+import os
 from PIL import Image, ImageTk
-import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.historical_data import get_repository
 
 # Constants
 CANVAS_WIDTH = 800
 CANVAS_HEIGHT = 500
 
-# Cargar datasets
-drivers_df = pd.read_csv('./api/localData/drivers.csv')
-results_df = pd.read_csv('./api/localData/results.csv')
-constructors_df = pd.read_csv('./api/localData/constructors.csv')
-races_df = pd.read_csv('./api/localData/races.csv')
-circuits_df = pd.read_csv('./api/localData/circuits.csv')
-qualifying_df = pd.read_csv('./api/localData/qualifying.csv')
-lap_times_df = pd.read_csv('./api/localData/lap_times.csv')
-
-print(drivers_df.head())
-print(results_df.head())
-print(constructors_df.head())
-print(races_df.head())
-print(circuits_df.head())
-print(qualifying_df.head())
-print(lap_times_df.head())
-
-# Check unique identifiers in each DataFrame to ensure they are correct for merging
-print(drivers_df['driverId'].unique())
-print(results_df['driverId'].unique())
-print(constructors_df['constructorId'].unique())
-print(races_df['raceId'].unique())
-print(circuits_df['circuitId'].unique())
-print(qualifying_df[['raceId', 'driverId', 'constructorId']].drop_duplicates())
-print(lap_times_df[['raceId', 'driverId']].drop_duplicates())
-
-
-
-
-
-
-# Fusionando datos básicos de carrera
-race_details_df = pd.merge(results_df, drivers_df, on='driverId', how='left')
-race_details_df = pd.merge(race_details_df, constructors_df[['constructorId', 'constructorRef', 'name']], on='constructorId', how='left', suffixes=('', '_constructor'))
-race_details_df = pd.merge(race_details_df, races_df, on='raceId', how='left')
-race_details_df = pd.merge(race_details_df, circuits_df, on='circuitId', how='left')
-race_details_df = pd.merge(race_details_df, qualifying_df, on=['raceId', 'driverId', 'constructorId'], how='left')
-
-# After each merge, add a print statement to check the DataFrame's size
-print("After merging with drivers_df:", race_details_df.shape)
-# Continue for each merge step
-
-
-# Obtener la última carrera basado en la fecha o un identificador máximo
-last_race_id = races_df['raceId'].max()
-
-print(races_df[races_df['raceId'] >= races_df['raceId'].max() - 5])  # Checking last few races to verify data integrity
-
-
-# Filtrar los detalles de la última carrera
-last_race_details = race_details_df[race_details_df['raceId'] == last_race_id]
-
+# Cargar datos de la última carrera: cada tabla se filtra por raceId antes de unir
+repo = get_repository()
+last_race_id = repo.latest_race_id('results')
+race = repo.races.iloc[repo.race_ordinal(last_race_id)]
 print("Last race ID:", last_race_id)
-print("Filtered last race details:", last_race_details.shape)
-
-print("Count of Races:", races_df.shape[0])
-print("Count of Results for Last Race:", results_df[results_df['raceId'] == last_race_id].shape[0])
-
-# Example checks
-print("Unique Race IDs in Results:", results_df['raceId'].unique())
-print("Last Race Details in Results:", results_df[results_df['raceId'] == last_race_id])
-
 
-# Fusionar con los tiempos por vuelta
-final_race_data = pd.merge(last_race_details, lap_times_df, on=['raceId', 'driverId'], how='left')
+last_race_details = repo.select_race_rows(
+    'results', last_race_id, ['raceId', 'driverId', 'constructorId', 'grid', 'positionOrder', 'points'])
+print("Count of Results for Last Race:", last_race_details.shape[0])
+
+# Tablas de dimensión pequeñas: mapear por clave en lugar de unir
+for column in ('code', 'surname'):
+    last_race_details[column] = last_race_details['driverId'].map(repo.lookup('drivers', 'driverId', column))
+for column in ('constructorRef', 'name'):
+    last_race_details[column] = last_race_details['constructorId'].map(
+        repo.lookup('constructors', 'constructorId', column))
+for column in ('circuitRef', 'location', 'country', 'lat', 'lng'):
+    last_race_details[column] = repo.lookup('circuits', 'circuitId', column)[race['circuitId']]
+
+# Fusionar con los tiempos por vuelta (solo de esta carrera)
+try:
+    lap_times = repo.select_race_rows('lap_times', last_race_id, ['driverId', 'lap', 'time_ms'])
+except FileNotFoundError:
+    # lap_times.csv no se incluye en api/localData
+    sys.exit("No lap times data found (api/localData/lap_times.csv).")
+final_race_data = last_race_details.merge(lap_times.rename(columns={'time_ms': 'time'}), on='driverId', how='left')
 
 # Seleccionar columnas relevantes incluyendo los tiempos por vuelta
 columns_to_select = ['raceId', 'driverId', 'code', 'surname', 'constructorId', 'constructorRef', 'name', 'grid', 'positionOrder', 'points', 'circuitRef', 'location', 'country', 'lat', 'lng', 'lap', 'time']
@@ -2,32 +2,62 @@
 
 A desktop application for viewing Formula 1 racing information including
 driver standings, constructor standings, and upcoming race details.
+
+Run with ``--profile-startup`` to print the startup timing (imports and
+time to first paint) and exit once the window has been painted.
 """
 
-import tkinter as tk
-from ui.dashboard import Dashboard
-import sv_ttk
-from api.api_handler import ErgastAPI
+import time
+_PROCESS_START = time.perf_counter()
+
+import sys
+import logging
+
+from utils.startup_timer import StartupTimer
 
+timer = StartupTimer(_PROCESS_START)
+with timer.phase('import tkinter'):
+    import tkinter as tk
+with timer.phase('import ui'):
+    from ui.dashboard import Dashboard
+with timer.phase('import sv_ttk'):
+    import sv_ttk
+with timer.phase('import api'):
+    from api.api_handler import ErgastAPI
 
-def main():
+
+def main(profile_startup=False):
     """Initialize and launch the F1 Race Companion application.
     
     Creates the main window, initializes the API handler, and displays
     the dashboard interface.
+
+    Args:
+        profile_startup: Print the startup timing and exit after the first paint
     """
-    root = tk.Tk()
-    root.title('F1 Race Companion')
-    root.geometry("1024x768")
+    with timer.phase('create window'):
+        root = tk.Tk()
+        root.title('F1 Race Companion')
+        root.geometry("1024x768")
 
     # Create an instance of the API handler
-    api_handler = ErgastAPI()
+    with timer.phase('create api handler'):
+        api_handler = ErgastAPI()
     
     # Launch and show the dashboard
-    dashboard_frame = Dashboard(root, api_handler)
-    dashboard_frame.pack(fill=tk.BOTH, expand=True)
+    with timer.phase('build dashboard'):
+        dashboard_frame = Dashboard(root, api_handler)
+        dashboard_frame.pack(fill=tk.BOTH, expand=True)
+
+    def painted(timer):
+        if profile_startup:
+            print(timer.report())
+            root.after(0, root.destroy)
+        else:
+            logging.getLogger(__name__).info(timer.report())
 
+    timer.watch_first_paint(root, painted)
     root.mainloop()
 
 if __name__ == '__main__':
-    main()
+    main(profile_startup='--profile-startup' in sys.argv[1:])
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.api_handler import ErgastAPI
+from api.config import CACHE_SETTINGS
+from api.fetch_engine import FetchEngine, TaskCancelled, check_cancelled
+
+ENDPOINTS = ('next_race', 'last_race', 'driver_standings', 'constructor_standings')
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api')
+
+
+def load_sample(name):
+    with open(os.path.join(API_DIR, name)) as f:
+        return json.load(f)
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def api(tmp_path):
+    # Nothing listens on this port, so every request is refused
+    handler = ErgastAPI(cache_dir=str(tmp_path), base_url=f"http://127.0.0.1:{unused_port()}",
+                        stale_while_revalidate=False)
+    yield handler
+    handler.close()
+
+
+def test_refresh_reports_failures_when_server_is_down(api):
+    results = api.refresh_all_data()
+
+    assert set(results) == set(ENDPOINTS)
+    for name, result in results.items():
+        assert result['ok'] is False, name
+        assert result['error'], name
+
+
+def test_failed_refresh_keeps_cached_data(api):
+    api.cache_manager.save_cache('driver_standings', load_sample('current_drivers_standings.json'))
+
+    results = api.refresh_all_data()
+
+    assert results['driver_standings']['ok'] is False
+    # Regular reads still fall back to the cache
+    assert api.get_driver_standings()
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers every request after a one second delay."""
+    DELAY = 1.0
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        time.sleep(self.DELAY)
+        if self.path.endswith('driverStandings.json'):
+            data = load_sample('current_drivers_standings.json')
+        elif self.path.endswith('constructorStandings.json'):
+            data = load_sample('current_constructor_standings.json')
+        else:
+            data = {'MRData': {'RaceTable': {'Races': []}}}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_api(tmp_path):
+    SlowHandler.paths = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    handler = ErgastAPI(cache_dir=str(tmp_path), base_url=f"http://127.0.0.1:{httpd.server_port}",
+                        stale_while_revalidate=False)
+    yield handler
+    handler.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_refresh_takes_as_long_as_the_slowest_endpoint(slow_api):
+    started = time.perf_counter()
+
+    results = slow_api.refresh_all_data()
+
+    elapsed = time.perf_counter() - started
+    assert len(SlowHandler.paths) == len(ENDPOINTS)
+    assert results['driver_standings']['ok'] and results['constructor_standings']['ok']
+    # Sequential requests would take 4 s
+    assert elapsed < 2.5
+
+
+def test_cancelled_refresh_sends_no_requests(api):
+    cancel = threading.Event()
+    cancel.set()
+
+    results = api.refresh_all_data(cancel=cancel)
+
+    assert all(result['error'] == 'cancelled' for result in results.values())
+    assert api.rate_limiter.calls_in_window() == 0
+
+
+def test_running_task_stops_at_check_cancelled():
+    engine = FetchEngine(max_workers=1)
+    cancel = threading.Event()
+
+    def task():
+        cancel.set()
+        check_cancelled()
+        return 'fetched'
+
+    results = engine.run_all({'task': task}, cancel=cancel)
+    engine.shutdown()
+
+    assert results['task']['ok'] is False
+    assert results['task']['error'] == 'cancelled'
+
+
+def test_refresh_joining_a_cancelled_fetch_fetches_again(api, monkeypatch):
+    release = threading.Event()
+
+    def cancelled_fetch():
+        release.wait(5)
+        raise TaskCancelled()
+
+    # A cancelled refresh is still fetching next_race when a new one starts
+    leader = threading.Thread(target=lambda: pytest.raises(
+        TaskCancelled, api._in_flight.do, 'next_race', cancelled_fetch))
+    leader.start()
+    while not api._in_flight.in_flight('next_race'):
+        pass
+    monkeypatch.setattr(api, '_refresh', lambda *args: {'fresh': True})
+    threading.Timer(0.2, release.set).start()
+
+    data = api._get_data('next_race', CACHE_SETTINGS['next_race'], 'current/next.json',
+                         'next race data', force_refresh=True)
+    leader.join()
+
+    assert data == {'fresh': True}
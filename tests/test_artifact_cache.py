@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from api.artifact_cache import ArtifactCache, save_frame, load_frame
+
+
+def race_frame():
+    return pd.DataFrame({
+        'driverRef': ['hamilton', None, 'verstappen'],
+        'position': np.array([1, 2, 3], dtype=np.int32),
+        'points': [25.0, np.nan, 15.0],
+        'date': pd.to_datetime(['2024-03-02', None, '2024-03-02']),
+        'time': pd.to_timedelta([90.5, 91.25, None], unit='s'),
+    })
+
+
+def test_saved_frame_loads_back_unchanged(tmp_path):
+    frame = race_frame()
+    path = str(tmp_path / 'race.npz')
+
+    save_frame(path, frame, {'key': 'race'})
+
+    pd.testing.assert_frame_equal(load_frame(path), frame)
+
+
+def test_artifact_is_rebuilt_when_a_source_changes(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'results.csv').write_text('raceId,points\n1,25\n')
+    cache = ArtifactCache('race_details', ['results'], directory=str(tmp_path / 'artifacts'),
+                          data_dir=str(data_dir))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return race_frame()
+
+    cold = cache.get_or_build(1, build)
+    warm = cache.get_or_build(1, build)
+    assert len(builds) == 1
+    pd.testing.assert_frame_equal(warm, cold)
+
+    (data_dir / 'results.csv').write_text('raceId,points\n1,25\n2,18\n')
+    cache.get_or_build(1, build)
+    assert len(builds) == 2
+    # The stale artifact was replaced, not kept next to the new one
+    assert len(list((tmp_path / 'artifacts' / 'race_details').glob('1-*.npz'))) == 1
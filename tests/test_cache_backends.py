@@ -0,0 +1,70 @@
+import pytest
+
+from api.cache_backends import create_backend
+from api.cache_manager import CacheManager
+from api.migrate_cache import migrate_backend
+
+
+@pytest.fixture(params=['filesystem', 'sqlite'])
+def backend(request, tmp_path):
+    backend = create_backend(request.param, str(tmp_path))
+    yield backend
+    backend.close()
+
+
+def test_backend_stores_entries_by_key(backend):
+    backend.write('a', {'value': 1}, updated_at=100.0)
+    backend.write('b', {'value': 2}, updated_at=200.0)
+    backend.write('a', {'value': 3}, updated_at=300.0)
+
+    assert backend.read('a') == ({'value': 3}, 300.0)
+    assert backend.read('missing') is None
+    assert backend.keys() == ['b', 'a']
+    assert backend.keys(updated_since=250.0) == ['a']
+    assert backend.touch('b') > 300.0
+    assert backend.touch('missing') is None
+
+
+def test_backend_deletes_and_clears(backend):
+    backend.write('a', {'value': 1})
+    backend.write('b', {'value': 2})
+
+    assert backend.delete('a') and not backend.delete('a')
+    assert not backend.exists('a') and backend.exists('b')
+    backend.clear()
+    assert backend.keys() == []
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_backend('lmdb', str(tmp_path))
+
+
+def test_sqlite_cache_survives_a_restart(tmp_path):
+    manager = CacheManager(str(tmp_path), backend='sqlite')
+    manager.save_cache('driver_standings', {'round': 5})
+    manager.close()
+
+    manager = CacheManager(str(tmp_path), backend='sqlite')
+    assert manager.load_cache('driver_standings') == {'round': 5}
+    assert manager.get_cached_keys() == ['driver_standings']
+    manager.close()
+
+
+def test_migration_copies_entries_with_their_update_times(tmp_path):
+    manager = CacheManager(str(tmp_path), backend='filesystem')
+    manager.save_cache('next_race', {'round': 6})
+    manager.save_cache('last_race', {'round': 5})
+    manager.close()
+    filesystem = create_backend('filesystem', str(tmp_path), reserved_files=CacheManager.RESERVED_FILES)
+    expected = {key: filesystem.read(key) for key in filesystem.keys()}
+    filesystem.close()
+
+    # The metadata file is not a cache entry and is not migrated
+    assert migrate_backend('filesystem', 'sqlite', str(tmp_path), delete_source=True) == 2
+
+    sqlite = create_backend('sqlite', str(tmp_path))
+    assert {key: sqlite.read(key) for key in sqlite.keys()} == expected
+    sqlite.close()
+    assert (tmp_path / 'cache_metadata.json').exists()
+    assert not (tmp_path / 'next_race.json').exists()
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+import api.cache_manager as cache_manager
+from api.cache_manager import CacheManager
+
+
+@pytest.fixture
+def metadata_writes(monkeypatch):
+    writes = []
+    atomic_write_json = cache_manager.atomic_write_json
+
+    def counting_write(path, *args, **kwargs):
+        writes.append(path)
+        return atomic_write_json(path, *args, **kwargs)
+
+    monkeypatch.setattr(cache_manager, 'atomic_write_json', counting_write)
+    return writes
+
+
+def read_metadata(manager):
+    with open(manager.metadata_file) as f:
+        return json.load(f)
+
+
+def test_batch_writes_metadata_once(tmp_path, metadata_writes):
+    manager = CacheManager(str(tmp_path), backend='filesystem')
+
+    with manager.batch():
+        with manager.batch():
+            manager.save_cache('a', {'value': 1})
+        manager.save_cache('b', {'value': 2})
+        manager.save_cache('c', {'value': 3})
+        assert metadata_writes == []
+
+    assert metadata_writes == [manager.metadata_file]
+    assert set(read_metadata(manager)['last_updates']) == {'a', 'b', 'c'}
+    manager.close()
+
+
+def test_batch_keeps_updates_made_by_another_process(tmp_path, metadata_writes):
+    manager = CacheManager(str(tmp_path), backend='filesystem')
+    manager.save_cache('a', {'value': 1})
+    other = CacheManager(str(tmp_path), backend='filesystem')
+
+    with manager.batch():
+        manager.save_cache('a', {'value': 2})
+        other.save_cache('b', {'value': 3})
+
+    metadata = read_metadata(manager)
+    assert set(metadata['last_updates']) == {'a', 'b'}
+    # Increments are replayed on top of the file, not overwritten
+    assert metadata['api_calls'] == {'a': 2, 'b': 1}
+    manager.close()
+    other.close()
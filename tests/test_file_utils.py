@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+
+import pytest
+
+from api.file_utils import FileLock, atomic_write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'data.json')
+
+    atomic_write_json(path, {'a': 1})
+    atomic_write_json(path, {'a': 2}, compact=False, fsync=False)
+
+    with open(path) as f:
+        assert json.load(f) == {'a': 2}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'data.json')
+    atomic_write_json(path, {'a': 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {'a': object()})
+
+    with open(path) as f:
+        assert json.load(f) == {'a': 1}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_lock_is_reentrant_and_excludes_other_threads(tmp_path):
+    lock = FileLock(str(tmp_path / '.lock'))
+    acquired = threading.Event()
+
+    def other():
+        with lock:
+            acquired.set()
+
+    with lock:
+        with lock:
+            thread = threading.Thread(target=other)
+            thread.start()
+            assert not acquired.wait(0.2)
+        assert not acquired.wait(0.1)
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / '.lock')
+    script = ('import sys; from api.file_utils import FileLock\n'
+              'with FileLock(sys.argv[1]): print("acquired")')
+
+    with FileLock(path):
+        process = subprocess.Popen([sys.executable, '-c', script, path], cwd=ROOT,
+                                   stdout=subprocess.PIPE, text=True)
+        time.sleep(0.5)
+        assert process.poll() is None
+    output, _ = process.communicate(timeout=10)
+
+    assert process.returncode == 0
+    assert output.strip() == 'acquired'
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pytest
+
+import api.historical_data as historical_data
+from api.historical_data import HistoricalRepository
+
+# raceIds deliberately out of calendar order
+RACES = 'raceId,year,round,name,url\n3,2023,1,Bahrain,x\n1,2022,2,Jeddah,x\n2,2022,1,Bahrain,x\n'
+RESULTS = ('resultId,raceId,driverId,constructorId,position,points\n'
+           '1,1,1,1,1,25\n2,1,2,2,2,18\n3,2,2,2,1,25\n4,2,1,1,2,18\n5,3,1,1,1,25\n')
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / 'races.csv').write_text(RACES)
+    (tmp_path / 'results.csv').write_text(RESULTS)
+    return str(tmp_path)
+
+
+def test_races_are_indexed_in_calendar_order(data_dir):
+    repo = HistoricalRepository(data_dir, tables=('results',))
+
+    assert list(repo.races['raceId']) == [2, 1, 3]
+    assert repo.race_ordinal(1) == 1
+    assert list(repo.get_race(1)['results']['resultId']) == [1, 2]
+    season = repo.get_season(2022)
+    assert list(season['races']['raceId']) == [2, 1]
+    assert list(season['results']['resultId']) == [3, 4, 1, 2]
+    assert repo.latest_race_id() == 3
+    with pytest.raises(KeyError):
+        repo.get_season(2024)
+
+
+def test_driver_career_is_in_calendar_order(data_dir):
+    repo = HistoricalRepository(data_dir, tables=('results',))
+
+    career = repo.get_driver_career(1)['results']
+
+    assert list(career['raceId']) == [2, 1, 3]
+    assert repo.get_driver_career(99)['results'].empty
+
+
+def test_select_race_rows_matches_the_index(data_dir):
+    repo = HistoricalRepository(data_dir, tables=('results',))
+
+    pushed_down = repo.select_race_rows('results', 1, ['driverId', 'points'])
+    repo.get_race(1)
+    indexed = repo.select_race_rows('results', 1, ['driverId', 'points'])
+
+    np.testing.assert_array_equal(pushed_down['driverId'], [1, 2])
+    np.testing.assert_array_equal(indexed.to_numpy(), pushed_down.to_numpy())
+
+
+def test_concurrent_lookups_load_each_table_once(data_dir, monkeypatch):
+    repo = HistoricalRepository(data_dir, tables=('results',))
+    loads = []
+    load_table = historical_data.load_table
+
+    def counting_load(table, *args, **kwargs):
+        loads.append(table)
+        return load_table(table, *args, **kwargs)
+
+    monkeypatch.setattr(historical_data, 'load_table', counting_load)
+    threads = [threading.Thread(target=repo.get_race, args=(1,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['results']
@@ -0,0 +1,53 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from api.http_session import create_session
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    """Answers the first request with 429 and an hour-long Retry-After."""
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        if type(self).requests_seen == 1:
+            self.send_response(429)
+            self.send_header('Retry-After', '3600')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    RateLimitedHandler.requests_seen = 0
+    httpd = HTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_retry_after_wait_is_capped(server):
+    session = create_session(max_retries=2, backoff_factor=0, max_retry_after=0.2)
+    started = time.perf_counter()
+
+    response = session.get(f"{server}/data.json", timeout=5)
+
+    assert response.status_code == 200
+    assert RateLimitedHandler.requests_seen == 2
+    assert time.perf_counter() - started < 2
+    session.close()
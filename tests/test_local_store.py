@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from api.local_store import convert_table, is_store_current, load_table
+
+LAP_TIMES = 'raceId,driverId,lap,position,time,milliseconds\n1,1,1,1,1:30.500,90500\n1,2,1,2,\\N,\\N\n'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / 'lap_times.csv').write_text(LAP_TIMES)
+    return str(tmp_path)
+
+
+def test_store_loads_back_the_csv(data_dir):
+    frame = load_table('lap_times', data_dir=data_dir)
+
+    assert is_store_current('lap_times', data_dir)
+    assert list(frame.columns) == ['raceId', 'driverId', 'lap', 'position', 'time', 'time_ms', 'milliseconds']
+    assert frame['lap'].dtype == np.int32
+    assert list(frame['time'].astype(object)) == ['1:30.500', np.nan]
+    np.testing.assert_array_equal(frame['time_ms'], [90500, np.nan])
+    np.testing.assert_array_equal(frame['milliseconds'], frame['time_ms'])
+
+
+def test_store_is_rebuilt_when_the_csv_changes(data_dir):
+    load_table('lap_times', data_dir=data_dir)
+    with open(os.path.join(data_dir, 'lap_times.csv'), 'a') as f:
+        f.write('1,1,2,1,1:29.000,89000\n')
+
+    assert not is_store_current('lap_times', data_dir)
+    frame = load_table('lap_times', ['lap', 'time_ms'], data_dir=data_dir)
+
+    assert is_store_current('lap_times', data_dir)
+    np.testing.assert_array_equal(frame['lap'], [1, 1, 2])
+    np.testing.assert_array_equal(frame['time_ms'], [90500, np.nan, 89000])
+
+
+def test_conversion_leaves_no_temporary_directories(data_dir):
+    convert_table('lap_times', data_dir)
+    convert_table('lap_times', data_dir)
+
+    assert os.listdir(os.path.join(data_dir, 'columnar')) == ['lap_times']
+
+
+def test_failed_conversion_keeps_the_previous_store(data_dir, monkeypatch):
+    schema = convert_table('lap_times', data_dir)
+    with open(os.path.join(data_dir, 'lap_times.csv'), 'a') as f:
+        f.write('1,1,2,1,1:29.000,89000\n')
+    saved = []
+
+    def failing_save(*args, **kwargs):
+        # Fail halfway through writing the columns
+        saved.append(args[0])
+        if len(saved) == 3:
+            raise OSError('disk full')
+        return save(*args, **kwargs)
+
+    save = np.save
+    monkeypatch.setattr(np, 'save', failing_save)
+    with pytest.raises(OSError):
+        convert_table('lap_times', data_dir)
+    monkeypatch.undo()
+
+    store = os.path.join(data_dir, 'columnar', 'lap_times')
+    assert os.listdir(os.path.dirname(store)) == ['lap_times']
+    # No column of the old store was overwritten with the new rows
+    for column in schema['columns']:
+        assert len(np.load(os.path.join(store, f"{column}.npy"))) == schema['rows'] == 2
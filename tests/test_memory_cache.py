@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+import api.memory_cache as memory_cache
+from api.cache_manager import CacheManager
+from api.memory_cache import MemoryCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = MemoryCache(max_entries=2, ttl=None)
+    cache.put('a', 1, 0)
+    cache.put('b', 2, 0)
+    cache.get('a')
+
+    cache.put('c', 3, 0)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == (1, 0)
+    assert cache.get('c') == (3, 0)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = MemoryCache(ttl=10)
+    cache.put('a', 1, 0)
+
+    clock[0] += 9
+    assert cache.contains('a')
+    assert cache.get('a') == (1, 0)
+    clock[0] += 1
+    assert not cache.contains('a')
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_invalidate_drops_one_key_or_everything():
+    cache = MemoryCache()
+    for key in 'abc':
+        cache.put(key, key, 0)
+
+    cache.invalidate('a')
+    assert cache.get('a') is None and cache.get('b') == ('b', 0)
+    cache.invalidate()
+    assert cache.stats()['size'] == 0
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_cache_manager_reads_repeat_keys_from_memory(tmp_path):
+    manager = CacheManager(str(tmp_path), backend='filesystem')
+    manager.save_cache('standings', {'round': 1})
+
+    assert manager.load_cache('standings') == {'round': 1}
+    assert manager.get_memory_stats()['hits'] == 1
+
+    manager.clear_cache('standings')
+    assert manager.load_cache('standings') is None
+    manager.close()
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.race_replay import RaceReplayData, ReplayEngine
+
+
+def lap_times():
+    # 'ham' laps in 60 s, 'ver' in 62 s and retires after lap 2, 'bot' has no laps
+    return pd.DataFrame({
+        'driverRef': ['ham'] * 3 + ['ver'] * 2 + ['bot'],
+        'constructorRef': ['mercedes'] * 3 + ['red_bull'] * 2 + ['alfa'],
+        'code': ['HAM'] * 3 + ['VER'] * 2 + ['BOT'],
+        'lap': [1, 2, 3, 2, 1, np.nan],
+        'position': [1, 1, 1, 2, 2, np.nan],
+        'time': pd.to_timedelta([60, 60, 60, 62, 62, np.nan], unit='s'),
+    })
+
+
+@pytest.fixture
+def replay():
+    return RaceReplayData(lap_times())
+
+
+def test_matrices_are_indexed_by_lap_and_driver(replay):
+    assert list(replay.laps) == [1, 2, 3]
+    assert list(replay.driver_refs) == ['ham', 'ver', 'bot']
+    np.testing.assert_array_equal(replay.cumulative_ms[:, 0], [60_000, 120_000, 180_000])
+    np.testing.assert_array_equal(replay.cumulative_ms[:, 1], [62_000, 124_000, np.nan])
+    # A retired driver keeps the last position; no laps at all stays NaN
+    np.testing.assert_array_equal(replay.positions[:, 1], [2, 2, 2])
+    assert np.isnan(replay.positions[:, 2]).all()
+
+
+def test_distances_follow_the_race_clock(replay):
+    engine = ReplayEngine(replay)
+
+    np.testing.assert_allclose(engine.distances(0), [0, 0, np.nan])
+    np.testing.assert_allclose(engine.distances(90_000), [1.5, 90 / 62, np.nan])
+    # After retiring, a car stays at its last completed lap
+    np.testing.assert_allclose(engine.distances(150_000), [2.5, 2, np.nan])
+    np.testing.assert_allclose(engine.distances(1e9), [3, 2, np.nan])
+    assert engine.leader_lap(90_000) == 2
+    assert engine.leader_lap(1e9) == 3
+
+
+def test_bisection_matches_a_linear_scan():
+    rng = np.random.default_rng(0)
+    laps, drivers = 57, 20
+    retired_after = rng.integers(0, laps + 1, drivers)
+    frame = pd.DataFrame([
+        {'driverRef': f"d{driver}", 'constructorRef': 'team', 'code': f"D{driver}", 'lap': lap,
+         'position': driver + 1, 'time': pd.Timedelta(seconds=float(rng.uniform(80, 100)))}
+        for driver in range(drivers) for lap in range(1, retired_after[driver] + 1)
+    ] + [{'driverRef': f"d{driver}", 'constructorRef': 'team', 'code': f"D{driver}", 'lap': np.nan,
+          'position': np.nan, 'time': pd.NaT} for driver in range(drivers) if retired_after[driver] == 0])
+    replay = RaceReplayData(frame)
+    engine = ReplayEngine(replay)
+
+    for race_ms in rng.uniform(0, engine.duration_ms, 50):
+        expected = []
+        for column in range(replay.num_drivers):
+            cumulative = replay.cumulative_ms[:, column]
+            finished = cumulative[~np.isnan(cumulative)]
+            if finished.size == 0:
+                expected.append(np.nan)
+                continue
+            completed = int(np.sum(finished <= race_ms))
+            if completed == finished.size:
+                expected.append(completed)
+            else:
+                start = finished[completed - 1] if completed else 0.0
+                expected.append(completed + (race_ms - start) / (finished[completed] - start))
+        np.testing.assert_allclose(engine.distances(race_ms), expected)
+
+
+def test_advance_and_seek_are_clamped_to_the_race(replay):
+    engine = ReplayEngine(replay, speed=10)
+
+    assert engine.advance(1.0) == 10_000
+    engine.seek(-5)
+    assert engine.race_ms == 0
+    engine.seek(1e9)
+    assert engine.race_ms == engine.duration_ms == 180_000
+    assert engine.finished
+    with pytest.raises(ValueError):
+        engine.set_speed(0)
+
+
+def test_seek_lap_jumps_to_the_leaders_lap_start(replay):
+    engine = ReplayEngine(replay)
+
+    engine.seek_lap(1)
+    assert engine.race_ms == 60_000
+    engine.seek_lap(3)
+    assert engine.race_ms == engine.duration_ms
+
+
+def test_positions_are_interpolated_between_laps():
+    frame = lap_times()
+    frame.loc[3, 'position'] = 1  # 'ver' leads lap 2
+    frame.loc[1, 'position'] = 2
+    replay = RaceReplayData(frame)
+
+    positions = replay.positions_at(np.array([1.5, 1.5, np.nan]))
+
+    np.testing.assert_allclose(positions, [1.5, 1.5, np.nan])
+
+
+def test_sprites_are_matched_by_driver_ref(replay):
+    sprites = [SimpleNamespace(name=name) for name in ('bot', 'unknown', 'ham')]
+
+    columns, matched = replay.sprite_index(sprites)
+
+    assert list(columns) == [2, 0]
+    assert [sprite.name for sprite in matched] == ['bot', 'ham']
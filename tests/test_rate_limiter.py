@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+import api.rate_limiter as rate_limiter
+from api.rate_limiter import RateLimiter, RateLimitExceeded
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limiter, 'time', SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return str(tmp_path / 'rate_limits.json')
+
+
+def test_hourly_window_slides(state_file, clock):
+    limiter = RateLimiter(state_file, {'max_calls_per_hour': 2})
+    limiter.acquire('a')
+    clock[0] += 1800
+    limiter.acquire('b')
+
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.acquire('c')
+    assert excinfo.value.retry_after == pytest.approx(1800)
+
+    # The first call leaves the window, the second one is still in it
+    clock[0] += 1800
+    assert limiter.try_acquire('c')
+    assert not limiter.try_acquire('d')
+
+
+def test_per_key_budget_only_limits_that_key(state_file, clock):
+    limiter = RateLimiter(state_file)
+
+    assert limiter.try_acquire('next_race', max_calls_per_day=1)
+    assert not limiter.try_acquire('next_race', max_calls_per_day=1)
+    assert limiter.try_acquire('last_race', max_calls_per_day=1)
+    clock[0] += 86400
+    assert limiter.try_acquire('next_race', max_calls_per_day=1)
+
+
+def test_calls_survive_a_restart(state_file, clock):
+    RateLimiter(state_file).acquire('a')
+    RateLimiter(state_file).acquire('b')
+
+    limiter = RateLimiter(state_file, {'max_calls_per_day': 2})
+
+    assert limiter.calls_in_window() == 2
+    assert limiter.calls_in_window('a') == 1
+    assert not limiter.try_acquire('c')
+
+
+def test_refund_gives_back_the_key_call(state_file, clock):
+    limiter = RateLimiter(state_file)
+    limiter.acquire('a')
+    limiter.acquire('a')
+
+    limiter.refund('a')
+    assert limiter.calls_in_window('a') == 1
+    # The server still answered, so the global budget keeps the call
+    assert limiter.calls_in_window() == 2
+
+    limiter.refund('a', include_global=True)
+    assert limiter.calls_in_window('a') == 0
+    assert limiter.calls_in_window() == 1
+    # Nothing left to refund for the key
+    limiter.refund('a', include_global=True)
+    assert RateLimiter(state_file).calls_in_window() == 1
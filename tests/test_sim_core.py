@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.race_replay import RaceReplayData, ReplayEngine
+from utils.sim_core import FixedStepSimulation
+
+
+def race_details():
+    # Two drivers over three laps: 'ham' laps in 60 s, 'ver' in 62 s
+    return pd.DataFrame({
+        'driverRef': ['ham'] * 3 + ['ver'] * 3,
+        'constructorRef': ['mercedes'] * 3 + ['red_bull'] * 3,
+        'code': ['HAM'] * 3 + ['VER'] * 3,
+        'lap': [1, 2, 3] * 2,
+        'position': [1, 1, 1, 2, 2, 2],
+        'time': pd.to_timedelta([60] * 3 + [62] * 3, unit='s'),
+    })
+
+
+def simulation(speed=1.0, **kwargs):
+    return FixedStepSimulation(ReplayEngine(RaceReplayData(race_details()), speed=speed), **kwargs)
+
+
+def test_same_steps_give_the_same_state():
+    first, second = simulation(speed=30), simulation(speed=30)
+
+    first.run_steps(100)
+    for _ in range(10):
+        second.run_steps(10)
+
+    assert first.engine.race_ms == second.engine.race_ms
+    np.testing.assert_array_equal(first.distances(), second.distances())
+
+
+def test_race_time_does_not_depend_on_frame_rate():
+    fast, slow = simulation(), simulation()
+
+    for _ in range(60):
+        fast.advance(1 / 60)
+    for _ in range(5):
+        slow.advance(0.2)
+
+    assert fast.steps == slow.steps == 60
+    assert slow.dropped_seconds == 0
+    assert fast.engine.race_ms == pytest.approx(slow.engine.race_ms)
+
+
+def test_a_stall_drops_time_beyond_the_backlog():
+    sim = simulation()
+
+    steps = sim.advance(1.0)
+
+    assert steps == 15
+    assert 0 <= sim.alpha < 1
+    # Nothing is lost except the dropped time, about 0.75 s
+    kept = (steps + sim.alpha) * sim.step_seconds
+    assert kept + sim.dropped_seconds == pytest.approx(1.0)
+    assert 0.7 < sim.dropped_seconds <= 0.75
+
+
+def test_distances_are_interpolated_between_steps():
+    sim = simulation(speed=60)
+    sim.advance(1.5 / 60)
+
+    # One step (1 race second) run, half a step pending
+    assert sim.alpha == pytest.approx(0.5)
+    np.testing.assert_allclose(sim.distances(), (sim.previous + sim.current) / 2)
+
+
+def test_seek_restarts_interpolation():
+    sim = simulation()
+    sim.advance(1.5 / 60)
+
+    sim.seek(90_000)
+
+    assert sim.alpha == 0
+    np.testing.assert_allclose(sim.distances(), [1.5, 90 / 62])
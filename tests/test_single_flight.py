@@ -0,0 +1,65 @@
+import time
+import threading
+
+from api.single_flight import SingleFlight
+
+
+def run_concurrently(flight, fn, callers=5):
+    """Call flight.do('key', fn) from several threads while fn is still running."""
+    release = threading.Event()
+    outcomes = []
+
+    def blocking():
+        release.wait(5)
+        return fn()
+
+    def call():
+        try:
+            outcomes.append(flight.do('key', blocking))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    threads[0].start()
+    while not flight.in_flight('key'):
+        time.sleep(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)  # let the followers reach the wait
+    release.set()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_concurrent_calls_share_one_fetch():
+    flight = SingleFlight()
+    calls = []
+
+    outcomes = run_concurrently(flight, lambda: calls.append(1) or 'payload')
+
+    assert len(calls) == 1
+    assert sorted(outcomes) == [('payload', False)] + [('payload', True)] * 4
+    assert not flight.in_flight('key')
+
+
+def test_leader_error_reaches_every_caller():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    outcomes = run_concurrently(flight, fail)
+
+    assert len(outcomes) == 5
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    # A failed call is not cached: the next one runs again
+    assert flight.do('key', lambda: 'retry') == ('retry', False)
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+
+    value, shared = flight.do('other', lambda: flight.do('key', lambda: 'inner'))
+
+    assert value == ('inner', False) and not shared
@@ -0,0 +1,78 @@
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.api_handler import ErgastAPI
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api',
+                      'current_drivers_standings.json')
+
+
+def standings(points):
+    with open(SAMPLE) as f:
+        data = json.load(f)
+    data['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings'][0]['points'] = points
+    return data
+
+
+class SlowStandingsHandler(BaseHTTPRequestHandler):
+    """Serves updated driver standings after half a second."""
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        time.sleep(0.5)
+        body = json.dumps(standings('999')).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(tmp_path):
+    SlowStandingsHandler.requests_seen = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), SlowStandingsHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    handler = ErgastAPI(cache_dir=str(tmp_path), base_url=f"http://127.0.0.1:{httpd.server_port}",
+                        stale_while_revalidate=True)
+    handler.cache_manager.save_cache('driver_standings', standings('100'))
+    # Make the entry a day old so it is due for a refresh
+    handler.cache_manager.metadata['last_updates']['driver_standings'] = time.time() - 2 * 86400
+    yield handler
+    handler.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_stale_data_is_returned_without_waiting(api):
+    started = time.perf_counter()
+
+    first = api.get_driver_standings()
+    second = api.get_driver_standings()
+
+    assert time.perf_counter() - started < 0.4
+    assert first[0]['PTS'] == second[0]['PTS'] == '100'
+
+
+def test_listeners_get_the_revalidated_data(api):
+    fresh = threading.Event()
+    received = []
+    api.add_listener(lambda key, payload: (received.append((key, payload)), fresh.set()))
+
+    api.get_driver_standings()
+    api.get_driver_standings()  # already revalidating, not scheduled twice
+
+    assert fresh.wait(5)
+    assert [key for key, _ in received] == ['driver_standings']
+    assert SlowStandingsHandler.requests_seen == 1
+    assert api.get_driver_standings()[0]['PTS'] == '999'
@@ -0,0 +1,53 @@
+import pytest
+
+from api.historical_data import HistoricalRepository
+from api.standings_history import StandingsHistory
+
+RACES = ('raceId,year,round,name\n'
+         '1,2022,1,Bahrain\n2,2022,2,Jeddah\n3,2023,1,Bahrain\n4,2023,2,Jeddah\n')
+DRIVERS = ('driverId,forename,surname,nationality\n'
+           '1,Lewis,Hamilton,British\n2,Max,Verstappen,Dutch\n')
+DRIVER_STANDINGS = ('driverStandingsId,raceId,driverId,points,position,wins\n'
+                    '1,1,2,25,1,1\n2,1,1,18,2,0\n3,2,1,43,1,1\n4,2,2,37,2,1\n'
+                    '5,3,2,25,1,1\n6,3,1,18,2,0\n')
+CONSTRUCTORS = 'constructorId,name,nationality\n1,Mercedes,German\n'
+# Constructor standings are only known up to 2022 round 2
+CONSTRUCTOR_STANDINGS = ('constructorStandingsId,raceId,constructorId,points,position,wins\n'
+                         '1,1,1,40,1,0\n2,2,1,80,1,1\n')
+
+
+@pytest.fixture
+def history(tmp_path):
+    for name, text in (('races', RACES), ('drivers', DRIVERS), ('driver_standings', DRIVER_STANDINGS),
+                       ('constructors', CONSTRUCTORS), ('constructor_standings', CONSTRUCTOR_STANDINGS)):
+        (tmp_path / f"{name}.csv").write_text(text)
+    repository = HistoricalRepository(str(tmp_path), tables=())
+    return StandingsHistory(repository, data_dir=str(tmp_path))
+
+
+def test_latest_round_depends_on_the_kind(history):
+    assert history.seasons() == [2023, 2022]
+    assert history.latest_round('drivers') == (2023, 1)
+    assert history.latest_round('constructors') == (2022, 2)
+    assert history.latest_round('constructors', 2023) is None
+    assert history.latest_round('drivers', 2022) == (2022, 2)
+    assert list(history.rounds(2023)['name']) == ['Bahrain', 'Jeddah']
+
+
+def test_query_filters_by_season_round_and_name(history):
+    view = history.query('drivers', year=2022, round=2)
+
+    assert len(view) == 2
+    assert view.rows(0, 2) == [(2022, 2, 1, 'Lewis Hamilton', 'British', '43', 1),
+                               (2022, 2, 2, 'Max Verstappen', 'Dutch', '37', 1)]
+    assert [row[3] for row in history.query('drivers', search='VERST').rows(0, 10)] == ['Max Verstappen'] * 3
+
+
+def test_query_sorts_with_calendar_order_for_ties(history):
+    view = history.query('drivers', sort_by='points', descending=True)
+
+    assert [row[5] for row in view.rows(0, len(view))] == ['43', '37', '25', '25', '18', '18']
+    # Equal points keep calendar order
+    assert [row[0] for row in view.rows(2, 4)] == [2022, 2023]
+    with pytest.raises(KeyError):
+        history.query('drivers', sort_by='driverId')
@@ -0,0 +1,76 @@
+from ui.table_model import TableModel
+
+
+class FakeTree:
+    """Records the Treeview calls TableModel makes and keeps the item order."""
+
+    def __init__(self, columns=('pos', 'name', 'pts')):
+        self.columns = columns
+        self.items = []
+        self.values = {}
+        self.calls = []
+
+    def __getitem__(self, option):
+        return self.columns
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append('insert')
+        self.items.insert(index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values, tags):
+        self.calls.append('item')
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.calls.append('move')
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+    def delete(self, *iids):
+        self.calls.append('delete')
+        for iid in iids:
+            self.items.remove(iid)
+            del self.values[iid]
+
+
+def standings(order, points=None):
+    points = points or {}
+    return [(key, (position, key.title(), points.get(key, 10)))
+            for position, key in enumerate(order, start=1)]
+
+
+def test_identical_update_makes_no_calls():
+    tree = FakeTree()
+    model = TableModel(tree)
+    model.update(standings(['max', 'lando', 'charles']))
+    tree.calls.clear()
+
+    assert model.update(standings(['max', 'lando', 'charles'])) == 0
+    assert tree.calls == []
+
+
+def test_swapping_two_drivers_rewrites_both_rows_and_moves_one():
+    tree = FakeTree()
+    model = TableModel(tree)
+    model.update(standings(['max', 'lando', 'charles']))
+    tree.calls.clear()
+
+    # Both drivers' positions change, so both rows get new values
+    calls = model.update(standings(['lando', 'max', 'charles']))
+
+    assert calls == 3
+    assert sorted(tree.calls) == ['item', 'item', 'move']
+    assert tree.items == ['lando', 'max', 'charles']
+    assert tree.values['lando'][0] == 1
+
+
+def test_placeholder_row_is_replaced_by_data():
+    tree = FakeTree()
+    model = TableModel(tree)
+    model.show_message('Loading...')
+
+    model.update(standings(['max', 'lando']))
+
+    assert tree.items == ['max', 'lando']
+    assert TableModel.MESSAGE_ID not in tree.values
@@ -0,0 +1,101 @@
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoader:
+    """Runs slow work (API calls) on a worker pool and hands results back to Tk.
+
+    Tk widgets may only be touched from the thread running the mainloop, so
+    workers never call back into Tk directly: finished results are put on a
+    queue that is drained on the Tk thread by an ``after()`` poll. The poll
+    only runs while work is pending.
+
+    Args:
+        widget: Any widget of the application (used for ``after()``)
+        max_workers: Number of worker threads
+        poll_ms: Interval for draining the result queue while work is pending
+    """
+    def __init__(self, widget, max_workers=4, poll_ms=50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ui-loader')
+        self._results = queue.Queue()
+        self._pending = 0
+        self._poll_id = None
+        self._closed = False
+
+    def run(self, fn, on_done, on_error=None):
+        """Run ``fn()`` on a worker thread; call from the Tk thread.
+
+        Args:
+            fn: Zero-argument callable to run off the Tk thread
+            on_done: Called on the Tk thread with the return value
+            on_error: Called on the Tk thread with the exception (default: log it)
+
+        Returns:
+            concurrent.futures.Future for the call
+        """
+        self._pending += 1
+        future = self._executor.submit(fn)
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error)))
+        self._schedule_poll()
+        return future
+
+    def post(self, callback, *args):
+        """Schedule ``callback(*args)`` on the Tk thread from a running task.
+
+        Safe to call from worker threads. Posts are delivered by the poll that
+        runs while a task is pending, so call this from inside a task started
+        with run() (e.g. to report progress).
+        """
+        self._results.put((None, callback, args))
+
+    def _schedule_poll(self):
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        if self._closed:
+            return
+        while True:
+            try:
+                future, callback, extra = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if future is None:
+                self._dispatch(callback, *extra)
+                continue
+            self._pending -= 1
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                self._dispatch(callback, future.result())
+            elif extra is not None:
+                self._dispatch(extra, error)
+            else:
+                logger.error(f"Background task failed: {error}")
+        if self._pending > 0:
+            self._schedule_poll()
+
+    @staticmethod
+    def _dispatch(callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Error in UI callback {getattr(callback, '__name__', callback)}: {e}")
+
+    def close(self):
+        """Stop polling and discard pending results; running tasks finish in the background."""
+        self._closed = True
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
 
+from .table_model import TableModel
+
 class Constructor_standings(tk.Frame):
     """Widget for displaying constructor championship standings.
     
     Displays a table with constructor position, name, points, and wins.
+    Rows are keyed by constructorId, so updates only touch changed rows.
     
     Args:
         parent: Parent Tkinter widget
         api_handler: Instance of ErgastAPI for fetching constructor standings
+        loader: BackgroundLoader used to fetch the standings off the Tk thread
     """
-    def __init__(self, parent, api_handler, *args, **kwargs):
+    def __init__(self, parent, api_handler, loader, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.api_handler = api_handler
+        self.loader = loader
         self.setup_ui()
 
     def setup_ui(self):
@@ -25,12 +30,28 @@ class Constructor_standings(tk.Frame):
             self.tree.column(col, anchor=tk.CENTER)
 
         self.tree.pack(expand=True, fill='both')
+        self.table = TableModel(self.tree)
 
         # Fetch and display the data
         self.update_standings()
 
     def update_standings(self):
-        """Fetch and populate the constructor standings table with data from the API."""
-        standings = self.api_handler.get_constructors_championship()
-        for row in standings.itertuples():
-            self.tree.insert("", "end", values=(row.Position, row.Constructor, row.Points, row.Wins))
+        """Fetch the constructor standings in the background and show them when they arrive."""
+        self.show_message("Loading...")
+        self.loader.run(self.api_handler.get_constructors_championship,
+                        self.show_standings,
+                        lambda error: self.show_message("No data available"))
+
+    def show_standings(self, standings):
+        """Populate the table from the constructor standings DataFrame."""
+        if standings is None or standings.empty:
+            self.show_message("No data available")
+            return
+        self.table.update(
+            (row.ConstructorId, (row.Position, row.Constructor, row.Points, row.Wins))
+            for row in standings.itertuples()
+        )
+
+    def show_message(self, text):
+        """Replace the table contents with a single placeholder row."""
+        self.table.show_message(text)
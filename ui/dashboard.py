@@ -4,6 +4,8 @@ import tkinter as tk
 from ui.constructors_standings import Constructor_standings
 from .top_Bar import TopBar
 from .list_builder import Driver_standings
+from .background import BackgroundLoader
+from .history_browser import HistoryBrowser
 from tkinter import ttk
 from ttkbootstrap import Notebook
 
@@ -11,7 +13,11 @@ class Dashboard(tk.Frame):
     """Main dashboard container for the F1 Race Companion application.
     
     Displays the top navigation bar with race information and tabbed interface
-    containing driver standings and constructor standings.
+    containing driver standings, constructor standings and historical standings. The layout is
+    built immediately with placeholders; the data is fetched by a shared
+    BackgroundLoader so the window paints before any API call returns. Each
+    tab's content is only built (and its data fetched) when the tab is first
+    selected.
     
     Args:
         parent: Parent Tkinter widget
@@ -21,9 +27,11 @@ class Dashboard(tk.Frame):
         super().__init__(parent, *args, **kwargs)
         self.api_handler = api_handler
         self.parent = parent
+        self.loader = BackgroundLoader(self)
+        self.bind('<Destroy>', self._on_destroy, add='+')
 
         # Top Bar
-        self.top_bar = TopBar(self, self.api_handler)
+        self.top_bar = TopBar(self, self.api_handler, self.loader, self.on_refresh_result)
         self.top_bar.pack(fill='x', side='top', anchor='ne', padx=10, pady=10)
         
         #Content Section on notebooks
@@ -32,19 +40,63 @@ class Dashboard(tk.Frame):
 
         tab1 = ttk.Frame(notebook_frame)
         tab2 = ttk.Frame(notebook_frame)
+        tab3 = ttk.Frame(notebook_frame)
 
         notebook_frame.add(tab1, text='Driver Standings')
         notebook_frame.add(tab2, text='Constructor Standings')
+        notebook_frame.add(tab3, text='Historical Standings')
 
+        self.standings_area = None
+        self.constructor_standings_area = None
+        self.history_area = None
 
-        #Drivers Standings
+        # Tab contents are built the first time each tab is selected
+        self._tab_builders = {
+            str(tab1): self._build_driver_standings,
+            str(tab2): self._build_constructor_standings,
+            str(tab3): self._build_history,
+        }
+        self.notebook = notebook_frame
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+
+    def _on_tab_changed(self, event=None):
+        tab = str(self.notebook.select())
+        builder = self._tab_builders.pop(tab, None)
+        if builder is not None:
+            builder(self.notebook.nametowidget(tab))
 
-        standings_area = Driver_standings(tab1, self.api_handler)
-        standings_area.pack()
+    def _build_driver_standings(self, tab):
+        #Drivers Standings
+        self.standings_area = Driver_standings(tab, self.api_handler, self.loader)
+        self.standings_area.pack()
 
+    def _build_constructor_standings(self, tab):
         # Adding Constructor Standings to tab2
-        constructor_standings_area = Constructor_standings(tab2, self.api_handler)
-        constructor_standings_area.pack()
+        self.constructor_standings_area = Constructor_standings(tab, self.api_handler, self.loader)
+        self.constructor_standings_area.pack()
+
+    def _build_history(self, tab):
+        # Historical standings browser on tab3
+        self.history_area = HistoryBrowser(tab, self.loader)
+        self.history_area.pack(fill='both', expand=True)
+
+    def on_refresh_result(self, name, value):
+        """Show refreshed standings from the top bar's refresh without refetching them.
+
+        Tabs that were not built yet are skipped; they read the refreshed
+        cache when they are first opened.
+        """
+        if name == 'driver_standings' and self.standings_area is not None:
+            self.standings_area.show_standings(value)
+        elif name == 'constructor_standings' and self.constructor_standings_area is not None:
+            self.constructor_standings_area.show_standings(value)
+
+    def _on_destroy(self, event):
+        # <Destroy> is also delivered for every child widget
+        if event.widget is self:
+            self.top_bar.refresh_service.cancel()
+            self.loader.close()
 
     
         
@@ -0,0 +1,150 @@
+import tkinter as tk
+from tkinter import ttk
+
+from .virtual_table import VirtualTable
+
+ALL = 'All'
+HEADINGS = ('SEASON', 'ROUND', 'POS', 'NAME', 'NATIONALITY', 'PTS', 'WINS')
+WIDTHS = {'season': 70, 'round': 60, 'position': 50, 'name': 200, 'nationality': 130, 'points': 70, 'wins': 50}
+
+
+class HistoryBrowser(ttk.Frame):
+    """Tab for browsing historical driver and constructor standings.
+
+    Standings after any round of any season can be filtered by season, round
+    and name and sorted by clicking a column heading. Filtering and sorting
+    run in StandingsHistory on the BackgroundLoader pool; the table is a
+    VirtualTable, so even the full history only renders the visible rows.
+
+    Args:
+        parent: Parent Tkinter widget
+        loader: BackgroundLoader used to query the standings off the Tk thread
+        history: StandingsHistory instance (default: created on first load)
+    """
+    def __init__(self, parent, loader, history=None, *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self.loader = loader
+        self.history = history
+        self.sort_by = 'position'
+        self.descending = False
+        self._query_id = 0
+        self._search_after = None
+
+        # Filters
+        filters = ttk.Frame(self)
+        filters.pack(fill='x', padx=10, pady=10)
+
+        self.kind = tk.StringVar(value='drivers')
+        for text, value in (('Drivers', 'drivers'), ('Constructors', 'constructors')):
+            ttk.Radiobutton(filters, text=text, value=value, variable=self.kind,
+                            command=self._on_season).pack(side='left', padx=5)
+
+        ttk.Label(filters, text='Season').pack(side='left', padx=(15, 5))
+        self.season = ttk.Combobox(filters, width=6, state='readonly', values=(ALL,))
+        self.season.set(ALL)
+        self.season.bind('<<ComboboxSelected>>', self._on_season)
+        self.season.pack(side='left')
+
+        ttk.Label(filters, text='Round').pack(side='left', padx=(15, 5))
+        self.round = ttk.Combobox(filters, width=28, state='readonly', values=(ALL,))
+        self.round.set(ALL)
+        self.round.bind('<<ComboboxSelected>>', lambda event: self.refresh())
+        self.round.pack(side='left')
+
+        ttk.Label(filters, text='Name').pack(side='left', padx=(15, 5))
+        self.search = tk.StringVar()
+        self.search.trace_add('write', self._on_search)
+        ttk.Entry(filters, textvariable=self.search, width=20).pack(side='left')
+
+        self.count_label = ttk.Label(filters, text='', foreground='gray')
+        self.count_label.pack(side='right', padx=5)
+
+        # Table
+        self.table = VirtualTable(self, columns=tuple(WIDTHS), headings=HEADINGS, height=20,
+                                  widths=WIDTHS, on_sort=self.sort)
+        self.table.pack(fill='both', expand=True, padx=10, pady=10)
+
+        self.table.set_message('Loading...', column=3)
+        self.loader.run(self._load_history, self._on_history, self._on_error)
+
+    def _load_history(self):
+        # Worker thread: build the standings frames once
+        if self.history is None:
+            from api.standings_history import StandingsHistory
+            self.history = StandingsHistory()
+        latest = self.history.latest_round(self.kind.get())
+        return self.history.seasons(), latest
+
+    def _on_history(self, result):
+        seasons, latest = result
+        self.season.config(values=(ALL, *seasons))
+        if latest is not None:
+            # Open on the most recent season that has standings, not the newest calendar
+            self.season.set(latest[0])
+            self._on_season()
+        else:
+            self.refresh()
+
+    def _on_error(self, error):
+        self.table.set_message('No historical data available', column=3)
+        self.count_label.config(text='')
+
+    def _on_season(self, event=None):
+        year = self._selected_year()
+        if year is None:
+            rounds = (ALL,)
+        else:
+            races = self.history.rounds(year)
+            rounds = (ALL, *(f"{row.round} - {row.name}" for row in races.itertuples()))
+        self.round.config(values=rounds)
+        # Default to the standings after the latest round of the season with data
+        latest = self.history.latest_round(self.kind.get(), year) if year is not None else None
+        if latest is None:
+            self.round.set(ALL)
+        else:
+            self.round.set(next((value for value in rounds[1:]
+                                 if int(value.split(' - ', 1)[0]) == latest[1]), ALL))
+        self.refresh()
+
+    def _on_search(self, *args):
+        # Debounce typing so only the last keystroke runs a query
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(200, self.refresh)
+
+    def _selected_year(self):
+        value = self.season.get()
+        return None if value in ('', ALL) else int(value)
+
+    def _selected_round(self):
+        value = self.round.get()
+        return None if value in ('', ALL) else int(value.split(' - ', 1)[0])
+
+    def sort(self, column):
+        """Sort by a column, toggling the direction when it is already the sort column."""
+        if column == self.sort_by:
+            self.descending = not self.descending
+        else:
+            self.sort_by, self.descending = column, column in ('points', 'wins', 'season')
+        self.refresh()
+
+    def refresh(self):
+        """Run the current query in the background and show its rows when ready."""
+        self._search_after = None
+        if self.history is None:
+            return
+        self._query_id += 1
+        query_id = self._query_id
+        kind, year, round_, search = self.kind.get(), self._selected_year(), self._selected_round(), self.search.get()
+        sort_by, descending = self.sort_by, self.descending
+
+        def query():
+            return self.history.query(kind, year, round_, search, sort_by, descending)
+
+        def show(view):
+            # Drop results of queries that were superseded while running
+            if query_id == self._query_id:
+                self.table.set_source(view)
+                self.count_label.config(text=f"{len(view):,} rows")
+
+        self.loader.run(query, show, self._on_error)
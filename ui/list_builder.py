@@ -2,65 +2,91 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import * 
 
+from .table_model import TableModel
+
 
 class Driver_standings(ttk.Frame):
     """Widget for displaying driver championship standings.
     
     Displays a table with driver position, name, nationality, team, and points.
+    The table is shown right away with a loading row and filled once the
+    standings arrive from the background loader. Rows are keyed by driverId,
+    so later updates only touch the drivers that changed.
     
     Args:
         parent: Parent Tkinter widget
         api_handler: Instance of ErgastAPI for fetching driver standings
+        loader: BackgroundLoader used to fetch the standings off the Tk thread
     """
-    def __init__(self, parent, api_handler, *args, **kwargs):
+    def __init__(self, parent, api_handler, loader, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.parent = parent
         self.api_handler = api_handler
+        self.loader = loader
         self.standings_area = ttk.Frame(self)
-        self.drivers_data = self.api_handler.get_driver_standings()
+        self.drivers_data = None
 
         table_title = ttk.Label(self.parent, text="DRIVERS STANDINGS", font=('Helvetica', 22), bootstyle='inverse-danger').pack(pady=10)
-        
 
-        def create_standings_table(parent, driver_standings):
+        self.tree = self.create_standings_table(self.parent)
+        self.table = TableModel(self.tree, tags=lambda values: (values[0],))
+        self.update_standings()
+
+    def create_standings_table(self, parent):
+        """Create the empty standings table and its scrollbar."""
+
+        # Define the columns
+        columns = ('pos', 'name', 'nationality', 'team', 'pts')
+        tree = ttk.Treeview(parent, columns=columns, show='headings', bootstyle='danger-inverted')
+
+        # Define the column headings
+        tree.heading('pos', text='POS', anchor='w', )
+        tree.heading('name', text='DRIVER', anchor='w')
+        tree.heading('nationality', text='NATIONALITY', anchor='w')
+        tree.heading('team', text='TEAM', anchor='w')
+        tree.heading('pts', text='PTS', anchor='w')
+
+        # Adjust the column widths to the content
+        tree.column('pos', width=50)
+        tree.column('name', width=150)
+        tree.column('nationality', width=150)
+        tree.column('team', width=150)
+        tree.column('pts', width=50)
 
-            # Define the columns
-            columns = ('pos', 'name', 'nationality', 'team', 'pts')
-            tree = ttk.Treeview(parent, columns=columns, show='headings', bootstyle='danger-inverted')
+        # Add a scrollbar
+        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=tree.yview, bootstyle='round')
+        tree.configure(yscroll=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
 
-            # Define the column headings
-            tree.heading('pos', text='POS', anchor='w', )
-            tree.heading('name', text='DRIVER', anchor='w')
-            tree.heading('nationality', text='NATIONALITY', anchor='w')
-            tree.heading('team', text='TEAM', anchor='w')
-            tree.heading('pts', text='PTS', anchor='w')
+        tree.pack(fill='both', expand=True)
+        return tree
 
-            # Adjust the column widths to the content
-            tree.column('pos', width=50)
-            tree.column('name', width=150)
-            tree.column('nationality', width=150)
-            tree.column('team', width=150)
-            tree.column('pts', width=50)
+    def update_standings(self):
+        """Fetch the driver standings in the background and show them when they arrive."""
+        self.show_message("Loading...")
+        self.loader.run(self.api_handler.get_driver_standings,
+                        self.show_standings,
+                        lambda error: self.show_message("No data available"))
 
-            # Insert the driver data
-            for driver in driver_standings:
-                
-                #Get the driver position
-                position = driver['POS']
-                
-                #Insert the row info
-                tree.insert('', 'end', values=(
-                    driver['POS'],
-                    driver['NAME'],
-                    driver['NATIONALITY'],
-                    driver['TEAM']['name'],
-                    driver['PTS']
-                ), tags=(position,))                
+    def show_standings(self, driver_standings):
+        """Populate the table from the processed driver standings."""
+        if not driver_standings:
+            self.show_message("No data available")
+            return
+        self.drivers_data = driver_standings
 
-            # Add a scrollbar
-            scrollbar = ttk.Scrollbar(parent, orient='vertical', command=tree.yview, bootstyle='round')
-            tree.configure(yscroll=scrollbar.set)
-            scrollbar.pack(side='right', fill='y')
+        # Diff the driver rows against the ones on screen
+        self.table.update(
+            (driver['ID'], (
+                driver['POS'],
+                driver['NAME'],
+                driver['NATIONALITY'],
+                driver['TEAM']['name'],
+                driver['PTS']
+            ))
+            for driver in driver_standings
+        )
 
-            tree.pack(fill='both', expand=True)
-        create_standings_table(self.parent, self.drivers_data)
+    def show_message(self, text):
+        """Replace the table contents with a single placeholder row."""
+        self.table.show_message(text)
@@ -6,66 +6,96 @@ class NextRaceView(tk.Frame):
     """Widget for displaying last race and next race information cards.
     
     Shows two side-by-side cards: one for the last completed race and one
-    for the upcoming race.
+    for the upcoming race. The cards appear immediately with a loading
+    placeholder and are filled in place once the data arrives from a worker.
     
     Args:
         parent: Parent Tkinter widget
         api_handler: Instance of ErgastAPI for fetching race information
+        loader: BackgroundLoader used to fetch race information off the Tk thread
     """
-    def __init__(self, parent, api_handler, *args, **kwargs):
+    def __init__(self, parent, api_handler, loader, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.parent = parent
         self.api_handler = api_handler
+        self.loader = loader
 
-        last_card = self.last_race_card()
-        next_card = self.next_race_card()
-        
-        if last_card:
-            last_card.pack(side='left', padx=10, pady=10, fill='both', expand=True)
-        if next_card:
-            next_card.pack(side='right', padx=10, pady=10, fill='both', expand=True)
+        # Frames for the cards
+        self.last_card = ttk.Labelframe(self, text='LAST RACE', bootstyle='danger')
+        self.next_card = ttk.Labelframe(self, text='NEXT', bootstyle='danger')
+        self.last_card.pack(side='left', padx=10, pady=10, fill='both', expand=True)
+        self.next_card.pack(side='right', padx=10, pady=10, fill='both', expand=True)
+        self._card_labels = {self.last_card: [], self.next_card: []}
 
-    def last_race_card(self):
-        """Create and return a card displaying the last completed race information."""
-        race_details, podium = self.api_handler.get_last_race()
-        
-        # Frame for the card
-        card_frame = ttk.Labelframe(self, text='LAST RACE', bootstyle='danger')
+        self.show_loading()
+        self.load()
+
+    def load(self):
+        """Fetch both races on the worker pool and fill the cards when they arrive."""
+        self.loader.run(self.api_handler.get_last_race,
+                        lambda result: self.show_last_race(*result),
+                        lambda error: self.show_last_race(None))
+        self.loader.run(self.api_handler.get_next_race,
+                        self.show_next_race,
+                        lambda error: self.show_next_race(None))
+
+    def show_loading(self):
+        """Show a loading placeholder in both cards."""
+        for card in (self.last_card, self.next_card):
+            self._set_lines(card, [("Loading...", ("Helvetica", 12, "italic"))])
+
+    def show_last_race(self, race_details, podium=None):
+        """Fill the last race card.
         
+        Args:
+            race_details: Dictionary from get_last_race or None if unavailable
+            podium: Podium list from get_last_race (not displayed yet)
+        """
         if race_details:
-            # Race Title
-            ttk.Label(card_frame, text=f"{race_details['name']}", font=("Helvetica", 16, "bold")).pack(padx=10, pady=10)
-            # Circuit and Location
-            ttk.Label(card_frame, text=f"{race_details['circuit']}", font=("Helvetica", 12)).pack(padx=10, pady=10)
-            ttk.Label(card_frame, text=f"{race_details['location']}", font=('Helvetica', 12)).pack(padx=10, pady=10)
-            # Date and Time
-            date_time_str = f"{race_details['date']}"
-            ttk.Label(card_frame, text=date_time_str, font=("Helvetica", 12)).pack(padx=10, pady=10)
+            self._set_lines(self.last_card, [
+                # Race Title
+                (f"{race_details['name']}", ("Helvetica", 16, "bold")),
+                # Circuit and Location
+                (f"{race_details['circuit']}", ("Helvetica", 12)),
+                (f"{race_details['location']}", ('Helvetica', 12)),
+                # Date and Time
+                (f"{race_details['date']}", ("Helvetica", 12)),
+            ])
         else:
-            # Show placeholder when no data available
-            ttk.Label(card_frame, text="No data available", font=("Helvetica", 12, "italic")).pack(padx=10, pady=10)
-            ttk.Label(card_frame, text="Check your connection", font=("Helvetica", 10)).pack(padx=10, pady=5)
-        
-        return card_frame
+            self._show_unavailable(self.last_card)
 
-    def next_race_card(self):
-        """Create and return a card displaying the next upcoming race information."""
-        race_details = self.api_handler.get_next_race()
+    def show_next_race(self, race_details):
+        """Fill the next race card.
         
-        # Frame for the card
-        card_frame = ttk.Labelframe(self, text='NEXT', bootstyle='danger')
-
+        Args:
+            race_details: Dictionary from get_next_race or None if unavailable
+        """
         if race_details:
-            # Race Title
-            ttk.Label(card_frame, text=f"{race_details['name']}", font=("Helvetica", 16, "bold")).pack(padx=10, pady=10)
-            # Circuit and Location
-            ttk.Label(card_frame, text=f"{race_details['circuit']} - {race_details['location']}", font=("Helvetica", 12)).pack(padx=10, pady=10)
-            # Date and Time
-            date_time_str = f"{race_details['date']} - {race_details['time']}"
-            ttk.Label(card_frame, text=date_time_str, font=("Helvetica", 12)).pack(padx=10, pady=10)
+            self._set_lines(self.next_card, [
+                # Race Title
+                (f"{race_details['name']}", ("Helvetica", 16, "bold")),
+                # Circuit and Location
+                (f"{race_details['circuit']} - {race_details['location']}", ("Helvetica", 12)),
+                # Date and Time
+                (f"{race_details['date']} - {race_details['time']}", ("Helvetica", 12)),
+            ])
         else:
-            # Show placeholder when no data available
-            ttk.Label(card_frame, text="No data available", font=("Helvetica", 12, "italic")).pack(padx=10, pady=10)
-            ttk.Label(card_frame, text="Check your connection", font=("Helvetica", 10)).pack(padx=10, pady=5)
-        
-        return card_frame
+            self._show_unavailable(self.next_card)
+
+    def _show_unavailable(self, card):
+        # Show placeholder when no data available
+        self._set_lines(card, [
+            ("No data available", ("Helvetica", 12, "italic")),
+            ("Check your connection", ("Helvetica", 10)),
+        ])
+
+    def _set_lines(self, card, lines):
+        """Show (text, font) lines in a card, reusing its existing labels."""
+        labels = self._card_labels[card]
+        while len(labels) < len(lines):
+            labels.append(ttk.Label(card))
+        for label, (text, font) in zip(labels, lines):
+            label.config(text=text, font=font)
+            label.pack(padx=10, pady=10)
+        for label in labels[len(lines):]:
+            label.pack_forget()
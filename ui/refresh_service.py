@@ -0,0 +1,86 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+REFRESH_ENDPOINTS = ('next_race', 'last_race', 'driver_standings', 'constructor_standings')
+
+
+class RefreshService:
+    """Runs a full data refresh in the background and reports it on the Tk thread.
+
+    ``api_handler.refresh_all_data`` runs on the BackgroundLoader pool. Each
+    endpoint's result record is posted back to the Tk thread as soon as it
+    arrives, so widgets can update from the fetched payload without calling
+    the API again. Only one refresh runs at a time; a cancelled refresh skips
+    the endpoints it has not requested yet and its late results are ignored.
+    A new refresh can start right away: endpoints still being fetched by the
+    cancelled one are fetched again rather than reported as cancelled.
+
+    Args:
+        api_handler: Instance of ErgastAPI
+        loader: BackgroundLoader used to run the refresh off the Tk thread
+    """
+    def __init__(self, api_handler, loader):
+        self.api_handler = api_handler
+        self.loader = loader
+        self._cancel = None
+        self._generation = 0
+
+    @property
+    def running(self):
+        """Whether a refresh is in progress."""
+        return self._cancel is not None
+
+    def start(self, on_progress, on_done):
+        """Start a refresh; call from the Tk thread.
+
+        Args:
+            on_progress: Called on the Tk thread as ``on_progress(name, result)``
+                for every endpoint as soon as it finishes
+            on_done: Called on the Tk thread with the results dictionary of
+                refresh_all_data, or None if the refresh failed or was cancelled
+
+        Returns:
+            False if a refresh is already running
+        """
+        if self.running:
+            return False
+        self._generation += 1
+        generation = self._generation
+        cancel = self._cancel = threading.Event()
+
+        def progress(name, result):
+            # Worker thread: hand the record over to the Tk thread
+            self.loader.post(self._deliver, generation, on_progress, name, result)
+
+        def refresh():
+            return self.api_handler.refresh_all_data(on_result=progress, cancel=cancel)
+
+        def done(results):
+            if self._finish(generation):
+                on_done(results)
+
+        def failed(error):
+            logger.error(f"Refresh failed: {error}")
+            if self._finish(generation):
+                on_done(None)
+
+        self.loader.run(refresh, done, failed)
+        return True
+
+    def cancel(self):
+        """Cancel the running refresh; results that arrive afterwards are dropped."""
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def _deliver(self, generation, on_progress, name, result):
+        if generation == self._generation and self.running:
+            on_progress(name, result)
+
+    def _finish(self, generation):
+        if generation != self._generation or not self.running:
+            return False
+        self._cancel = None
+        return True
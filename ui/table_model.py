@@ -0,0 +1,75 @@
+class TableModel:
+    """Keyed model for a Treeview that applies new rows as a diff.
+
+    Every row is stored under its key as the Treeview item id, so updating
+    the table only issues ``item()``, ``move()``, ``insert()`` and
+    ``delete()`` calls for rows that changed: one ``delete()`` for all removed
+    rows, one ``insert()`` per new row, one ``item()`` per row whose values
+    changed and one ``move()`` per row out of place (swapping two drivers,
+    whose positions both change, costs two ``item()`` and one ``move()``).
+    Unchanged rows keep their items, which preserves the selection and the
+    scroll position.
+
+    Args:
+        tree: Treeview showing the rows (top-level items only)
+        tags: Optional function ``tags(values)`` returning the tags of a row
+    """
+    MESSAGE_ID = '__message__'
+
+    def __init__(self, tree, tags=None):
+        self.tree = tree
+        self.tags = tags
+        self._values = {}
+        self._order = []
+
+    def update(self, rows):
+        """Show rows in the given order, touching only the rows that changed.
+
+        Args:
+            rows: Iterable of (key, values) pairs; keys must be unique
+
+        Returns:
+            Number of Treeview calls issued
+        """
+        rows = [(str(key), tuple(values)) for key, values in rows]
+        keys = {key for key, _ in rows}
+        calls = 0
+
+        removed = [key for key in self._order if key not in keys]
+        if removed:
+            self.tree.delete(*removed)
+            calls += 1
+            for key in removed:
+                del self._values[key]
+            self._order = [key for key in self._order if key in keys]
+
+        for index, (key, values) in enumerate(rows):
+            if key not in self._values:
+                self.tree.insert('', index, iid=key, values=values, tags=self._tags(values))
+                self._order.insert(index, key)
+                calls += 1
+            else:
+                if self._values[key] != values:
+                    self.tree.item(key, values=values, tags=self._tags(values))
+                    calls += 1
+                if self._order[index] != key:
+                    self.tree.move(key, '', index)
+                    self._order.remove(key)
+                    self._order.insert(index, key)
+                    calls += 1
+            self._values[key] = values
+        return calls
+
+    def show_message(self, text, column=1):
+        """Replace all rows with a single placeholder row.
+
+        Args:
+            text: Message to show
+            column: Index of the column holding the text
+        """
+        values = [''] * len(self.tree['columns'])
+        values[column] = text
+        self.update([(self.MESSAGE_ID, values)])
+
+    def _tags(self, values):
+        return self.tags(values) if self.tags else ()
@@ -1,19 +1,29 @@
 import tkinter as tk
 from tkinter import ttk
 from .next_race import NextRaceView
+from .refresh_service import RefreshService, REFRESH_ENDPOINTS
 
 class TopBar(ttk.Frame):
     """Top navigation bar widget for the F1 Race Companion application.
     
     Displays the F1 logo, refresh button, and race information cards (last race and next race).
+    The refresh runs in the background and can be cancelled with the same button.
     
     Args:
         parent: Parent Tkinter widget
         api_handler: Instance of ErgastAPI for fetching race information
+        loader: BackgroundLoader used to fetch data off the Tk thread
+        on_refresh_result: Optional callback ``on_refresh_result(name, value)`` for
+            refreshed endpoints that are not shown in the top bar (e.g. standings)
     """
-    def __init__(self, parent, api_handler, *args, **kwargs):
+    def __init__(self, parent, api_handler, loader, on_refresh_result=None, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.api_handler = api_handler
+        self.loader = loader
+        self.on_refresh_result = on_refresh_result
+        self.refresh_service = RefreshService(self.api_handler, self.loader)
+        self._refreshed = 0
+        self._refresh_failed = 0
         self.parent = parent
 
         # Frame container for both the last and the next race
@@ -48,29 +58,52 @@ class TopBar(ttk.Frame):
         self.update_status()
 
         #Cards for the last and next race
-        self.race_view = NextRaceView(self.top_bar_frame, self.api_handler)
+        self.race_view = NextRaceView(self.top_bar_frame, self.api_handler, self.loader)
         self.race_view.pack(side='right', padx=10, pady=10, fill='x', expand=True)
     
     def refresh_data(self):
-        """Manually refresh all data from API."""
-        self.refresh_button.config(state='disabled', text="🔄 Refreshing...")
-        self.status_label.config(text="Refreshing data...")
-        self.parent.update()
-        
-        try:
-            self.api_handler.refresh_all_data()
-            # Refresh the race view
-            self.race_view.destroy()
-            self.race_view = NextRaceView(self.top_bar_frame, self.api_handler)
-            self.race_view.pack(side='right', padx=10, pady=10, fill='x', expand=True)
-            self.status_label.config(text="✓ Data refreshed", foreground='green')
-        except Exception as e:
+        """Manually refresh all data from API in the background."""
+        if not self.refresh_service.start(self._on_refresh_progress, self._on_refresh_done):
+            return
+        self._refreshed = 0
+        self._refresh_failed = 0
+        self.refresh_button.config(text="✖ Cancel", command=self.cancel_refresh)
+        self.status_label.config(text="Refreshing data...", foreground='gray')
+
+    def cancel_refresh(self):
+        """Cancel the running refresh and keep the data already shown."""
+        self.refresh_service.cancel()
+        self.status_label.config(text="Refresh cancelled", foreground='gray')
+        self._refresh_finished()
+
+    def _on_refresh_progress(self, name, result):
+        """Update the widgets for one refreshed endpoint from the fetched payload."""
+        self._refreshed += 1
+        self.status_label.config(text=f"Refreshing data... ({self._refreshed}/{len(REFRESH_ENDPOINTS)})")
+        if not result['ok']:
+            # Keep showing the previous data for this endpoint
+            self._refresh_failed += 1
+            return
+        value = result['value']
+        if name == 'next_race':
+            self.race_view.show_next_race(value)
+        elif name == 'last_race':
+            self.race_view.show_last_race(*value)
+        elif self.on_refresh_result:
+            self.on_refresh_result(name, value)
+
+    def _on_refresh_done(self, results):
+        if results is None or self._refresh_failed == len(REFRESH_ENDPOINTS):
             self.status_label.config(text="✗ Refresh failed", foreground='red')
-            import logging
-            logging.error(f"Refresh failed: {e}")
-        finally:
-            self.refresh_button.config(state='normal', text="🔄 Refresh")
-            self.parent.after(3000, self.update_status)  # Reset status after 3 seconds
+        elif self._refresh_failed:
+            self.status_label.config(text=f"⚠ {self._refresh_failed} of {len(REFRESH_ENDPOINTS)} failed", foreground='orange')
+        else:
+            self.status_label.config(text="✓ Data refreshed", foreground='green')
+        self._refresh_finished()
+
+    def _refresh_finished(self):
+        self.refresh_button.config(text="🔄 Refresh", command=self.refresh_data)
+        self.parent.after(3000, self.update_status)  # Reset status after 3 seconds
     
     def update_status(self):
         """Update the cache status display."""
@@ -0,0 +1,112 @@
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    """Treeview that only materializes the rows currently visible.
+
+    The Treeview holds a fixed number of row items that are reused while
+    scrolling: moving the scrollbar or the mouse wheel changes the offset into
+    the data source and rewrites the values of those items. Filling the table
+    therefore costs the same for 20 or 50,000 rows.
+
+    Args:
+        parent: Parent Tkinter widget
+        columns: Column identifiers
+        headings: Heading text for every column
+        height: Number of visible rows
+        widths: Optional dictionary of column -> width in pixels
+        on_sort: Optional callback ``on_sort(column)`` when a heading is clicked
+    """
+    def __init__(self, parent, columns, headings, height=20, widths=None, on_sort=None, *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self.height = height
+        self.on_sort = on_sort
+        self.source = None
+        self.offset = 0
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height, selectmode='none')
+        for column, heading in zip(columns, headings):
+            self.tree.heading(column, text=heading, anchor='w',
+                              command=lambda c=column: self.on_sort and self.on_sort(c))
+            self.tree.column(column, width=(widths or {}).get(column, 80))
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        # One reusable item per visible row; unused ones are detached
+        self._slots = [self.tree.insert('', 'end', iid=f"row{i}") for i in range(height)]
+        self._shown = [None] * height
+        self._attached = height
+
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+        self.set_source(None)
+
+    def set_source(self, source):
+        """Show a new data source from the top.
+
+        Args:
+            source: Object with ``len()`` and ``rows(start, stop)`` returning
+                value tuples (e.g. StandingsView), or None for an empty table
+        """
+        self.source = source
+        self.offset = 0
+        self._render()
+
+    def set_message(self, text, column=0):
+        """Show a single placeholder row instead of data."""
+        self.source = None
+        self.offset = 0
+        values = [''] * len(self.tree['columns'])
+        values[column] = text
+        self._show([tuple(values)])
+        self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows):
+        """Scroll by a number of rows (negative = up)."""
+        self._scroll_to(self.offset + rows)
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._scroll_to(int(round(float(args[1]) * self._count())))
+        elif args[0] == 'scroll':
+            step = self.height if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _count(self):
+        return len(self.source) if self.source is not None else 0
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, self._count() - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        count = self._count()
+        rows = self.source.rows(self.offset, self.offset + self.height) if count else []
+        self._show(rows)
+        if count:
+            self.scrollbar.set(self.offset / count, min(self.offset + self.height, count) / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _show(self, rows):
+        # Reattach slots needed again, detach the ones left empty
+        for i in range(self._attached, len(rows)):
+            self.tree.move(self._slots[i], '', i)
+        for i in range(len(rows), self._attached):
+            self.tree.detach(self._slots[i])
+            self._shown[i] = None
+        self._attached = len(rows)
+        for i, values in enumerate(rows):
+            if values != self._shown[i]:
+                self.tree.item(self._slots[i], values=values)
+                self._shown[i] = values
@@ -1,7 +1,13 @@
 import pygame
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import os
+
+from api.artifact_cache import ArtifactCache
+from api.historical_data import get_repository
+from utils.race_replay import RaceReplayData, ReplayEngine
+from utils.sim_core import FixedStepSimulation
+from utils.sprite_assets import get_assets
 
 # Constants
 WIDTH, HEIGHT = 1500, 700
@@ -11,9 +17,16 @@ FINISH_LINE_Y = HEIGHT - 50
 THIRD_WIDTH = WIDTH // 3
 HALF_WIDTH = WIDTH // 2
 FINISH_LINE_X = WIDTH - 50
+START_X = 50
+CAR_WIDTH = 67  # sprites are scaled to 25px high at a 186:69 aspect ratio
+PIXELS_PER_LAP = 600  # horizontal spacing for a one-lap gap
+
+BACKGROUND_COLOR = (169, 169, 169)  # Dark gray
+LINE_COLOR = (255, 255, 255)
+TEXT_COLOR = (255, 255, 255)
 
-# Car class for creating car sprites
-class Car(pygame.sprite.Sprite):
+# Car class for creating car sprites; dirty sprites are only redrawn when they move
+class Car(pygame.sprite.DirtySprite):
     def __init__(self, image, x, y, name, code):
         super().__init__()
         self.image = image
@@ -25,77 +38,120 @@ class Car(pygame.sprite.Sprite):
 
     # Update the position of the car
     def update(self, dx, dy):
-        self.rect.x += dx
-        self.rect.y += dy
-
-# Load data from CSV files
-def load_data():
-    # Load data from CSV files
-    drivers_df = pd.read_csv('./api/localData/drivers.csv', usecols=['driverId', 'driverRef', 'number', 'code'])
-    results_df = pd.read_csv('./api/localData/results.csv', usecols=['raceId', 'driverId', 'constructorId', 'statusId'])
-    constructors_df = pd.read_csv('./api/localData/constructors.csv', usecols=['constructorId', 'constructorRef'])
-    races_df = pd.read_csv('./api/localData/races.csv', usecols=['raceId', 'circuitId', 'date'], parse_dates=['date'])
-    lap_times_df = pd.read_csv('./api/localData/lap_times.csv', usecols=['raceId', 'driverId', 'lap', 'position', 'time'])
-    circuits_df = pd.read_csv('./api/localData/circuits.csv', usecols=['circuitId', 'circuitRef'])
-    qualifying_df = pd.read_csv('./api/localData/qualifying.csv', usecols=['raceId', 'driverId', 'constructorId', 'position'])
-    status_df = pd.read_csv('./api/localData/status.csv', usecols=['statusId', 'status'])
-
-    # Filter past races
-    past_races = races_df[races_df['date'] <= datetime.now()]
-    if past_races.empty:
-        print("No past races found.")
+        if dx or dy:
+            self.rect.x += dx
+            self.rect.y += dy
+            self.dirty = 1
+
+# Text sprite that is only re-rendered (and redrawn) when its text changes
+class LapText(pygame.sprite.DirtySprite):
+    def __init__(self, font, center_x, top):
+        super().__init__()
+        self.font = font
+        self.center_x = center_x
+        self.top = top
+        self.text = None
+        self.set_text('')
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        self.image = self.font.render(text, True, TEXT_COLOR)
+        self.rect = self.image.get_rect(midtop=(self.center_x, self.top))
+        self.dirty = 1
+
+# Static background (track and start/finish lines), drawn once and reused
+def create_background():
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill(BACKGROUND_COLOR)
+    pygame.draw.line(background, LINE_COLOR, (0, START_LINE_Y), (WIDTH, START_LINE_Y), 5)
+    pygame.draw.line(background, LINE_COLOR, (0, FINISH_LINE_Y), (WIDTH, FINISH_LINE_Y), 5)
+    return background
+
+# Lap counter text
+def lap_label(replay, engine, distances):
+    return f"Lap: {replay.leader_lap(distances)}/{replay.num_laps}  x{engine.speed:g}"
+
+# Processed race details are cached per race and rebuilt only when a source table changes
+RACE_DETAILS_CACHE = ArtifactCache(
+    'race_details',
+    ['races', 'results', 'qualifying', 'lap_times', 'drivers', 'constructors', 'circuits', 'status'],
+    version=1
+)
+
+# Build a race's details, filtering every table to that race before joining
+def build_race_details(race_id):
+    repo = get_repository()
+    race_details = repo.select_race_rows('results', race_id, ['driverId', 'constructorId', 'statusId'])
+    if race_details.empty:
         return pd.DataFrame()
+    race = repo.races.iloc[repo.race_ordinal(race_id)]
+
+    # Map the small dimension tables by key instead of merging them
+    race_details['raceId'] = race_id
+    race_details['date'] = race['date']
+    race_details['circuitRef'] = repo.lookup('circuits', 'circuitId', 'circuitRef')[race['circuitId']]
+    for column in ('driverRef', 'number', 'code'):
+        race_details[column] = race_details['driverId'].map(repo.lookup('drivers', 'driverId', column))
+    race_details['constructorRef'] = race_details['constructorId'].map(
+        repo.lookup('constructors', 'constructorId', 'constructorRef'))
+    race_details['status'] = race_details['statusId'].map(repo.lookup('status', 'statusId', 'status'))
+
+    qualifying = repo.select_race_rows('qualifying', race_id, ['driverId', 'position'])
+    race_details['qualifying_position'] = race_details['driverId'].map(
+        qualifying.drop_duplicates('driverId').set_index('driverId')['position'])
+
+    # Only the per-lap table needs a real join, and only over this race's laps
+    try:
+        lap_times = repo.select_race_rows('lap_times', race_id, ['driverId', 'lap', 'position', 'time_ms'])
+    except FileNotFoundError:
+        print("No lap times data found.")
+        return pd.DataFrame()
+    race_details = race_details.merge(lap_times, on='driverId', how='left')
 
-    # Get the last race
-    last_race = past_races.iloc[-1]
-    if last_race['raceId'] not in results_df['raceId'].values:
-        latest_race_id = results_df['raceId'].max()
-        race_details = results_df[results_df['raceId'] == latest_race_id]
-    else:
-        race_details = results_df[results_df['raceId'] == last_race['raceId']]
-
-    # Merge dataframes to get race details
-    race_details = race_details.merge(races_df, on='raceId')
-    race_details = race_details.merge(drivers_df, on='driverId')
-    race_details = race_details.merge(constructors_df, on='constructorId')
-    race_details = race_details.merge(circuits_df, on='circuitId')
-    race_details = race_details.merge(lap_times_df, on=['raceId', 'driverId'], how='left')
-    race_details = race_details.merge(qualifying_df, on=['raceId', 'driverId', 'constructorId'], how='left')
-    race_details = race_details.merge(status_df, on='statusId')
-
-    # Fill missing positions and convert time to timedelta
-    if 'position' not in race_details.columns:
-        race_details['position'] = race_details['position_x']
-    race_details['time'] = pd.to_timedelta('0:' + race_details['time'].fillna('0:00.000'))
-
-    # Save race details to CSV
-    race_details.to_csv("final_race_data2.csv", index=False)
+    # Convert lap time to timedelta
+    race_details['time'] = pd.to_timedelta(race_details.pop('time_ms').fillna(0), unit='ms')
+
+    return race_details
+
+# Load a race's details (default: the last race) from the artifact cache, building them if needed
+def load_data(race_id=None):
+    repo = get_repository()
+
+    requested_race = race_id is not None
+    if not requested_race:
+        # Filter past races (calendar order)
+        past_races = repo.races[repo.races['date'] <= datetime.now()]
+        if past_races.empty:
+            print("No past races found.")
+            return pd.DataFrame()
+        race_id = int(past_races['raceId'].iloc[-1])
+
+    race_details = RACE_DETAILS_CACHE.get_or_build(race_id, lambda: build_race_details(race_id))
+
+    # The last race falls back to the latest race with results
+    if race_details.empty and not requested_race:
+        race_id = repo.latest_race_id('results')
+        race_details = RACE_DETAILS_CACHE.get_or_build(race_id, lambda: build_race_details(race_id))
+    if race_details.empty:
+        print(f"No race details found for race {race_id}.")
 
     return race_details
 
 # Load car images
 def load_car_images(race_details):
-    images = {}
     new_height = 25
     aspect_ratio = 186 / 69
+    new_width = int(new_height * aspect_ratio)
 
-    # Load images for each constructor
-    for constructor in race_details['constructorRef'].unique():
-        path = f'./utils/sprites/{constructor}.png'
-        if os.path.exists(path):
-            img = pygame.image.load(path)
-            new_width = int(new_height * aspect_ratio)
-            resized_img = pygame.transform.scale(img, (new_width, new_height))
-            images[constructor] = resized_img
-        else:
-            # Image not found, skip this constructor
-            pass
-
-    return images
+    # Sprites are loaded and scaled once per process and packed into one atlas;
+    # constructors without a sprite are skipped
+    return get_assets().preload(race_details['constructorRef'].unique(), (new_width, new_height))
 
 # Create car sprites
 def create_car_sprites(images, race_details):
-    car_sprites = pygame.sprite.Group()
+    car_sprites = pygame.sprite.LayeredDirty()
     y_pos = 50
     x_pos = 50
     space = 5
@@ -115,55 +171,49 @@ def create_car_sprites(images, race_details):
 
     return car_sprites
 
-# Easing function for smooth movement
-def ease_in_out_quad(t):
-    if t < 0.5:
-        return 2 * t * t
-    return -1 + (4 - 2 * t) * t
-
-# Move cars based on lap data
-def move_cars(car_sprites, race_details, elapsed_time, total_duration, race_phase):
-    laps = sorted(race_details['lap'].unique())
-    num_laps = len(laps)
-    if num_laps == 0:
-        print("No lap data available.")
+# Place cars from their covered distance: the leader advances across the
+# screen over the race and everyone else trails by their real gap
+def move_cars(cars, driver_index, replay, all_distances):
+    distances = all_distances[driver_index]
+    if np.isnan(distances).all():
         return
 
-    # Calculate current lap and time within lap
-    frame_duration = total_duration / num_laps
-    current_lap_index = min(int(elapsed_time / frame_duration), num_laps - 1)
-    t = (elapsed_time % frame_duration) / frame_duration
-
-    # Get data for current and next lap
-    lap_data = race_details[race_details['lap'] == laps[current_lap_index]]
-    next_lap_data = race_details[race_details['lap'] == laps[current_lap_index + 1]] if current_lap_index + 1 < num_laps else lap_data
-
-    # Apply easing function
-    t = ease_in_out_quad(t)
-
-    # Move each car based on lap data
-    for index, row in lap_data.iterrows():
-        driver_name = row['driverRef']
-        car = next((c for c in car_sprites if c.name == driver_name), None)
-        if car:
-            new_y = START_LINE_Y + (row['position'] - 1) * 30
-            next_row = next_lap_data[next_lap_data['driverRef'] == driver_name]
-            if not next_row.empty:
-                next_row = next_row.iloc[0]
-                next_new_y = START_LINE_Y + (next_row['position'] - 1) * 30
-
-                # Calculate movement based on race phase
-                if race_phase == 'start':
-                    dx = (THIRD_WIDTH - car.rect.x) * t
-                elif race_phase == 'middle':
-                    dx = 0
-                elif race_phase == 'end':
-                    dx = (FINISH_LINE_X - car.rect.x) * t
-                else:
-                    dx = 0
-
-                dy = (next_new_y - car.rect.y) * t
-                car.update(dx, dy)
+    leader = np.nanmax(distances)
+    leader_x = START_X + leader / replay.num_laps * (FINISH_LINE_X - CAR_WIDTH - START_X)
+    x = np.maximum(leader_x - (leader - distances) * PIXELS_PER_LAP, 0)
+    y = START_LINE_Y + (replay.positions_at(all_distances)[driver_index] - 1) * 30
+
+    # Cars without lap data (NaN distance) stay where they are
+    for car, car_x, car_y in zip(cars, x, y):
+        if not np.isnan(car_x) and not np.isnan(car_y):
+            car.update(int(car_x) - car.rect.x, int(car_y) - car.rect.y)
+
+# Handle playback keys: left/right seek a lap, up/down change speed
+def handle_playback_keys(event, simulation):
+    engine = simulation.engine
+    if event.key == pygame.K_RIGHT:
+        engine.seek_lap(engine.leader_lap())
+        simulation.resync()
+    elif event.key == pygame.K_LEFT:
+        engine.seek_lap(engine.leader_lap() - 2)
+        simulation.resync()
+    elif event.key == pygame.K_UP:
+        engine.set_speed(engine.speed * 2)
+    elif event.key == pygame.K_DOWN:
+        engine.set_speed(engine.speed / 2)
+
+# Draw one full frame of the replay at the engine's current race time (used for export)
+def draw_frame(screen, background, font, cars, driver_index, replay, engine):
+    screen.blit(background, (0, 0))
+
+    # Move cars and draw them
+    distances = engine.distances()
+    move_cars(cars, driver_index, replay, distances)
+    screen.blits([(car.image, car.rect) for car in cars], doreturn=False)
+
+    # Display current lap and playback speed
+    lap_text = font.render(lap_label(replay, engine, distances), True, TEXT_COLOR)
+    screen.blit(lap_text, (WIDTH // 2 - lap_text.get_width() // 2, 10))
 
 # Run the simulation
 def run_simulation():
@@ -183,42 +233,43 @@ def run_simulation():
     images = load_car_images(race_details)
     car_sprites = create_car_sprites(images, race_details)
 
+    # Precompute lap matrices and match sprites to driver columns once
+    replay = RaceReplayData(race_details)
+    driver_index, cars = replay.sprite_index(car_sprites.sprites())
+    if replay.num_laps == 0:
+        print("No lap data available.")
+        return
+
+    # Play the race on its real clock, compressed to total_duration by default
     total_duration = 60  # Duration of the simulation in seconds
-    elapsed_time = 0
-    phase_duration = 3  # Duration of each phase in seconds
+    engine = ReplayEngine(replay)
+    engine.set_speed(max(engine.duration_ms / (total_duration * 1000), 1.0))
+
+    # The race advances on a fixed-step clock; frames sample it with interpolation
+    simulation = FixedStepSimulation(engine)
+
+    # Draw the static background once; afterwards only changed regions are
+    # cleared, redrawn and pushed to the display
+    background = create_background()
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
+    lap_text = LapText(font, WIDTH // 2, 10)
+    car_sprites.add(lap_text)
+    car_sprites.clear(screen, background)
 
     running = True
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-
-        screen.fill((169, 169, 169))  # Dark gray background
-
-        # Draw start and finish lines
-        pygame.draw.line(screen, (255, 255, 255), (0, START_LINE_Y), (WIDTH, START_LINE_Y), 5)
-        pygame.draw.line(screen, (255, 255, 255), (0, FINISH_LINE_Y), (WIDTH, FINISH_LINE_Y), 5)
-
-        # Determine race phase
-        if elapsed_time < phase_duration:
-            race_phase = 'start'
-        elif elapsed_time < total_duration - phase_duration:
-            race_phase = 'middle'
-        else:
-            race_phase = 'end'
-
-        # Move cars and draw them
-        move_cars(car_sprites, race_details, elapsed_time, total_duration, race_phase)
-        car_sprites.draw(screen)
-
-        # Update and display current lap
-        current_lap = min(int(elapsed_time / (total_duration / len(race_details['lap'].unique()))), len(race_details['lap'].unique()))
-        lap_text = font.render(f"Lap: {current_lap + 1}", True, (255, 255, 255))
-        screen.blit(lap_text, (WIDTH // 2 - lap_text.get_width() // 2, 10))
-
-        pygame.display.flip()
-        clock.tick(FPS)
-        elapsed_time += clock.get_time() / 2200  # Update elapsed time in seconds
+            elif event.type == pygame.KEYDOWN:
+                handle_playback_keys(event, simulation)
+
+        distances = simulation.distances()
+        move_cars(cars, driver_index, replay, distances)
+        lap_text.set_text(lap_label(replay, engine, distances))
+        pygame.display.update(car_sprites.draw(screen))
+        simulation.advance(clock.tick(FPS) / 1000)  # Run the simulation steps due for the elapsed real time
 
     pygame.quit()
 
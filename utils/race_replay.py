@@ -0,0 +1,241 @@
+"""
+Precomputed replay data and time-accurate playback for one race
+
+Turns the per-lap rows returned by ``load_data`` into dense NumPy matrices
+indexed ``[lap, driver]`` once, so the replay loop only does array lookups
+and vectorized interpolation instead of filtering the DataFrame every frame.
+
+ReplayEngine plays the race back on its real clock (cumulative lap
+milliseconds), so gaps between cars are shown as they happened.
+"""
+
+from typing import Optional, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RaceReplayData:
+    """Dense per-lap position and cumulative time matrices for one race.
+
+    Attributes:
+        laps: Sorted lap numbers, shape (num_laps,)
+        driver_refs / constructor_refs / codes: Per-driver labels, shape (num_drivers,)
+        positions: Running position per lap, shape (num_laps, num_drivers);
+            drivers who retired keep their last position, drivers with no
+            lap data are NaN
+        lap_ms: Lap time in milliseconds, NaN after retirement
+        cumulative_ms: Race time at the end of each lap, NaN after retirement
+    """
+
+    def __init__(self, race_details: pd.DataFrame):
+        """Build the matrices.
+
+        Args:
+            race_details: One row per driver and lap with 'driverRef',
+                'constructorRef', 'code', 'lap', 'position' and 'time'
+                (lap time as timedelta)
+        """
+        drivers = race_details.drop_duplicates('driverRef')
+        self.driver_refs = drivers['driverRef'].to_numpy(dtype=object)
+        self.constructor_refs = drivers['constructorRef'].to_numpy(dtype=object)
+        self.codes = drivers['code'].to_numpy(dtype=object)
+
+        laps = race_details.dropna(subset=['lap'])
+        self.laps = np.unique(laps['lap'].to_numpy(dtype=np.int64))
+        shape = (len(self.laps), len(self.driver_refs))
+
+        lap_index = np.searchsorted(self.laps, laps['lap'].to_numpy(dtype=np.int64))
+        driver_index = pd.Index(self.driver_refs).get_indexer(laps['driverRef'])
+
+        self.positions = np.full(shape, np.nan)
+        self.positions[lap_index, driver_index] = laps['position'].to_numpy(dtype=np.float64)
+        self.positions = _forward_fill(self.positions)
+
+        self.lap_ms = np.full(shape, np.nan)
+        self.lap_ms[lap_index, driver_index] = laps['time'].dt.total_seconds().to_numpy() * 1000
+        self.cumulative_ms = np.cumsum(self.lap_ms, axis=0)  # NaN propagates past retirement
+
+    @property
+    def num_laps(self) -> int:
+        return len(self.laps)
+
+    @property
+    def num_drivers(self) -> int:
+        return len(self.driver_refs)
+
+    def positions_at(self, distances: np.ndarray) -> np.ndarray:
+        """Interpolate every driver's running position at a track distance.
+
+        Args:
+            distances: Laps covered per driver (see ReplayEngine.distances)
+
+        Returns:
+            Position per driver, NaN where the distance is NaN
+        """
+        columns = np.arange(self.num_drivers)
+        known = ~np.isnan(distances)
+        covered = np.where(known, distances, 0.0)
+        completed = np.floor(covered)
+        # During lap k + 1 the position moves from the end of lap k to the end of lap k + 1
+        upper = np.clip(completed, 0, self.num_laps - 1).astype(np.intp)
+        lower = np.clip(completed - 1, 0, self.num_laps - 1).astype(np.intp)
+        start = self.positions[lower, columns]
+        end = self.positions[upper, columns]
+        positions = start + (end - start) * (covered - completed)
+        positions[~known] = np.nan
+        return positions
+
+    def leader_lap(self, distances: np.ndarray) -> int:
+        """Get the lap the leader is on (1-based, capped at the last lap).
+
+        Args:
+            distances: Laps covered per driver
+
+        Returns:
+            Lap number, 0 if no driver has lap data
+        """
+        if np.isnan(distances).all():
+            return 0
+        return min(int(np.nanmax(distances)) + 1, self.num_laps)
+
+    def sprite_index(self, sprites: Sequence) -> Tuple[np.ndarray, List]:
+        """Match sprites (with a ``name`` equal to the driverRef) to driver columns.
+
+        Args:
+            sprites: Car sprites
+
+        Returns:
+            Tuple of (driver index per sprite, sprites in the same order);
+            sprites of unknown drivers are left out
+        """
+        columns = pd.Index(self.driver_refs).get_indexer([sprite.name for sprite in sprites])
+        matched = [(column, sprite) for column, sprite in zip(columns, sprites) if column >= 0]
+        return np.array([column for column, _ in matched], dtype=np.intp), [sprite for _, sprite in matched]
+
+
+def _forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Fill NaNs down each column with the last valid value above them."""
+    rows = np.where(np.isnan(matrix), 0, np.arange(matrix.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = matrix[rows, np.arange(matrix.shape[1])]
+    return filled
+
+
+class ReplayEngine:
+    """Plays a race back on its real clock.
+
+    The engine keeps the current race time; playback time advances it by
+    ``speed`` race milliseconds per real millisecond. For any race time it
+    returns every car's covered distance in laps using a binary search over
+    the cumulative lap times that runs for all drivers at once, so a frame
+    costs O(drivers * log laps) whatever the playback speed.
+    """
+
+    def __init__(self, replay: RaceReplayData, speed: float = 1.0):
+        """Initialize the engine at the start of the race.
+
+        Args:
+            replay: Precomputed race matrices
+            speed: Race seconds played per real second
+        """
+        self.replay = replay
+        num_drivers = replay.num_drivers
+        # Race time at which each lap starts: a zero row for the start and a
+        # NaN row past the last lap; NaN compares as "later than any time"
+        self._lap_starts = np.vstack([
+            np.zeros((1, num_drivers)),
+            replay.cumulative_ms,
+            np.full((1, num_drivers), np.nan),
+        ])
+        self._columns = np.arange(num_drivers)
+        self._search_steps = int(np.ceil(np.log2(self._lap_starts.shape[0] + 1)))
+        self._no_data = np.isnan(self._lap_starts[1]) if replay.num_laps else np.ones(num_drivers, dtype=bool)
+        finished = replay.cumulative_ms[~np.isnan(replay.cumulative_ms)]
+        self.duration_ms = float(finished.max()) if finished.size else 0.0
+        self.race_ms = 0.0
+        self.speed = 1.0
+        self.set_speed(speed)
+
+    def set_speed(self, speed: float):
+        """Set the playback speed.
+
+        Args:
+            speed: Race seconds played per real second
+
+        Raises:
+            ValueError: If speed is not positive
+        """
+        if speed <= 0:
+            raise ValueError(f"Playback speed must be positive, got {speed}")
+        self.speed = speed
+
+    def seek(self, race_ms: float):
+        """Jump to a race time (clamped to the race)."""
+        self.race_ms = min(max(race_ms, 0.0), self.duration_ms)
+
+    def seek_lap(self, lap_index: int):
+        """Jump to the moment the leader starts a lap.
+
+        Args:
+            lap_index: Index into ``replay.laps``
+        """
+        lap_index = min(max(lap_index, 0), self.replay.num_laps)
+        starts = self._lap_starts[lap_index]
+        self.seek(float(np.nanmin(starts)) if not np.isnan(starts).all() else self.duration_ms)
+
+    def advance(self, seconds: float) -> float:
+        """Advance playback by real time.
+
+        Args:
+            seconds: Real seconds elapsed
+
+        Returns:
+            The new race time in milliseconds
+        """
+        self.seek(self.race_ms + seconds * 1000 * self.speed)
+        return self.race_ms
+
+    @property
+    def finished(self) -> bool:
+        return self.race_ms >= self.duration_ms
+
+    def _laps_completed(self, race_ms: float) -> np.ndarray:
+        """Count every driver's completed laps at a race time (vectorized bisection)."""
+        starts = self._lap_starts
+        last_row = starts.shape[0] - 1
+        low = np.zeros(len(self._columns), dtype=np.intp)
+        high = np.full(len(self._columns), starts.shape[0], dtype=np.intp)
+        for _ in range(self._search_steps):
+            middle = (low + high) // 2
+            searching = low < high
+            reached = starts[np.minimum(middle, last_row), self._columns] <= race_ms
+            low = np.where(searching & reached, middle + 1, low)
+            high = np.where(searching & ~reached, middle, high)
+        # low counts the lap starts at or before race_ms, including the zero row
+        return low - 1
+
+    def distances(self, race_ms: Optional[float] = None) -> np.ndarray:
+        """Get every car's covered distance.
+
+        Args:
+            race_ms: Race time (None = current playback time)
+
+        Returns:
+            Laps covered per driver as floats (e.g. 12.5 = halfway through
+            lap 13); retired drivers stop at their last completed lap and
+            drivers without lap data are NaN
+        """
+        race_ms = self.race_ms if race_ms is None else race_ms
+        completed = self._laps_completed(race_ms)
+        start = self._lap_starts[completed, self._columns]
+        end = self._lap_starts[completed + 1, self._columns]
+        with np.errstate(invalid='ignore'):
+            fraction = np.where(np.isnan(end), 0.0, (race_ms - start) / (end - start))
+        distances = completed + fraction
+        distances[self._no_data] = np.nan
+        return distances
+
+    def leader_lap(self, race_ms: Optional[float] = None) -> int:
+        """Get the lap the leader is on (1-based, capped at the last lap)."""
+        return self.replay.leader_lap(self.distances(race_ms))
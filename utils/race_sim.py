@@ -2,6 +2,9 @@ import pygame
 import sys
 import os
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.sprite_assets import get_assets
+
 # Initialize Pygame
 pygame.init()
 
@@ -24,6 +27,9 @@ clock = pygame.time.Clock()
 # Initial background position
 background_x = 0
 
+# Car sprite, loaded and converted once instead of every frame
+car_sprite = get_assets().get("williams.bmp")
+
 # Car positions (static for now)
 car_positions = [(screen_width // 3, screen_height // 2 + i * 50) for i in range(5)]
 
@@ -51,8 +57,7 @@ while running:
     
     
     for pos in car_positions:
-        sprite_path = os.path.join(os.path.dirname(__file__), "sprites", "williams.bmp")
-        screen.blit(pygame.image.load(sprite_path), (50, 30))
+        screen.blit(car_sprite, (50, 30))
         pygame.draw.rect(screen, WHITE, pygame.Rect(pos[0], pos[1], 50, 30))
 
 
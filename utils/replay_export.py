@@ -0,0 +1,239 @@
+"""
+Headless race replay export (GIF or video)
+
+Renders replay frames off-screen with the SDL dummy video driver, as fast as
+the CPU allows, and streams them into an encoder:
+- '.gif' outputs are written frame by frame with Pillow
+- any other extension is piped as raw RGB into ffmpeg (must be on PATH)
+
+Each frame depends only on its race time, so frame ranges can be rendered
+and encoded by several worker processes while the parent writes them in
+order.
+
+Usage:
+    python -m utils.replay_export replays/race_{race_id}.gif --race-id 1120 1121
+    python -m utils.replay_export last_race.mp4 --fps 30 --workers 4
+"""
+
+import os
+import shutil
+import argparse
+import subprocess
+import multiprocessing
+from typing import Optional, Iterable, List, Tuple
+
+# Must be set before pygame is imported anywhere in this process
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from PIL import Image, GifImagePlugin
+
+from utils.last_race_sim_data import (
+    WIDTH, HEIGHT, load_data, load_car_images, create_car_sprites, create_background, draw_frame
+)
+from utils.race_replay import RaceReplayData, ReplayEngine
+
+
+def gif_frame_duration(fps: float) -> int:
+    """Frame delay in milliseconds (GIF delays have a 10ms resolution)."""
+    return max(int(round(1000 / fps, -1)), 10)
+
+
+class GifWriter:
+    """Streams frames into an animated GIF, each with its own palette."""
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: float):
+        self.size = size
+        self.duration = gif_frame_duration(fps)
+        self._file = open(path, 'wb')
+        header, _ = GifImagePlugin.getheader(Image.new('P', size), None, {'loop': 0})
+        for chunk in header:
+            self._file.write(chunk)
+
+    @staticmethod
+    def encode(rgb: bytes, size: Tuple[int, int], duration: int) -> bytes:
+        """Quantize and GIF-encode one RGB frame (runs in worker processes)."""
+        frame = Image.frombytes('RGB', size, rgb).quantize(256)
+        return b''.join(GifImagePlugin.getdata(frame, duration=duration, include_color_table=True))
+
+    def encode_frame(self, rgb: bytes) -> bytes:
+        return self.encode(rgb, self.size, self.duration)
+
+    def write(self, encoded: bytes):
+        self._file.write(encoded)
+
+    def close(self):
+        self._file.write(b';')  # GIF trailer
+        self._file.close()
+
+
+class FFmpegWriter:
+    """Pipes raw RGB frames into an ffmpeg process."""
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: float):
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found on PATH; export to a .gif file instead")
+        self.size = size
+        self._process = subprocess.Popen(
+            [ffmpeg, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{size[0]}x{size[1]}", '-r', str(fps),
+             '-i', '-', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE
+        )
+
+    def encode_frame(self, rgb: bytes) -> bytes:
+        return rgb
+
+    def write(self, encoded: bytes):
+        self._process.stdin.write(encoded)
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self._process.returncode}")
+
+
+def open_writer(path: str, size: Tuple[int, int], fps: float):
+    """Pick the encoder for an output path by its extension."""
+    if os.path.splitext(path)[1].lower() == '.gif':
+        return GifWriter(path, size, fps)
+    return FFmpegWriter(path, size, fps)
+
+
+class ReplayRenderer:
+    """Draws replay frames onto an off-screen surface."""
+
+    def __init__(self, race_details, scale: float = 1.0):
+        """Load sprites and precompute the replay.
+
+        Args:
+            race_details: Output of load_data
+            scale: Output size relative to the live window
+        """
+        pygame.font.init()
+        self.font = pygame.font.SysFont(None, 36)
+        self.surface = pygame.Surface((WIDTH, HEIGHT))
+        self.background = create_background()
+        self.size = output_size(scale)
+        self.car_sprites = create_car_sprites(load_car_images(race_details), race_details)
+        self.replay = RaceReplayData(race_details)
+        self.driver_index, self.cars = self.replay.sprite_index(self.car_sprites.sprites())
+        self.engine = ReplayEngine(self.replay)
+
+    def render(self, race_ms: float) -> bytes:
+        """Render the frame at a race time.
+
+        Returns:
+            Raw RGB bytes of size ``self.size``
+        """
+        self.engine.seek(race_ms)
+        draw_frame(self.surface, self.background, self.font, self.cars, self.driver_index,
+                   self.replay, self.engine)
+        frame = self.surface
+        if self.size != (WIDTH, HEIGHT):
+            frame = pygame.transform.smoothscale(frame, self.size)
+        return pygame.image.tobytes(frame, 'RGB')
+
+
+def output_size(scale: float) -> Tuple[int, int]:
+    """Scaled frame size, rounded down to even dimensions for video encoders."""
+    width, height = int(WIDTH * scale), int(HEIGHT * scale)
+    return width - width % 2, height - height % 2
+
+
+def frame_times(duration_ms: float, fps: float, seconds: float) -> List[float]:
+    """Race time of every output frame when the race is compressed to ``seconds``."""
+    count = max(int(seconds * fps), 1)
+    return [duration_ms * i / max(count - 1, 1) for i in range(count)]
+
+
+# Per-process state for worker pools
+_worker = {}
+
+
+def _init_worker(race_details, scale: float, path: str, fps: float):
+    _worker['renderer'] = ReplayRenderer(race_details, scale)
+    size = _worker['renderer'].size
+    if os.path.splitext(path)[1].lower() == '.gif':
+        duration = gif_frame_duration(fps)
+        _worker['encode'] = lambda rgb: GifWriter.encode(rgb, size, duration)
+    else:
+        _worker['encode'] = lambda rgb: rgb
+
+
+def _render_chunk(times: List[float]) -> List[bytes]:
+    renderer, encode = _worker['renderer'], _worker['encode']
+    return [encode(renderer.render(race_ms)) for race_ms in times]
+
+
+def _chunks(items: List[float], size: int) -> Iterable[List[float]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def export_replay(race_details, path: str, fps: float = 25, seconds: float = 60,
+                  scale: float = 1.0, workers: int = 1, chunk_size: int = 8) -> int:
+    """Render a race replay to a GIF or video file.
+
+    Args:
+        race_details: Output of load_data
+        path: Output file ('.gif' or any format ffmpeg can write)
+        fps: Output frame rate
+        seconds: Length of the output; the race is compressed to fit
+        scale: Output size relative to the live window
+        workers: Processes rendering frame ranges in parallel (1 = in-process)
+        chunk_size: Frames per work unit when using workers
+
+    Returns:
+        Number of frames written
+
+    Raises:
+        ValueError: If the race has no lap data
+        RuntimeError: If the encoder fails
+    """
+    replay = RaceReplayData(race_details)
+    if replay.num_laps == 0:
+        raise ValueError("Race has no lap data to replay")
+    times = frame_times(ReplayEngine(replay).duration_ms, fps, seconds)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = open_writer(path, output_size(scale), fps)
+    try:
+        if workers <= 1:
+            renderer = ReplayRenderer(race_details, scale)
+            for race_ms in times:
+                writer.write(writer.encode_frame(renderer.render(race_ms)))
+        else:
+            with multiprocessing.Pool(workers, _init_worker, (race_details, scale, path, fps)) as pool:
+                # imap keeps chunk order, so frames are written as soon as they are ready
+                for encoded_frames in pool.imap(_render_chunk, _chunks(times, chunk_size)):
+                    for encoded in encoded_frames:
+                        writer.write(encoded)
+    finally:
+        writer.close()
+    return len(times)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Render race replays to GIF or video without a window.")
+    parser.add_argument('output', help="Output file; may contain {race_id}")
+    parser.add_argument('--race-id', type=int, nargs='*', default=[None],
+                        help="Races to export (default: the last race)")
+    parser.add_argument('--fps', type=float, default=25)
+    parser.add_argument('--seconds', type=float, default=60, help="Length of each replay")
+    parser.add_argument('--scale', type=float, default=1.0, help="Frame size relative to the live window")
+    parser.add_argument('--workers', type=int, default=1, help="Rendering processes")
+    args = parser.parse_args(argv)
+
+    for race_id in args.race_id or [None]:
+        race_details = load_data(race_id)
+        if race_details.empty:
+            continue
+        path = args.output.format(race_id=int(race_details['raceId'].iloc[0]))
+        frames = export_replay(race_details, path, args.fps, args.seconds, args.scale, args.workers)
+        print(f"Wrote {frames} frames to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Fixed-timestep simulation core for the race replay
+
+The simulation advances in fixed steps of real time, independent of how
+fast frames are drawn. Each step moves the replay engine forward and
+records every car's distance; the renderer then samples the state between
+the last two steps with an interpolation factor, so a slow frame neither
+slows the simulated race nor makes cars jump. Only a real stall (more than
+max_backlog_seconds behind, 0.25 s by default) drops time.
+
+This module does not depend on pygame, so the simulation can be stepped
+deterministically in tests and benchmarks.
+"""
+
+import math
+
+import numpy as np
+
+from utils.race_replay import ReplayEngine
+
+
+class FixedStepSimulation:
+    """Steps a ReplayEngine on a fixed clock and interpolates for rendering."""
+
+    def __init__(self, engine: ReplayEngine, step_seconds: float = 1 / 60,
+                 max_backlog_seconds: float = 0.25):
+        """Initialize the simulation at the engine's current race time.
+
+        Args:
+            engine: Replay engine to drive
+            step_seconds: Real time covered by one simulation step
+            max_backlog_seconds: Most real time one rendered frame can catch up
+                on; a frame slower than this (a stall, e.g. a dragged window)
+                drops the extra time instead of running a burst of steps
+
+        Raises:
+            ValueError: If step_seconds or max_backlog_seconds is not positive
+        """
+        if step_seconds <= 0 or max_backlog_seconds <= 0:
+            raise ValueError("step_seconds and max_backlog_seconds must be positive")
+        self.engine = engine
+        self.step_seconds = step_seconds
+        self.max_backlog_seconds = max_backlog_seconds
+        # Round to absorb float error (0.25 / (1/60) is 15.000000000000002)
+        self.max_steps_per_frame = max(1, math.ceil(round(max_backlog_seconds / step_seconds, 9)))
+        self.steps = 0
+        self.dropped_seconds = 0.0
+        self._accumulator = 0.0
+        self._reset_state()
+
+    def _reset_state(self):
+        self._accumulator = 0.0
+        self.current = self.engine.distances()
+        self.previous = self.current
+
+    def step(self):
+        """Advance the simulation by exactly one step."""
+        self.previous = self.current
+        self.engine.advance(self.step_seconds)
+        self.current = self.engine.distances()
+        self.steps += 1
+
+    def run_steps(self, count: int):
+        """Advance by a fixed number of steps (deterministic, for tests and benchmarks)."""
+        for _ in range(count):
+            self.step()
+
+    def advance(self, frame_seconds: float) -> int:
+        """Advance by the real time a rendered frame took.
+
+        Runs as many whole steps as fit (several when rendering falls behind,
+        i.e. frames are skipped) up to max_backlog_seconds worth, and keeps
+        the remainder for the next frame.
+
+        Args:
+            frame_seconds: Real time since the previous frame
+
+        Returns:
+            Number of steps run
+        """
+        self._accumulator += frame_seconds
+        steps = 0
+        while self._accumulator >= self.step_seconds and steps < self.max_steps_per_frame:
+            self.step()
+            self._accumulator -= self.step_seconds
+            steps += 1
+        if self._accumulator >= self.step_seconds:
+            # Too far behind: drop whole steps so a slow machine does not spiral
+            dropped = self._accumulator - self._accumulator % self.step_seconds
+            self.dropped_seconds += dropped
+            self._accumulator -= dropped
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step elapsed since the last one (0-1)."""
+        return self._accumulator / self.step_seconds
+
+    def distances(self) -> np.ndarray:
+        """Every car's distance interpolated between the last two steps."""
+        return self.previous + (self.current - self.previous) * self.alpha
+
+    def seek(self, race_ms: float):
+        """Jump to a race time and restart interpolation there."""
+        self.engine.seek(race_ms)
+        self._reset_state()
+
+    def resync(self):
+        """Restart interpolation after the engine was moved directly (e.g. seek_lap)."""
+        self._reset_state()
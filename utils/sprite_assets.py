@@ -0,0 +1,129 @@
+"""
+Sprite asset cache for the pygame race replays
+
+Each sprite file is loaded from utils/sprites once per process. Scaled
+versions are cached by (name, size) and, when a display is open, converted
+to the display format with ``convert_alpha`` so drawing them is a plain
+blit. ``preload`` packs all sprites needed at one size into a single
+texture atlas surface and hands out subsurfaces of it.
+"""
+
+import os
+import logging
+from functools import lru_cache
+from typing import Optional, Dict, Iterable, Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+SPRITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sprites')
+ATLAS_MAX_WIDTH = 2048
+
+Size = Optional[Tuple[int, int]]
+
+
+class SpriteAssets:
+    """Loads, scales and caches sprite surfaces."""
+
+    def __init__(self, sprite_dir: str = SPRITE_DIR):
+        """Initialize the cache.
+
+        Args:
+            sprite_dir: Directory holding the sprite images
+        """
+        self.sprite_dir = sprite_dir
+        self._sources: Dict[str, Optional[pygame.Surface]] = {}
+        self._surfaces: Dict[Tuple[str, Size], Optional[pygame.Surface]] = {}
+
+    def path(self, name: str) -> str:
+        """Get the file for a sprite name ('.png' unless the name has an extension)."""
+        if not os.path.splitext(name)[1]:
+            name = f"{name}.png"
+        return os.path.join(self.sprite_dir, name)
+
+    def source(self, name: str) -> Optional[pygame.Surface]:
+        """Get the unscaled sprite, loading it on first use.
+
+        Returns:
+            Surface or None if the sprite file does not exist
+        """
+        if name not in self._sources:
+            path = self.path(name)
+            if os.path.exists(path):
+                self._sources[name] = pygame.image.load(path)
+            else:
+                logger.warning(f"Sprite {path} not found")
+                self._sources[name] = None
+        return self._sources[name]
+
+    @staticmethod
+    def _prepare(surface: pygame.Surface) -> pygame.Surface:
+        """Convert to the display pixel format when a display is open."""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def get(self, name: str, size: Size = None) -> Optional[pygame.Surface]:
+        """Get a sprite at a size, scaling and converting it once.
+
+        Args:
+            name: Sprite name (e.g. a constructorRef)
+            size: (width, height) to scale to (None = original size)
+
+        Returns:
+            Surface or None if the sprite file does not exist
+        """
+        key = (name, size)
+        if key not in self._surfaces:
+            source = self.source(name)
+            if source is not None and size is not None and source.get_size() != size:
+                source = pygame.transform.scale(source, size)
+            self._surfaces[key] = self._prepare(source) if source is not None else None
+        return self._surfaces[key]
+
+    def preload(self, names: Iterable[str], size: Tuple[int, int]) -> Dict[str, pygame.Surface]:
+        """Pack sprites at one size into a texture atlas.
+
+        Sprites already cached at this size are reused; the rest are scaled
+        into a new atlas surface and cached as subsurfaces of it.
+
+        Args:
+            names: Sprite names
+            size: (width, height) of every sprite
+
+        Returns:
+            Dictionary of name -> surface for the sprites that exist
+        """
+        names = list(dict.fromkeys(names))
+        missing = [name for name in names
+                   if (name, size) not in self._surfaces and self.source(name) is not None]
+        if missing:
+            width, height = size
+            columns = max(1, ATLAS_MAX_WIDTH // width)
+            rows = -(-len(missing) // columns)
+            atlas = pygame.Surface((width * min(columns, len(missing)), height * rows), pygame.SRCALPHA)
+            slots = []
+            for i, name in enumerate(missing):
+                slot = pygame.Rect((i % columns) * width, (i // columns) * height, width, height)
+                # MAX against the transparent atlas copies pixels and alpha as-is
+                atlas.blit(pygame.transform.scale(self.source(name), size), slot,
+                           special_flags=pygame.BLEND_RGBA_MAX)
+                slots.append((name, slot))
+            # Subsurfaces keep the atlas alive and share its pixels
+            atlas = self._prepare(atlas)
+            for name, slot in slots:
+                self._surfaces[(name, size)] = atlas.subsurface(slot)
+        return {name: self._surfaces[(name, size)] for name in names
+                if self._surfaces.get((name, size)) is not None}
+
+    def clear(self):
+        """Drop every cached surface (e.g. after the display mode changes)."""
+        self._sources.clear()
+        self._surfaces.clear()
+
+
+@lru_cache(maxsize=None)
+def get_assets(sprite_dir: str = SPRITE_DIR) -> SpriteAssets:
+    """Get a shared asset cache for a sprite directory."""
+    return SpriteAssets(sprite_dir)
@@ -0,0 +1,80 @@
+"""
+Startup time measurement for the desktop app
+
+Records how long each startup phase takes (module imports, API handler and
+window construction) and the time from process start until the main window
+is first mapped on screen ("time to first paint"), so that startup
+regressions show up as numbers.
+
+Usage:
+    timer = StartupTimer()
+    with timer.phase('import ui'):
+        from ui.dashboard import Dashboard
+    timer.watch_first_paint(root)
+
+    python main.py --profile-startup
+    python -X importtime main.py --profile-startup 2> importtime.log  # per-module breakdown
+"""
+
+import sys
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import cost is worth reporting separately
+HEAVY_MODULES = ('pandas', 'numpy', 'PIL', 'pygame', 'requests', 'ttkbootstrap')
+
+
+class StartupTimer:
+    """Collects startup phase timings relative to process start."""
+
+    def __init__(self, start: Optional[float] = None):
+        """Initialize the timer.
+
+        Args:
+            start: perf_counter() value of process start (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.phases: List[Tuple[str, float]] = []
+        self.first_paint: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def watch_first_paint(self, root, on_paint: Optional[Callable[['StartupTimer'], None]] = None):
+        """Record the time until ``root`` is first mapped and its pending redraws are done.
+
+        Args:
+            root: Tk root window
+            on_paint: Optional callback invoked with the timer once measured
+        """
+        def mapped(event):
+            if event.widget is not root or self.first_paint is not None:
+                return
+            # Let the pending geometry and redraw work of the first frame run
+            root.update_idletasks()
+            self.first_paint = time.perf_counter() - self.start
+            if on_paint:
+                on_paint(self)
+
+        root.bind('<Map>', mapped, add='+')
+
+    def report(self) -> str:
+        """Format the phases, heavy modules loaded so far and the first paint time."""
+        lines = ["Startup timing:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<24} {seconds * 1000:8.1f} ms")
+        if self.first_paint is not None:
+            lines.append(f"  {'time to first paint':<24} {self.first_paint * 1000:8.1f} ms")
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        lines.append(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+        return '\n'.join(lines)